@@ -32,12 +32,12 @@ class UniversityRatingAdmin(admin.ModelAdmin):
     list_filter = ('university', 'category')
     
 class UniversityReviewAdmin(admin.ModelAdmin):
-    list_display = ('username', 'university', 'review_text')
+    list_display = ('user', 'username', 'university', 'review_text')
     list_filter = ('university',)
     
     fieldsets = (
         (None, {
-            'fields': ('username', 'university', 'review_text', 'pub_date')
+            'fields': ('user', 'username', 'university', 'review_text', 'pub_date')
         }),
     )
 
@@ -144,8 +144,7 @@ class CustomUserAdmin(BaseUserAdmin):
 
     def clear_saved_calcs(self, request, user_id):
         user = CustomUser.objects.get(id=user_id)
-        user.savedCalcs = {}
-        user.save()
+        user.saved_calculators.all().delete()
         self.message_user(request, f"All saved calculators cleared for {user.username}.", messages.SUCCESS)
         return HttpResponseRedirect(request.META.get('HTTP_REFERER'))
 
@@ -1,7 +1,14 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class MajorhelpConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'MajorHelp'
 
+    def ready(self):
+        # Connect the cache/index invalidation receivers
+        from . import signals
+
+        # Off SQLite, fill the derived tables new migrations add or change
+        post_migrate.connect(signals.refresh_after_migrate, sender=self)
@@ -0,0 +1,113 @@
+"""
+In-process prefix index for the calculator's university autocomplete.
+
+All university names are kept casefolded in a sorted list, so the names
+starting with a prefix are one contiguous slice found with two bisects.
+The slice is ranked exact match first, then by undergraduate enrollment.
+Short prefixes like "u" cover thousands of names, so their ranked top
+results are memoized until the next rebuild.
+
+The index is rebuilt lazily after a University is saved or deleted (see
+signals.py), and after MAX_AGE seconds so other worker processes pick up
+changes made elsewhere.
+"""
+
+import heapq
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+from .models import University
+
+MAX_AGE = 300
+
+# Most results a single lookup can ask for
+MAX_LIMIT = 50
+
+# Prefix ranges wider than this get their ranked results memoized
+WIDE_RANGE = 256
+
+
+class LazyIndex(ABC):
+    """
+    An in-memory index built from the database on first use.
+
+    invalidate() drops it so the next lookup rebuilds it. It is also rebuilt
+    once it is older than max_age seconds. Subclasses implement build().
+    """
+
+    def __init__(self, max_age=MAX_AGE):
+        self.max_age = max_age
+        self._index = None
+        self._built_at = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._index = None
+
+    @abstractmethod
+    def build(self):
+        """Return the index, built from the database."""
+
+    def get_index(self):
+        index = self._index
+        if index is None or time.monotonic() - self._built_at > self.max_age:
+            with self._lock:
+                # another thread may have rebuilt it while we waited
+                if self._index is index:
+                    self._index = self.build()
+                    self._built_at = time.monotonic()
+                index = self._index
+        return index
+
+
+class _PrefixIndex:
+    def __init__(self, entries):
+        # entries: (casefolded name, -enrollment, name, location, slug, id), sorted
+        self.entries = entries
+        self.keys = [entry[0] for entry in entries]
+        self.memo = {}
+
+
+def _rank(prefix):
+    # exact match first, then largest enrollment, then alphabetical
+    return lambda entry: (entry[0] != prefix, entry[1], entry[0])
+
+
+class UniversityAutocomplete(LazyIndex):
+    def build(self):
+        rows = University.objects.values_list('name', 'location', 'TotalUndergradStudents', 'slug', 'pk')
+        entries = sorted(
+            (name.casefold(), -(enrollment or 0), name, location, slug, pk)
+            for name, location, enrollment, slug, pk in rows
+        )
+        return _PrefixIndex(entries)
+
+    def search(self, query, limit=10):
+        """Return up to `limit` universities whose name starts with `query`."""
+        prefix = (query or '').strip().casefold()
+        limit = max(1, min(limit, MAX_LIMIT))
+        if not prefix:
+            return []
+
+        index = self.get_index()
+        lo = bisect_left(index.keys, prefix)
+        hi = bisect_left(index.keys, prefix + '\U0010ffff', lo)
+
+        if hi - lo > WIDE_RANGE:
+            ranked = index.memo.get(prefix)
+            if ranked is None:
+                ranked = heapq.nsmallest(MAX_LIMIT, index.entries[lo:hi], key=_rank(prefix))
+                index.memo[prefix] = ranked
+            ranked = ranked[:limit]
+        else:
+            ranked = heapq.nsmallest(limit, index.entries[lo:hi], key=_rank(prefix))
+
+        return [
+            {'name': entry[2], 'location': entry[3], 'slug': entry[4], 'id': entry[5]}
+            for entry in ranked
+        ]
+
+
+university_autocomplete = UniversityAutocomplete()
@@ -0,0 +1,113 @@
+"""
+Materialized total cost of every major.
+
+MajorCost holds, per major, what the calculator would charge before aid:
+university base tuition + major tuition + university fees + major fees, for
+in-state, out-of-state and graduate students. Graduate tuition is charged on
+top of the university's undergraduate base, as in Major.__str__.
+
+On SQLite the rows are kept current by triggers on the Major and University
+tables, like the full-text index in search.py, so bulk_create() and
+queryset.update() are covered too. Elsewhere signals.py calls refresh_costs()
+for the changed rows, and for every row after migrating to MajorCost.
+"""
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .db import triggers_enabled
+from .search import UNIVERSITY_TABLE, MAJOR_TABLE
+
+COST_TABLE = 'MajorHelp_majorcost'
+
+# cost column -> (university base column, major tuition column)
+COST_COLUMNS = {
+    'in_state_min': ('in_state_base_min_tuition', 'in_state_min_tuition'),
+    'in_state_max': ('in_state_base_max_tuition', 'in_state_max_tuition'),
+    'out_of_state_min': ('out_of_state_base_min_tuition', 'out_of_state_min_tuition'),
+    'out_of_state_max': ('out_of_state_base_max_tuition', 'out_of_state_max_tuition'),
+    'grad_in_state_min': ('in_state_base_min_tuition', 'grad_in_state_min_tuition'),
+    'grad_in_state_max': ('in_state_base_max_tuition', 'grad_in_state_max_tuition'),
+    'grad_out_of_state_min': ('out_of_state_base_min_tuition', 'grad_out_of_state_min_tuition'),
+    'grad_out_of_state_max': ('out_of_state_base_max_tuition', 'grad_out_of_state_max_tuition'),
+}
+
+# Source columns whose changes require a refresh
+UNIVERSITY_COLUMNS = sorted({base for base, tuition in COST_COLUMNS.values()} | {'fees'})
+MAJOR_COLUMNS = sorted({tuition for base, tuition in COST_COLUMNS.values()} | {'fees', 'university_id'})
+
+TRIGGERS = ['major_ai', 'major_au', 'major_ad', 'university_au']
+
+
+def _upsert_sql(where):
+    """Recompute the cost rows of the majors matching `where` (aliases m and u)."""
+    columns = ', '.join(COST_COLUMNS)
+    totals = ', '.join(
+        f'u.{base} + m.{tuition} + u.fees + m.fees'
+        for base, tuition in COST_COLUMNS.values()
+    )
+    updates = ', '.join(f'{column} = excluded.{column}' for column in ['university_id', *COST_COLUMNS])
+
+    return (
+        f'INSERT INTO {COST_TABLE} (major_id, university_id, {columns}) '
+        f'SELECT m.id, m.university_id, {totals} '
+        f'FROM {MAJOR_TABLE} m JOIN {UNIVERSITY_TABLE} u ON u.id = m.university_id '
+        f'WHERE {where} '
+        f'ON CONFLICT (major_id) DO UPDATE SET {updates}'
+    )
+
+
+def _trigger_sql():
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {COST_TABLE}_major_ai AFTER INSERT ON {MAJOR_TABLE} BEGIN '
+        f'{_upsert_sql("m.id = new.id")}; END',
+
+        f"CREATE TRIGGER IF NOT EXISTS {COST_TABLE}_major_au AFTER UPDATE OF {', '.join(MAJOR_COLUMNS)} "
+        f'ON {MAJOR_TABLE} BEGIN {_upsert_sql("m.id = new.id")}; END',
+
+        f'CREATE TRIGGER IF NOT EXISTS {COST_TABLE}_major_ad AFTER DELETE ON {MAJOR_TABLE} BEGIN '
+        f'DELETE FROM {COST_TABLE} WHERE major_id = old.id; END',
+
+        f"CREATE TRIGGER IF NOT EXISTS {COST_TABLE}_university_au AFTER UPDATE OF {', '.join(UNIVERSITY_COLUMNS)} "
+        f'ON {UNIVERSITY_TABLE} BEGIN {_upsert_sql("m.university_id = new.id")}; END',
+    ]
+
+
+def install_cost_triggers(schema_editor):
+    """
+    Create the sync triggers and fill MajorCost for every major.
+
+    Safe to run more than once. Like install_fts(), migrations spell out
+    the statements (see 0011). One that makes Django remake the University
+    or Major table must create the triggers again afterwards, and for the
+    Major table drop them before the remake too: the University trigger
+    reads that table and SQLite won't rename the new copy into place under
+    it (see 0017).
+    """
+    if triggers_enabled(schema_editor.connection):
+        for sql in _trigger_sql():
+            schema_editor.execute(sql)
+    schema_editor.execute(_upsert_sql('1 = 1'))
+
+
+def uninstall_cost_triggers(schema_editor):
+    if not triggers_enabled(schema_editor.connection):
+        return
+
+    for name in TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {COST_TABLE}_{name}')
+
+
+def refresh_costs(major_id=None, university_id=None, using=DEFAULT_DB_ALIAS):
+    """
+    Recompute the cost rows of one major, one university's majors, or
+    (with no arguments) every major.
+    """
+    if major_id is not None:
+        where, params = 'm.id = %s', [major_id]
+    elif university_id is not None:
+        where, params = 'm.university_id = %s', [university_id]
+    else:
+        where, params = '1 = 1', []
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(_upsert_sql(where), params)
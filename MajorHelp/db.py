@@ -0,0 +1,29 @@
+"""
+Database capabilities the app's derived tables depend on.
+"""
+
+from django.db import connection, migrations
+
+
+def triggers_enabled(using=None):
+    """
+    Whether database triggers keep the derived tables current (the rating
+    summaries, Major's review stats, the full-text and R*Tree indexes, ...).
+    Only the SQLite triggers and virtual tables are written; on any other
+    backend signals.py and the views refresh those rows from Python, and
+    the searches fall back to ORM lookups.
+    """
+    conn = using or connection
+    return conn.vendor == 'sqlite'
+
+
+class SQLiteRunSQL(migrations.RunSQL):
+    """
+    RunSQL for the SQLite triggers and virtual tables, skipped on other
+    databases. Migrations spell the statements out rather than calling the
+    modules that write them, so a migration always runs the same SQL.
+    """
+
+    def _run_sql(self, schema_editor, sqls):
+        if triggers_enabled(schema_editor.connection):
+            super()._run_sql(schema_editor, sqls)
@@ -0,0 +1,176 @@
+"""
+Typo-tolerant lookup of university and major names.
+
+Names are split into words and every word goes into a SymSpell-style
+dictionary: at build time each word is stored under all the strings you get
+by deleting up to MAX_DISTANCE characters from it. At lookup time the same
+deletes are generated for each query word, so finding every dictionary word
+within edit distance 2 costs a few dozen hash probes instead of a scan.
+
+Names are ranked by the summed edit distance of their words to the query
+words, then by how few extra words they have, then by weight (enrollment for
+universities). Used for the "did you mean" suggestions when an exact or
+prefix lookup finds nothing.
+"""
+
+import heapq
+import re
+from abc import abstractmethod
+
+from .autocomplete import LazyIndex
+from .models import University, Major
+
+MAX_DISTANCE = 2
+
+# Only the first PREFIX_LENGTH characters of a word are expanded into deletes,
+# which keeps the dictionary small. Candidates are then checked in full.
+PREFIX_LENGTH = 7
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def allowed_distance(word):
+    # Short words get little or no slack, "of" shouldn't match "or"
+    if len(word) <= 3:
+        return 0
+    if len(word) <= 5:
+        return 1
+    return MAX_DISTANCE
+
+
+def edit_distance(a, b, max_distance):
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions), or max_distance + 1 if it is larger than max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+
+def _deletes(word, distance):
+    results = {word}
+    frontier = {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))}
+        results |= frontier
+    return results
+
+
+class _FuzzyIndex:
+    def __init__(self, entries):
+        # entries: (name, weight, payload dict)
+        self.entries = entries
+        self.words = {}     # word -> set of entry ids
+        self.deletes = {}   # delete -> set of words
+        self.word_counts = []
+
+        for entry_id, (name, weight, payload) in enumerate(entries):
+            words = WORD_RE.findall(name.casefold())
+            self.word_counts.append(len(words))
+            for word in words:
+                self.words.setdefault(word, set()).add(entry_id)
+
+        for word in self.words:
+            for delete in _deletes(word[:PREFIX_LENGTH], MAX_DISTANCE):
+                self.deletes.setdefault(delete, set()).add(word)
+
+    def similar_words(self, word):
+        """Dictionary words within the allowed distance of `word`, with distances."""
+        max_distance = allowed_distance(word)
+        if max_distance == 0:
+            return {word: 0} if word in self.words else {}
+
+        candidates = set()
+        for delete in _deletes(word[:PREFIX_LENGTH], max_distance):
+            candidates |= self.deletes.get(delete, set())
+
+        found = {}
+        for candidate in candidates:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                found[candidate] = distance
+        return found
+
+
+class FuzzyNameIndex(LazyIndex):
+    @abstractmethod
+    def load(self):
+        """Return an iterable of (name, weight, payload dict)."""
+
+    def build(self):
+        return _FuzzyIndex(list(self.load()))
+
+    def suggest(self, query, limit=5):
+        """Names closest to `query`, best first, as their payload dicts."""
+        tokens = WORD_RE.findall((query or '').casefold())
+        if not tokens:
+            return []
+
+        index = self.get_index()
+
+        # entry id -> per token best distance
+        distances = {}
+        for position, token in enumerate(tokens):
+            for word, distance in index.similar_words(token).items():
+                for entry_id in index.words[word]:
+                    best = distances.setdefault(entry_id, {})
+                    if distance < best.get(position, MAX_DISTANCE + 1):
+                        best[position] = distance
+
+        if not distances:
+            return []
+
+        def score(entry_id):
+            matched = distances[entry_id]
+            name, weight, payload = index.entries[entry_id]
+            # an unmatched query word costs more than any typo
+            missing = sum(MAX_DISTANCE + 1 for position in range(len(tokens)) if position not in matched)
+            extra_words = index.word_counts[entry_id] - len(matched)
+            return (sum(matched.values()) + missing, extra_words, -weight, name)
+
+        best = heapq.nsmallest(limit, distances, key=score)
+        if not best:
+            return []
+
+        # Drop names that only matched a fraction of the query
+        most_matched = max(len(distances[entry_id]) for entry_id in best)
+        return [
+            index.entries[entry_id][2] for entry_id in best
+            if len(distances[entry_id]) == most_matched
+        ]
+
+
+class UniversityFuzzyIndex(FuzzyNameIndex):
+    def load(self):
+        for name, location, enrollment, slug, pk in University.objects.values_list(
+            'name', 'location', 'TotalUndergradStudents', 'slug', 'pk'
+        ):
+            yield name, enrollment or 0, {'name': name, 'location': location, 'slug': slug, 'id': pk}
+
+
+class MajorFuzzyIndex(FuzzyNameIndex):
+    def load(self):
+        # import_majors.py copies every major to every university, so only the
+        # distinct names go into the dictionary
+        names = Major.objects.values_list('major_name', flat=True).order_by().distinct()
+        for name in names:
+            yield name, 0, {'name': name}
+
+
+university_fuzzy = UniversityFuzzyIndex()
+major_fuzzy = MajorFuzzyIndex()
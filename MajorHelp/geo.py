@@ -0,0 +1,157 @@
+"""
+Radius search over university coordinates.
+
+University latitude/longitude are mirrored into an SQLite R*Tree table kept
+in sync by triggers, like the full-text tables in search.py. A radius query
+asks the R*Tree for the universities inside the radius' bounding box, then
+computes the exact great-circle distance for just those candidates.
+
+On any other database backend the bounding box is a plain range filter on
+the University columns.
+"""
+
+import math
+
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import University
+from .db import triggers_enabled
+from .search import UNIVERSITY_TABLE
+
+UNIVERSITY_RTREE = 'MajorHelp_university_rtree'
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LAT = 69.05
+
+
+def _trigger_sql(rtree, table):
+    has_coords = 'new.latitude IS NOT NULL AND new.longitude IS NOT NULL'
+    insert = (
+        f'INSERT INTO {rtree} SELECT new.id, new.latitude, new.latitude, '
+        f'new.longitude, new.longitude WHERE {has_coords};'
+    )
+
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {rtree}_ai AFTER INSERT ON {table} BEGIN {insert} END',
+
+        f'CREATE TRIGGER IF NOT EXISTS {rtree}_ad AFTER DELETE ON {table} BEGIN '
+        f'DELETE FROM {rtree} WHERE id = old.id; END',
+
+        f'CREATE TRIGGER IF NOT EXISTS {rtree}_au AFTER UPDATE OF latitude, longitude ON {table} BEGIN '
+        f'DELETE FROM {rtree} WHERE id = old.id; {insert} END',
+    ]
+
+
+def _rebuild_sql(rtree, table):
+    return [
+        f'DELETE FROM {rtree}',
+        f'INSERT INTO {rtree} SELECT id, latitude, latitude, longitude, longitude '
+        f'FROM {table} WHERE latitude IS NOT NULL AND longitude IS NOT NULL',
+    ]
+
+
+def install_rtree(schema_editor):
+    """
+    Create the R*Tree table and its sync triggers, then fill it.
+
+    Safe to run more than once. Like install_fts(), migrations spell out
+    the statements (see 0010), and one that makes Django remake the
+    University table must create the triggers again afterwards.
+    """
+    if not triggers_enabled(schema_editor.connection):
+        return
+
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {UNIVERSITY_RTREE} '
+        f'USING rtree(id, min_lat, max_lat, min_lng, max_lng)'
+    )
+    for sql in _trigger_sql(UNIVERSITY_RTREE, UNIVERSITY_TABLE):
+        schema_editor.execute(sql)
+    for sql in _rebuild_sql(UNIVERSITY_RTREE, UNIVERSITY_TABLE):
+        schema_editor.execute(sql)
+
+
+def uninstall_rtree(schema_editor):
+    if not triggers_enabled(schema_editor.connection):
+        return
+
+    for suffix in ('ai', 'ad', 'au'):
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {UNIVERSITY_RTREE}_{suffix}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {UNIVERSITY_RTREE}')
+
+
+def rebuild_rtree():
+    # Only needed if coordinates were written with the triggers missing
+    with connection.cursor() as cursor:
+        for sql in _rebuild_sql(UNIVERSITY_RTREE, UNIVERSITY_TABLE):
+            cursor.execute(sql)
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    """Great-circle distance in miles."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lng, radius):
+    """
+    (min_lat, max_lat, min_lng, max_lng) containing every point within
+    `radius` miles. Boxes that reach a pole or cross the antimeridian
+    widen to every longitude rather than wrapping.
+    """
+    delta_lat = radius / MILES_PER_DEGREE_LAT
+    min_lat, max_lat = lat - delta_lat, lat + delta_lat
+
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90), min(max_lat, 90), -180, 180
+
+    # A degree of longitude shrinks with the cosine of the latitude, use the
+    # box edge nearest the pole
+    widest = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    delta_lng = radius / (MILES_PER_DEGREE_LAT * widest)
+    min_lng, max_lng = lng - delta_lng, lng + delta_lng
+
+    if min_lng < -180 or max_lng > 180:
+        return min_lat, max_lat, -180, 180
+
+    return min_lat, max_lat, min_lng, max_lng
+
+
+def _candidates(box):
+    min_lat, max_lat, min_lng, max_lng = box
+
+    if triggers_enabled():
+        return University.objects.filter(pk__in=RawSQL(
+            f'SELECT id FROM {UNIVERSITY_RTREE} '
+            f'WHERE max_lat >= %s AND min_lat <= %s AND max_lng >= %s AND min_lng <= %s',
+            [min_lat, max_lat, min_lng, max_lng],
+        ))
+
+    return University.objects.filter(
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lng, longitude__lte=max_lng,
+    )
+
+
+def universities_within(lat, lng, radius, exclude=None, limit=None):
+    """
+    Universities within `radius` miles of (lat, lng), nearest first, as
+    (distance, values dict) pairs.
+    """
+    candidates = _candidates(bounding_box(lat, lng, radius))
+    if exclude is not None:
+        candidates = candidates.exclude(pk=exclude)
+
+    results = []
+    for university in candidates.values('pk', 'name', 'slug', 'location', 'latitude', 'longitude'):
+        distance = haversine(lat, lng, float(university['latitude']), float(university['longitude']))
+        if distance <= radius:
+            results.append((distance, university))
+
+    results.sort(key=lambda result: (result[0], result[1]['name']))
+    return results[:limit] if limit else results
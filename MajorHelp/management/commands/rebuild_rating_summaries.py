@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from MajorHelp.models import University
+from MajorHelp.ratings import refresh_rating_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-category rating summaries from the university ratings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--university', metavar='SLUG',
+            help="Only rebuild this university's summaries.",
+        )
+
+    def handle(self, *args, **options):
+        slug = options['university']
+
+        if slug:
+            university = University.objects.filter(slug=slug).first()
+            if university is None:
+                raise CommandError(f"No university with slug {slug!r}.")
+            refresh_rating_summaries(university_id=university.pk)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt the rating summaries of {university.name}."))
+        else:
+            refresh_rating_summaries()
+            self.stdout.write(self.style.SUCCESS("Rebuilt every rating summary."))
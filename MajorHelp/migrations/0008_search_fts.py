@@ -0,0 +1,83 @@
+# The full-text index of university and major names (see search.py), as
+# it was when this migration was written.
+
+from django.db import migrations
+
+from MajorHelp.db import SQLiteRunSQL
+
+INSTALL_FTS = [
+    (
+        'CREATE VIRTUAL TABLE IF NOT EXISTS MajorHelp_university_fts USING fts5(name, '
+        "content='MajorHelp_university', content_rowid='id', tokenize='unicode61 "
+        "remove_diacritics 2')"
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_university_fts_ai AFTER INSERT ON '
+        'MajorHelp_university BEGIN INSERT INTO MajorHelp_university_fts(rowid, name) '
+        'VALUES (new.id, new.name); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_university_fts_ad AFTER DELETE ON '
+        'MajorHelp_university BEGIN INSERT INTO '
+        'MajorHelp_university_fts(MajorHelp_university_fts, rowid, name) VALUES '
+        "('delete', old.id, old.name); END"
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_university_fts_au AFTER UPDATE OF name '
+        'ON MajorHelp_university BEGIN INSERT INTO '
+        'MajorHelp_university_fts(MajorHelp_university_fts, rowid, name) VALUES '
+        "('delete', old.id, old.name); INSERT INTO MajorHelp_university_fts(rowid, "
+        'name) VALUES (new.id, new.name); END'
+    ),
+    (
+        'INSERT INTO MajorHelp_university_fts(MajorHelp_university_fts) VALUES '
+        "('rebuild')"
+    ),
+    (
+        'CREATE VIRTUAL TABLE IF NOT EXISTS MajorHelp_major_fts USING fts5(major_name, '
+        "department, content='MajorHelp_major', content_rowid='id', tokenize='unicode61 "
+        "remove_diacritics 2')"
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_major_fts_ai AFTER INSERT ON '
+        'MajorHelp_major BEGIN INSERT INTO MajorHelp_major_fts(rowid, major_name, '
+        'department) VALUES (new.id, new.major_name, new.department); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_major_fts_ad AFTER DELETE ON '
+        'MajorHelp_major BEGIN INSERT INTO MajorHelp_major_fts(MajorHelp_major_fts, '
+        "rowid, major_name, department) VALUES ('delete', old.id, old.major_name, "
+        'old.department); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_major_fts_au AFTER UPDATE OF '
+        'major_name, department ON MajorHelp_major BEGIN INSERT INTO '
+        'MajorHelp_major_fts(MajorHelp_major_fts, rowid, major_name, department) VALUES '
+        "('delete', old.id, old.major_name, old.department); INSERT INTO "
+        'MajorHelp_major_fts(rowid, major_name, department) VALUES (new.id, '
+        'new.major_name, new.department); END'
+    ),
+    "INSERT INTO MajorHelp_major_fts(MajorHelp_major_fts) VALUES ('rebuild')",
+]
+
+UNINSTALL_FTS = [
+    'DROP TRIGGER IF EXISTS MajorHelp_university_fts_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_university_fts_ad',
+    'DROP TRIGGER IF EXISTS MajorHelp_university_fts_au',
+    'DROP TABLE IF EXISTS MajorHelp_university_fts',
+    'DROP TRIGGER IF EXISTS MajorHelp_major_fts_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_major_fts_ad',
+    'DROP TRIGGER IF EXISTS MajorHelp_major_fts_au',
+    'DROP TABLE IF EXISTS MajorHelp_major_fts',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0007_alter_customuser_savedcalcs_delete_chatmessage'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(INSTALL_FTS, UNINSTALL_FTS),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0008_search_fts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='major',
+            index=models.Index(fields=['major_name', 'in_state_min_tuition'], name='major_name_in_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='major',
+            index=models.Index(fields=['major_name', 'out_of_state_min_tuition'], name='major_name_out_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='major',
+            index=models.Index(fields=['university', 'in_state_min_tuition'], name='major_univ_in_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='major',
+            index=models.Index(fields=['university', 'out_of_state_min_tuition'], name='major_univ_out_state_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# The R*Tree of university coordinates (see geo.py), as it was when this
+# migration was written.
+
+from django.db import migrations
+
+from MajorHelp.db import SQLiteRunSQL
+
+INSTALL_RTREE = [
+    (
+        'CREATE VIRTUAL TABLE IF NOT EXISTS MajorHelp_university_rtree USING rtree(id, '
+        'min_lat, max_lat, min_lng, max_lng)'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_university_rtree_ai AFTER INSERT ON '
+        'MajorHelp_university BEGIN INSERT INTO MajorHelp_university_rtree SELECT '
+        'new.id, new.latitude, new.latitude, new.longitude, new.longitude WHERE '
+        'new.latitude IS NOT NULL AND new.longitude IS NOT NULL; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_university_rtree_ad AFTER DELETE ON '
+        'MajorHelp_university BEGIN DELETE FROM MajorHelp_university_rtree WHERE id = '
+        'old.id; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_university_rtree_au AFTER UPDATE OF '
+        'latitude, longitude ON MajorHelp_university BEGIN DELETE FROM '
+        'MajorHelp_university_rtree WHERE id = old.id; INSERT INTO '
+        'MajorHelp_university_rtree SELECT new.id, new.latitude, new.latitude, '
+        'new.longitude, new.longitude WHERE new.latitude IS NOT NULL AND new.longitude '
+        'IS NOT NULL; END'
+    ),
+    'DELETE FROM MajorHelp_university_rtree',
+    (
+        'INSERT INTO MajorHelp_university_rtree SELECT id, latitude, latitude, '
+        'longitude, longitude FROM MajorHelp_university WHERE latitude IS NOT NULL AND '
+        'longitude IS NOT NULL'
+    ),
+]
+
+UNINSTALL_RTREE = [
+    'DROP TRIGGER IF EXISTS MajorHelp_university_rtree_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_university_rtree_ad',
+    'DROP TRIGGER IF EXISTS MajorHelp_university_rtree_au',
+    'DROP TABLE IF EXISTS MajorHelp_university_rtree',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0009_major_tuition_indexes'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(INSTALL_RTREE, UNINSTALL_RTREE),
+    ]
@@ -0,0 +1,149 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from MajorHelp.db import SQLiteRunSQL
+
+INSTALL_COST_TRIGGERS = [
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorcost_major_ai AFTER INSERT ON '
+        'MajorHelp_major BEGIN INSERT INTO MajorHelp_majorcost (major_id, '
+        'university_id, in_state_min, in_state_max, out_of_state_min, out_of_state_max, '
+        'grad_in_state_min, grad_in_state_max, grad_out_of_state_min, '
+        'grad_out_of_state_max) SELECT m.id, m.university_id, '
+        'u.in_state_base_min_tuition + m.in_state_min_tuition + u.fees + m.fees, '
+        'u.in_state_base_max_tuition + m.in_state_max_tuition + u.fees + m.fees, '
+        'u.out_of_state_base_min_tuition + m.out_of_state_min_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_max_tuition + m.out_of_state_max_tuition + u.fees '
+        '+ m.fees, u.in_state_base_min_tuition + m.grad_in_state_min_tuition + u.fees + '
+        'm.fees, u.in_state_base_max_tuition + m.grad_in_state_max_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_min_tuition + m.grad_out_of_state_min_tuition + '
+        'u.fees + m.fees, u.out_of_state_base_max_tuition + '
+        'm.grad_out_of_state_max_tuition + u.fees + m.fees FROM MajorHelp_major m JOIN '
+        'MajorHelp_university u ON u.id = m.university_id WHERE m.id = new.id ON '
+        'CONFLICT (major_id) DO UPDATE SET university_id = excluded.university_id, '
+        'in_state_min = excluded.in_state_min, in_state_max = excluded.in_state_max, '
+        'out_of_state_min = excluded.out_of_state_min, out_of_state_max = '
+        'excluded.out_of_state_max, grad_in_state_min = excluded.grad_in_state_min, '
+        'grad_in_state_max = excluded.grad_in_state_max, grad_out_of_state_min = '
+        'excluded.grad_out_of_state_min, grad_out_of_state_max = '
+        'excluded.grad_out_of_state_max; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorcost_major_au AFTER UPDATE OF '
+        'fees, grad_in_state_max_tuition, grad_in_state_min_tuition, '
+        'grad_out_of_state_max_tuition, grad_out_of_state_min_tuition, '
+        'in_state_max_tuition, in_state_min_tuition, out_of_state_max_tuition, '
+        'out_of_state_min_tuition, university_id ON MajorHelp_major BEGIN INSERT INTO '
+        'MajorHelp_majorcost (major_id, university_id, in_state_min, in_state_max, '
+        'out_of_state_min, out_of_state_max, grad_in_state_min, grad_in_state_max, '
+        'grad_out_of_state_min, grad_out_of_state_max) SELECT m.id, m.university_id, '
+        'u.in_state_base_min_tuition + m.in_state_min_tuition + u.fees + m.fees, '
+        'u.in_state_base_max_tuition + m.in_state_max_tuition + u.fees + m.fees, '
+        'u.out_of_state_base_min_tuition + m.out_of_state_min_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_max_tuition + m.out_of_state_max_tuition + u.fees '
+        '+ m.fees, u.in_state_base_min_tuition + m.grad_in_state_min_tuition + u.fees + '
+        'm.fees, u.in_state_base_max_tuition + m.grad_in_state_max_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_min_tuition + m.grad_out_of_state_min_tuition + '
+        'u.fees + m.fees, u.out_of_state_base_max_tuition + '
+        'm.grad_out_of_state_max_tuition + u.fees + m.fees FROM MajorHelp_major m JOIN '
+        'MajorHelp_university u ON u.id = m.university_id WHERE m.id = new.id ON '
+        'CONFLICT (major_id) DO UPDATE SET university_id = excluded.university_id, '
+        'in_state_min = excluded.in_state_min, in_state_max = excluded.in_state_max, '
+        'out_of_state_min = excluded.out_of_state_min, out_of_state_max = '
+        'excluded.out_of_state_max, grad_in_state_min = excluded.grad_in_state_min, '
+        'grad_in_state_max = excluded.grad_in_state_max, grad_out_of_state_min = '
+        'excluded.grad_out_of_state_min, grad_out_of_state_max = '
+        'excluded.grad_out_of_state_max; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorcost_major_ad AFTER DELETE ON '
+        'MajorHelp_major BEGIN DELETE FROM MajorHelp_majorcost WHERE major_id = old.id; '
+        'END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorcost_university_au AFTER UPDATE OF '
+        'fees, in_state_base_max_tuition, in_state_base_min_tuition, '
+        'out_of_state_base_max_tuition, out_of_state_base_min_tuition ON '
+        'MajorHelp_university BEGIN INSERT INTO MajorHelp_majorcost (major_id, '
+        'university_id, in_state_min, in_state_max, out_of_state_min, out_of_state_max, '
+        'grad_in_state_min, grad_in_state_max, grad_out_of_state_min, '
+        'grad_out_of_state_max) SELECT m.id, m.university_id, '
+        'u.in_state_base_min_tuition + m.in_state_min_tuition + u.fees + m.fees, '
+        'u.in_state_base_max_tuition + m.in_state_max_tuition + u.fees + m.fees, '
+        'u.out_of_state_base_min_tuition + m.out_of_state_min_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_max_tuition + m.out_of_state_max_tuition + u.fees '
+        '+ m.fees, u.in_state_base_min_tuition + m.grad_in_state_min_tuition + u.fees + '
+        'm.fees, u.in_state_base_max_tuition + m.grad_in_state_max_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_min_tuition + m.grad_out_of_state_min_tuition + '
+        'u.fees + m.fees, u.out_of_state_base_max_tuition + '
+        'm.grad_out_of_state_max_tuition + u.fees + m.fees FROM MajorHelp_major m JOIN '
+        'MajorHelp_university u ON u.id = m.university_id WHERE m.university_id = '
+        'new.id ON CONFLICT (major_id) DO UPDATE SET university_id = '
+        'excluded.university_id, in_state_min = excluded.in_state_min, in_state_max = '
+        'excluded.in_state_max, out_of_state_min = excluded.out_of_state_min, '
+        'out_of_state_max = excluded.out_of_state_max, grad_in_state_min = '
+        'excluded.grad_in_state_min, grad_in_state_max = excluded.grad_in_state_max, '
+        'grad_out_of_state_min = excluded.grad_out_of_state_min, grad_out_of_state_max '
+        '= excluded.grad_out_of_state_max; END'
+    ),
+    (
+        'INSERT INTO MajorHelp_majorcost (major_id, university_id, in_state_min, '
+        'in_state_max, out_of_state_min, out_of_state_max, grad_in_state_min, '
+        'grad_in_state_max, grad_out_of_state_min, grad_out_of_state_max) SELECT m.id, '
+        'm.university_id, u.in_state_base_min_tuition + m.in_state_min_tuition + u.fees '
+        '+ m.fees, u.in_state_base_max_tuition + m.in_state_max_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_min_tuition + m.out_of_state_min_tuition + u.fees '
+        '+ m.fees, u.out_of_state_base_max_tuition + m.out_of_state_max_tuition + '
+        'u.fees + m.fees, u.in_state_base_min_tuition + m.grad_in_state_min_tuition + '
+        'u.fees + m.fees, u.in_state_base_max_tuition + m.grad_in_state_max_tuition + '
+        'u.fees + m.fees, u.out_of_state_base_min_tuition + '
+        'm.grad_out_of_state_min_tuition + u.fees + m.fees, '
+        'u.out_of_state_base_max_tuition + m.grad_out_of_state_max_tuition + u.fees + '
+        'm.fees FROM MajorHelp_major m JOIN MajorHelp_university u ON u.id = '
+        'm.university_id WHERE 1 = 1 ON CONFLICT (major_id) DO UPDATE SET university_id '
+        '= excluded.university_id, in_state_min = excluded.in_state_min, in_state_max = '
+        'excluded.in_state_max, out_of_state_min = excluded.out_of_state_min, '
+        'out_of_state_max = excluded.out_of_state_max, grad_in_state_min = '
+        'excluded.grad_in_state_min, grad_in_state_max = excluded.grad_in_state_max, '
+        'grad_out_of_state_min = excluded.grad_out_of_state_min, grad_out_of_state_max '
+        '= excluded.grad_out_of_state_max'
+    ),
+]
+
+UNINSTALL_COST_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS MajorHelp_majorcost_major_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorcost_major_au',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorcost_major_ad',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorcost_university_au',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0010_university_rtree'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MajorCost',
+            fields=[
+                ('major', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='cost', serialize=False, to='MajorHelp.major')),
+                ('in_state_min', models.IntegerField(db_index=True, default=0)),
+                ('in_state_max', models.IntegerField(default=0)),
+                ('out_of_state_min', models.IntegerField(db_index=True, default=0)),
+                ('out_of_state_max', models.IntegerField(default=0)),
+                ('grad_in_state_min', models.IntegerField(db_index=True, default=0)),
+                ('grad_in_state_max', models.IntegerField(default=0)),
+                ('grad_out_of_state_min', models.IntegerField(db_index=True, default=0)),
+                ('grad_out_of_state_max', models.IntegerField(default=0)),
+                ('university', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='MajorHelp.university')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['university', 'in_state_min'], name='cost_univ_in_state_idx'), models.Index(fields=['university', 'out_of_state_min'], name='cost_univ_out_state_idx')],
+            },
+        ),
+        SQLiteRunSQL(INSTALL_COST_TRIGGERS, UNINSTALL_COST_TRIGGERS),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_saved_calcs(apps, schema_editor):
+    # One SavedCalculator row per entry of each user's savedCalcs blob
+    CustomUser = apps.get_model('MajorHelp', 'CustomUser')
+    SavedCalculator = apps.get_model('MajorHelp', 'SavedCalculator')
+
+    rows = []
+    for user_id, saved in CustomUser.objects.values_list('id', 'savedCalcs').iterator():
+        if not isinstance(saved, dict):
+            continue
+        for key, calc in saved.items():
+            if not isinstance(calc, dict):
+                continue
+            rows.append(SavedCalculator(
+                user_id=user_id,
+                key=key.lower(),
+                calc_name=str(calc.get('calcName') or key),
+                uni=str(calc.get('uni') or ''),
+                outstate=bool(calc.get('outstate')),
+                dept=str(calc.get('dept') or ''),
+                major=str(calc.get('major') or ''),
+                aid=calc.get('aid') or '',
+            ))
+
+    SavedCalculator.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+
+
+def restore_saved_calcs(apps, schema_editor):
+    CustomUser = apps.get_model('MajorHelp', 'CustomUser')
+    SavedCalculator = apps.get_model('MajorHelp', 'SavedCalculator')
+
+    blobs = {}
+    for calc in SavedCalculator.objects.order_by('pk').iterator():
+        blobs.setdefault(calc.user_id, {})[calc.key] = {
+            'calcName': calc.calc_name,
+            'uni': calc.uni,
+            'outstate': calc.outstate,
+            'dept': calc.dept,
+            'major': calc.major,
+            'aid': calc.aid,
+        }
+
+    for user_id, saved in blobs.items():
+        CustomUser.objects.filter(pk=user_id).update(savedCalcs=saved)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0011_majorcost'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedCalculator',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255)),
+                ('calc_name', models.CharField(max_length=255)),
+                ('uni', models.CharField(blank=True, max_length=255)),
+                ('outstate', models.BooleanField(default=False)),
+                ('dept', models.CharField(blank=True, max_length=255)),
+                ('major', models.CharField(blank=True, max_length=255)),
+                ('aid', models.JSONField(blank=True, default=str)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_calculators', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'key')},
+            },
+        ),
+        migrations.RunPython(copy_saved_calcs, restore_saved_calcs),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='savedCalcs',
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0012_savedcalculator'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='financialaid',
+            index=models.Index(fields=['name'], name='aid_name_idx'),
+        ),
+    ]
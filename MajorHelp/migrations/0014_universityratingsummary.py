@@ -0,0 +1,69 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from MajorHelp.db import SQLiteRunSQL
+
+INSTALL_RATING_TRIGGERS = [
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ai AFTER INSERT '
+        'ON MajorHelp_universityrating BEGIN INSERT INTO '
+        'MajorHelp_universityratingsummary (university_id, category, count, total) '
+        'VALUES (new.university_id, new.category, 1, new.rating) ON CONFLICT '
+        '(university_id, category) DO UPDATE SET count = count + 1, total = total + '
+        'excluded.total; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_au AFTER UPDATE '
+        'OF university_id, category, rating ON MajorHelp_universityrating BEGIN UPDATE '
+        'MajorHelp_universityratingsummary SET count = count - 1, total = total - '
+        'old.rating WHERE university_id = old.university_id AND category = '
+        'old.category; INSERT INTO MajorHelp_universityratingsummary (university_id, '
+        'category, count, total) VALUES (new.university_id, new.category, 1, '
+        'new.rating) ON CONFLICT (university_id, category) DO UPDATE SET count = count '
+        '+ 1, total = total + excluded.total; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ad AFTER DELETE '
+        'ON MajorHelp_universityrating BEGIN UPDATE MajorHelp_universityratingsummary '
+        'SET count = count - 1, total = total - old.rating WHERE university_id = '
+        'old.university_id AND category = old.category; END'
+    ),
+    'DELETE FROM MajorHelp_universityratingsummary WHERE 1 = 1',
+    (
+        'INSERT INTO MajorHelp_universityratingsummary (university_id, category, count, '
+        'total) SELECT university_id, category, COUNT(*), SUM(rating) FROM '
+        'MajorHelp_universityrating WHERE 1 = 1 GROUP BY university_id, category'
+    ),
+]
+
+UNINSTALL_RATING_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_au',
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_ad',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0013_financialaid_name_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UniversityRatingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('campus', 'Campus'), ('athletics', 'Athletics'), ('safety', 'Safety'), ('social', 'Social'), ('professor', 'Professor'), ('dorm', 'Dorm'), ('dining', 'Dining')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=1, default=0, max_digits=12)),
+                ('university', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rating_summaries', to='MajorHelp.university')),
+            ],
+            options={
+                'unique_together': {('university', 'category')},
+            },
+        ),
+        SQLiteRunSQL(INSTALL_RATING_TRIGGERS, UNINSTALL_RATING_TRIGGERS),
+    ]
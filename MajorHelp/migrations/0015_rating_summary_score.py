@@ -0,0 +1,106 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:43
+
+from django.db import migrations, models
+
+from MajorHelp.db import SQLiteRunSQL
+
+# Adding the score makes Django remake the summary table, which SQLite
+# won't do while 0014's triggers on UniversityRating write to it, so
+# they are dropped first and replaced by triggers that keep the score.
+UNINSTALL_RATING_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_au',
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_ad',
+]
+
+REINSTALL_0014_TRIGGERS = [
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ai AFTER INSERT '
+        'ON MajorHelp_universityrating BEGIN INSERT INTO '
+        'MajorHelp_universityratingsummary (university_id, category, count, total) '
+        'VALUES (new.university_id, new.category, 1, new.rating) ON CONFLICT '
+        '(university_id, category) DO UPDATE SET count = count + 1, total = total + '
+        'excluded.total; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_au AFTER UPDATE '
+        'OF university_id, category, rating ON MajorHelp_universityrating BEGIN UPDATE '
+        'MajorHelp_universityratingsummary SET count = count - 1, total = total - '
+        'old.rating WHERE university_id = old.university_id AND category = '
+        'old.category; INSERT INTO MajorHelp_universityratingsummary (university_id, '
+        'category, count, total) VALUES (new.university_id, new.category, 1, '
+        'new.rating) ON CONFLICT (university_id, category) DO UPDATE SET count = count '
+        '+ 1, total = total + excluded.total; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ad AFTER DELETE '
+        'ON MajorHelp_universityrating BEGIN UPDATE MajorHelp_universityratingsummary '
+        'SET count = count - 1, total = total - old.rating WHERE university_id = '
+        'old.university_id AND category = old.category; END'
+    ),
+    'DELETE FROM MajorHelp_universityratingsummary WHERE 1 = 1',
+    (
+        'INSERT INTO MajorHelp_universityratingsummary (university_id, category, count, '
+        'total) SELECT university_id, category, COUNT(*), SUM(rating) FROM '
+        'MajorHelp_universityrating WHERE 1 = 1 GROUP BY university_id, category'
+    ),
+]
+
+INSTALL_RATING_TRIGGERS = [
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ai AFTER INSERT '
+        'ON MajorHelp_universityrating BEGIN INSERT INTO '
+        'MajorHelp_universityratingsummary (university_id, category, count, total, '
+        'score) VALUES (new.university_id, new.category, 1, new.rating, (15.0 + '
+        'new.rating) / (5 + 1)) ON CONFLICT (university_id, category) DO UPDATE SET '
+        'count = count + 1, total = total + excluded.total, score = (15.0 + total + '
+        'excluded.total) / (5 + count + 1); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_au AFTER UPDATE '
+        'OF university_id, category, rating ON MajorHelp_universityrating BEGIN UPDATE '
+        'MajorHelp_universityratingsummary SET count = count - 1, total = total - '
+        'old.rating, score = (15.0 + total - old.rating) / (5 + count - 1) WHERE '
+        'university_id = old.university_id AND category = old.category; INSERT INTO '
+        'MajorHelp_universityratingsummary (university_id, category, count, total, '
+        'score) VALUES (new.university_id, new.category, 1, new.rating, (15.0 + '
+        'new.rating) / (5 + 1)) ON CONFLICT (university_id, category) DO UPDATE SET '
+        'count = count + 1, total = total + excluded.total, score = (15.0 + total + '
+        'excluded.total) / (5 + count + 1); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ad AFTER DELETE '
+        'ON MajorHelp_universityrating BEGIN UPDATE MajorHelp_universityratingsummary '
+        'SET count = count - 1, total = total - old.rating, score = (15.0 + total - '
+        'old.rating) / (5 + count - 1) WHERE university_id = old.university_id AND '
+        'category = old.category; END'
+    ),
+    'DELETE FROM MajorHelp_universityratingsummary WHERE 1 = 1',
+    (
+        'INSERT INTO MajorHelp_universityratingsummary (university_id, category, count, '
+        'total, score) SELECT university_id, category, COUNT(*), SUM(rating), (15.0 + '
+        'SUM(rating)) / (5 + COUNT(*)) FROM MajorHelp_universityrating WHERE 1 = 1 '
+        'GROUP BY university_id, category'
+    ),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0014_universityratingsummary'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(UNINSTALL_RATING_TRIGGERS, REINSTALL_0014_TRIGGERS),
+        migrations.AddField(
+            model_name='universityratingsummary',
+            name='score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='universityratingsummary',
+            index=models.Index(fields=['category', '-score', '-count', 'id'], name='rating_summary_board_idx'),
+        ),
+        SQLiteRunSQL(INSTALL_RATING_TRIGGERS, UNINSTALL_RATING_TRIGGERS),
+    ]
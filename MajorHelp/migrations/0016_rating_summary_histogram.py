@@ -0,0 +1,159 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:48
+
+from django.db import migrations, models
+
+from MajorHelp.db import SQLiteRunSQL
+
+# Adding the star columns makes Django remake the summary table, which
+# SQLite won't do while 0015's triggers on UniversityRating write to it,
+# so they are dropped first (and put back going backwards). The new
+# triggers keep the histogram too.
+UNINSTALL_RATING_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_au',
+    'DROP TRIGGER IF EXISTS MajorHelp_universityratingsummary_ad',
+]
+
+REINSTALL_0015_TRIGGERS = [
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ai AFTER INSERT '
+        'ON MajorHelp_universityrating BEGIN INSERT INTO '
+        'MajorHelp_universityratingsummary (university_id, category, count, total, '
+        'score) VALUES (new.university_id, new.category, 1, new.rating, (15.0 + '
+        'new.rating) / (5 + 1)) ON CONFLICT (university_id, category) DO UPDATE SET '
+        'count = count + 1, total = total + excluded.total, score = (15.0 + total + '
+        'excluded.total) / (5 + count + 1); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_au AFTER UPDATE '
+        'OF university_id, category, rating ON MajorHelp_universityrating BEGIN UPDATE '
+        'MajorHelp_universityratingsummary SET count = count - 1, total = total - '
+        'old.rating, score = (15.0 + total - old.rating) / (5 + count - 1) WHERE '
+        'university_id = old.university_id AND category = old.category; INSERT INTO '
+        'MajorHelp_universityratingsummary (university_id, category, count, total, '
+        'score) VALUES (new.university_id, new.category, 1, new.rating, (15.0 + '
+        'new.rating) / (5 + 1)) ON CONFLICT (university_id, category) DO UPDATE SET '
+        'count = count + 1, total = total + excluded.total, score = (15.0 + total + '
+        'excluded.total) / (5 + count + 1); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ad AFTER DELETE '
+        'ON MajorHelp_universityrating BEGIN UPDATE MajorHelp_universityratingsummary '
+        'SET count = count - 1, total = total - old.rating, score = (15.0 + total - '
+        'old.rating) / (5 + count - 1) WHERE university_id = old.university_id AND '
+        'category = old.category; END'
+    ),
+    'DELETE FROM MajorHelp_universityratingsummary WHERE 1 = 1',
+    (
+        'INSERT INTO MajorHelp_universityratingsummary (university_id, category, count, '
+        'total, score) SELECT university_id, category, COUNT(*), SUM(rating), (15.0 + '
+        'SUM(rating)) / (5 + COUNT(*)) FROM MajorHelp_universityrating WHERE 1 = 1 '
+        'GROUP BY university_id, category'
+    ),
+]
+
+INSTALL_RATING_TRIGGERS = [
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ai AFTER INSERT '
+        'ON MajorHelp_universityrating BEGIN INSERT INTO '
+        'MajorHelp_universityratingsummary (university_id, category, count, total, '
+        'score, stars_1, stars_2, stars_3, stars_4, stars_5) VALUES (new.university_id, '
+        'new.category, 1, new.rating, (15.0 + new.rating) / (5 + 1), CASE WHEN '
+        'new.rating >= 1 AND new.rating < 2 THEN 1 ELSE 0 END, CASE WHEN new.rating >= '
+        '2 AND new.rating < 3 THEN 1 ELSE 0 END, CASE WHEN new.rating >= 3 AND '
+        'new.rating < 4 THEN 1 ELSE 0 END, CASE WHEN new.rating >= 4 AND new.rating < 5 '
+        'THEN 1 ELSE 0 END, CASE WHEN new.rating >= 5 AND new.rating < 6 THEN 1 ELSE 0 '
+        'END) ON CONFLICT (university_id, category) DO UPDATE SET count = count + 1, '
+        'total = total + excluded.total, score = (15.0 + total + excluded.total) / (5 + '
+        'count + 1), stars_1 = stars_1 + excluded.stars_1, stars_2 = stars_2 + '
+        'excluded.stars_2, stars_3 = stars_3 + excluded.stars_3, stars_4 = stars_4 + '
+        'excluded.stars_4, stars_5 = stars_5 + excluded.stars_5; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_au AFTER UPDATE '
+        'OF university_id, category, rating ON MajorHelp_universityrating BEGIN UPDATE '
+        'MajorHelp_universityratingsummary SET count = count - 1, total = total - '
+        'old.rating, score = (15.0 + total - old.rating) / (5 + count - 1), stars_1 = '
+        'stars_1 - (CASE WHEN old.rating >= 1 AND old.rating < 2 THEN 1 ELSE 0 END), '
+        'stars_2 = stars_2 - (CASE WHEN old.rating >= 2 AND old.rating < 3 THEN 1 ELSE '
+        '0 END), stars_3 = stars_3 - (CASE WHEN old.rating >= 3 AND old.rating < 4 THEN '
+        '1 ELSE 0 END), stars_4 = stars_4 - (CASE WHEN old.rating >= 4 AND old.rating < '
+        '5 THEN 1 ELSE 0 END), stars_5 = stars_5 - (CASE WHEN old.rating >= 5 AND '
+        'old.rating < 6 THEN 1 ELSE 0 END) WHERE university_id = old.university_id AND '
+        'category = old.category; INSERT INTO MajorHelp_universityratingsummary '
+        '(university_id, category, count, total, score, stars_1, stars_2, stars_3, '
+        'stars_4, stars_5) VALUES (new.university_id, new.category, 1, new.rating, '
+        '(15.0 + new.rating) / (5 + 1), CASE WHEN new.rating >= 1 AND new.rating < 2 '
+        'THEN 1 ELSE 0 END, CASE WHEN new.rating >= 2 AND new.rating < 3 THEN 1 ELSE 0 '
+        'END, CASE WHEN new.rating >= 3 AND new.rating < 4 THEN 1 ELSE 0 END, CASE WHEN '
+        'new.rating >= 4 AND new.rating < 5 THEN 1 ELSE 0 END, CASE WHEN new.rating >= '
+        '5 AND new.rating < 6 THEN 1 ELSE 0 END) ON CONFLICT (university_id, category) '
+        'DO UPDATE SET count = count + 1, total = total + excluded.total, score = (15.0 '
+        '+ total + excluded.total) / (5 + count + 1), stars_1 = stars_1 + '
+        'excluded.stars_1, stars_2 = stars_2 + excluded.stars_2, stars_3 = stars_3 + '
+        'excluded.stars_3, stars_4 = stars_4 + excluded.stars_4, stars_5 = stars_5 + '
+        'excluded.stars_5; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityratingsummary_ad AFTER DELETE '
+        'ON MajorHelp_universityrating BEGIN UPDATE MajorHelp_universityratingsummary '
+        'SET count = count - 1, total = total - old.rating, score = (15.0 + total - '
+        'old.rating) / (5 + count - 1), stars_1 = stars_1 - (CASE WHEN old.rating >= 1 '
+        'AND old.rating < 2 THEN 1 ELSE 0 END), stars_2 = stars_2 - (CASE WHEN '
+        'old.rating >= 2 AND old.rating < 3 THEN 1 ELSE 0 END), stars_3 = stars_3 - '
+        '(CASE WHEN old.rating >= 3 AND old.rating < 4 THEN 1 ELSE 0 END), stars_4 = '
+        'stars_4 - (CASE WHEN old.rating >= 4 AND old.rating < 5 THEN 1 ELSE 0 END), '
+        'stars_5 = stars_5 - (CASE WHEN old.rating >= 5 AND old.rating < 6 THEN 1 ELSE '
+        '0 END) WHERE university_id = old.university_id AND category = old.category; '
+        'END'
+    ),
+    'DELETE FROM MajorHelp_universityratingsummary WHERE 1 = 1',
+    (
+        'INSERT INTO MajorHelp_universityratingsummary (university_id, category, count, '
+        'total, score, stars_1, stars_2, stars_3, stars_4, stars_5) SELECT '
+        'university_id, category, COUNT(*), SUM(rating), (15.0 + SUM(rating)) / (5 + '
+        'COUNT(*)), SUM(CASE WHEN rating >= 1 AND rating < 2 THEN 1 ELSE 0 END), '
+        'SUM(CASE WHEN rating >= 2 AND rating < 3 THEN 1 ELSE 0 END), SUM(CASE WHEN '
+        'rating >= 3 AND rating < 4 THEN 1 ELSE 0 END), SUM(CASE WHEN rating >= 4 AND '
+        'rating < 5 THEN 1 ELSE 0 END), SUM(CASE WHEN rating >= 5 AND rating < 6 THEN 1 '
+        'ELSE 0 END) FROM MajorHelp_universityrating WHERE 1 = 1 GROUP BY '
+        'university_id, category'
+    ),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0015_rating_summary_score'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(UNINSTALL_RATING_TRIGGERS, REINSTALL_0015_TRIGGERS),
+        migrations.AddField(
+            model_name='universityratingsummary',
+            name='stars_1',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='universityratingsummary',
+            name='stars_2',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='universityratingsummary',
+            name='stars_3',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='universityratingsummary',
+            name='stars_4',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='universityratingsummary',
+            name='stars_5',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        SQLiteRunSQL(INSTALL_RATING_TRIGGERS, UNINSTALL_RATING_TRIGGERS),
+    ]
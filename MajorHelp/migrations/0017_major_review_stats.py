@@ -0,0 +1,194 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+from MajorHelp.db import SQLiteRunSQL
+
+
+# Adding the columns makes Django remake the Major table on SQLite. That
+# drops the table's full-text and cost triggers, and fails while the cost
+# trigger on University still reads the table, so the triggers are dropped
+# first and put back afterwards (in both directions). The remake keeps the
+# ids, so the full-text index and the MajorCost rows stay valid and only the
+# triggers are created again.
+
+UNINSTALL_MAJOR_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS MajorHelp_majorcost_major_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorcost_major_au',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorcost_major_ad',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorcost_university_au',
+]
+
+REINSTALL_MAJOR_TRIGGERS = [
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_major_fts_ai AFTER INSERT ON '
+        'MajorHelp_major BEGIN INSERT INTO MajorHelp_major_fts(rowid, major_name, '
+        'department) VALUES (new.id, new.major_name, new.department); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_major_fts_ad AFTER DELETE ON '
+        'MajorHelp_major BEGIN INSERT INTO MajorHelp_major_fts(MajorHelp_major_fts, '
+        "rowid, major_name, department) VALUES ('delete', old.id, old.major_name, "
+        'old.department); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_major_fts_au AFTER UPDATE OF '
+        'major_name, department ON MajorHelp_major BEGIN INSERT INTO '
+        'MajorHelp_major_fts(MajorHelp_major_fts, rowid, major_name, department) VALUES '
+        "('delete', old.id, old.major_name, old.department); INSERT INTO "
+        'MajorHelp_major_fts(rowid, major_name, department) VALUES (new.id, '
+        'new.major_name, new.department); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorcost_major_ai AFTER INSERT ON '
+        'MajorHelp_major BEGIN INSERT INTO MajorHelp_majorcost (major_id, '
+        'university_id, in_state_min, in_state_max, out_of_state_min, out_of_state_max, '
+        'grad_in_state_min, grad_in_state_max, grad_out_of_state_min, '
+        'grad_out_of_state_max) SELECT m.id, m.university_id, '
+        'u.in_state_base_min_tuition + m.in_state_min_tuition + u.fees + m.fees, '
+        'u.in_state_base_max_tuition + m.in_state_max_tuition + u.fees + m.fees, '
+        'u.out_of_state_base_min_tuition + m.out_of_state_min_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_max_tuition + m.out_of_state_max_tuition + u.fees '
+        '+ m.fees, u.in_state_base_min_tuition + m.grad_in_state_min_tuition + u.fees + '
+        'm.fees, u.in_state_base_max_tuition + m.grad_in_state_max_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_min_tuition + m.grad_out_of_state_min_tuition + '
+        'u.fees + m.fees, u.out_of_state_base_max_tuition + '
+        'm.grad_out_of_state_max_tuition + u.fees + m.fees FROM MajorHelp_major m JOIN '
+        'MajorHelp_university u ON u.id = m.university_id WHERE m.id = new.id ON '
+        'CONFLICT (major_id) DO UPDATE SET university_id = excluded.university_id, '
+        'in_state_min = excluded.in_state_min, in_state_max = excluded.in_state_max, '
+        'out_of_state_min = excluded.out_of_state_min, out_of_state_max = '
+        'excluded.out_of_state_max, grad_in_state_min = excluded.grad_in_state_min, '
+        'grad_in_state_max = excluded.grad_in_state_max, grad_out_of_state_min = '
+        'excluded.grad_out_of_state_min, grad_out_of_state_max = '
+        'excluded.grad_out_of_state_max; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorcost_major_au AFTER UPDATE OF '
+        'fees, grad_in_state_max_tuition, grad_in_state_min_tuition, '
+        'grad_out_of_state_max_tuition, grad_out_of_state_min_tuition, '
+        'in_state_max_tuition, in_state_min_tuition, out_of_state_max_tuition, '
+        'out_of_state_min_tuition, university_id ON MajorHelp_major BEGIN INSERT INTO '
+        'MajorHelp_majorcost (major_id, university_id, in_state_min, in_state_max, '
+        'out_of_state_min, out_of_state_max, grad_in_state_min, grad_in_state_max, '
+        'grad_out_of_state_min, grad_out_of_state_max) SELECT m.id, m.university_id, '
+        'u.in_state_base_min_tuition + m.in_state_min_tuition + u.fees + m.fees, '
+        'u.in_state_base_max_tuition + m.in_state_max_tuition + u.fees + m.fees, '
+        'u.out_of_state_base_min_tuition + m.out_of_state_min_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_max_tuition + m.out_of_state_max_tuition + u.fees '
+        '+ m.fees, u.in_state_base_min_tuition + m.grad_in_state_min_tuition + u.fees + '
+        'm.fees, u.in_state_base_max_tuition + m.grad_in_state_max_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_min_tuition + m.grad_out_of_state_min_tuition + '
+        'u.fees + m.fees, u.out_of_state_base_max_tuition + '
+        'm.grad_out_of_state_max_tuition + u.fees + m.fees FROM MajorHelp_major m JOIN '
+        'MajorHelp_university u ON u.id = m.university_id WHERE m.id = new.id ON '
+        'CONFLICT (major_id) DO UPDATE SET university_id = excluded.university_id, '
+        'in_state_min = excluded.in_state_min, in_state_max = excluded.in_state_max, '
+        'out_of_state_min = excluded.out_of_state_min, out_of_state_max = '
+        'excluded.out_of_state_max, grad_in_state_min = excluded.grad_in_state_min, '
+        'grad_in_state_max = excluded.grad_in_state_max, grad_out_of_state_min = '
+        'excluded.grad_out_of_state_min, grad_out_of_state_max = '
+        'excluded.grad_out_of_state_max; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorcost_major_ad AFTER DELETE ON '
+        'MajorHelp_major BEGIN DELETE FROM MajorHelp_majorcost WHERE major_id = old.id; '
+        'END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorcost_university_au AFTER UPDATE OF '
+        'fees, in_state_base_max_tuition, in_state_base_min_tuition, '
+        'out_of_state_base_max_tuition, out_of_state_base_min_tuition ON '
+        'MajorHelp_university BEGIN INSERT INTO MajorHelp_majorcost (major_id, '
+        'university_id, in_state_min, in_state_max, out_of_state_min, out_of_state_max, '
+        'grad_in_state_min, grad_in_state_max, grad_out_of_state_min, '
+        'grad_out_of_state_max) SELECT m.id, m.university_id, '
+        'u.in_state_base_min_tuition + m.in_state_min_tuition + u.fees + m.fees, '
+        'u.in_state_base_max_tuition + m.in_state_max_tuition + u.fees + m.fees, '
+        'u.out_of_state_base_min_tuition + m.out_of_state_min_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_max_tuition + m.out_of_state_max_tuition + u.fees '
+        '+ m.fees, u.in_state_base_min_tuition + m.grad_in_state_min_tuition + u.fees + '
+        'm.fees, u.in_state_base_max_tuition + m.grad_in_state_max_tuition + u.fees + '
+        'm.fees, u.out_of_state_base_min_tuition + m.grad_out_of_state_min_tuition + '
+        'u.fees + m.fees, u.out_of_state_base_max_tuition + '
+        'm.grad_out_of_state_max_tuition + u.fees + m.fees FROM MajorHelp_major m JOIN '
+        'MajorHelp_university u ON u.id = m.university_id WHERE m.university_id = '
+        'new.id ON CONFLICT (major_id) DO UPDATE SET university_id = '
+        'excluded.university_id, in_state_min = excluded.in_state_min, in_state_max = '
+        'excluded.in_state_max, out_of_state_min = excluded.out_of_state_min, '
+        'out_of_state_max = excluded.out_of_state_max, grad_in_state_min = '
+        'excluded.grad_in_state_min, grad_in_state_max = excluded.grad_in_state_max, '
+        'grad_out_of_state_min = excluded.grad_out_of_state_min, grad_out_of_state_max '
+        '= excluded.grad_out_of_state_max; END'
+    ),
+]
+
+INSTALL_REVIEW_TRIGGERS = [
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorreview_ai AFTER INSERT ON '
+        'MajorHelp_majorreview BEGIN UPDATE MajorHelp_major SET review_count = (SELECT '
+        'COUNT(*) FROM MajorHelp_majorreview r WHERE r.major_id = MajorHelp_major.id), '
+        'avg_rating = COALESCE((SELECT AVG(r.rating) FROM MajorHelp_majorreview r WHERE '
+        'r.major_id = MajorHelp_major.id), 0) WHERE id = new.major_id; END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorreview_au AFTER UPDATE OF '
+        'major_id, rating ON MajorHelp_majorreview BEGIN UPDATE MajorHelp_major SET '
+        'review_count = (SELECT COUNT(*) FROM MajorHelp_majorreview r WHERE r.major_id '
+        '= MajorHelp_major.id), avg_rating = COALESCE((SELECT AVG(r.rating) FROM '
+        'MajorHelp_majorreview r WHERE r.major_id = MajorHelp_major.id), 0) WHERE id IN '
+        '(old.major_id, new.major_id); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorreview_ad AFTER DELETE ON '
+        'MajorHelp_majorreview BEGIN UPDATE MajorHelp_major SET review_count = (SELECT '
+        'COUNT(*) FROM MajorHelp_majorreview r WHERE r.major_id = MajorHelp_major.id), '
+        'avg_rating = COALESCE((SELECT AVG(r.rating) FROM MajorHelp_majorreview r WHERE '
+        'r.major_id = MajorHelp_major.id), 0) WHERE id = old.major_id; END'
+    ),
+    (
+        'UPDATE MajorHelp_major SET review_count = (SELECT COUNT(*) FROM '
+        'MajorHelp_majorreview r WHERE r.major_id = MajorHelp_major.id), avg_rating = '
+        'COALESCE((SELECT AVG(r.rating) FROM MajorHelp_majorreview r WHERE r.major_id = '
+        'MajorHelp_major.id), 0) WHERE 1 = 1'
+    ),
+]
+
+UNINSTALL_REVIEW_TRIGGERS = [
+    'DROP TRIGGER IF EXISTS MajorHelp_majorreview_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorreview_au',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorreview_ad',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0016_rating_summary_histogram'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(UNINSTALL_MAJOR_TRIGGERS, REINSTALL_MAJOR_TRIGGERS),
+        migrations.AddField(
+            model_name='major',
+            name='avg_rating',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='major',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='major',
+            index=models.Index(fields=['-avg_rating', '-review_count'], name='major_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='major',
+            index=models.Index(fields=['university', '-avg_rating'], name='major_univ_rating_idx'),
+        ),
+        SQLiteRunSQL(
+            REINSTALL_MAJOR_TRIGGERS + INSTALL_REVIEW_TRIGGERS,
+            UNINSTALL_MAJOR_TRIGGERS + UNINSTALL_REVIEW_TRIGGERS,
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0017_major_review_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='majorreview',
+            index=models.Index(fields=['major', '-pub_date', '-id'], name='major_review_feed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='universityreview',
+            index=models.Index(fields=['university', '-pub_date', '-id'], name='univ_review_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# UniversityReview gets a foreign key to its author. Existing reviews are
+# matched to users by username. The username column stays: it is what the
+# review shows once the author's account is gone, so reviews whose author
+# no longer exists are kept with no user.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_users(apps, schema_editor):
+    UniversityReview = apps.get_model('MajorHelp', 'UniversityReview')
+    CustomUser = apps.get_model('MajorHelp', 'CustomUser')
+
+    UniversityReview.objects.update(user=Subquery(
+        CustomUser.objects.filter(username=OuterRef('username')).values('pk')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0018_review_feed_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='universityreview',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='university_reviews', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_users, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='universityreview',
+            unique_together={('user', 'university')},
+        ),
+        migrations.AddIndex(
+            model_name='universityreview',
+            index=models.Index(fields=['user', '-pub_date', '-id'], name='user_review_feed_idx'),
+        ),
+    ]
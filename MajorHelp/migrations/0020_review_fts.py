@@ -0,0 +1,87 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:58
+
+from django.db import migrations
+
+from MajorHelp.db import SQLiteRunSQL
+
+INSTALL_REVIEW_FTS = [
+    (
+        'CREATE VIRTUAL TABLE IF NOT EXISTS MajorHelp_universityreview_fts USING '
+        "fts5(review_text, content='MajorHelp_universityreview', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityreview_fts_ai AFTER INSERT ON '
+        'MajorHelp_universityreview BEGIN INSERT INTO '
+        'MajorHelp_universityreview_fts(rowid, review_text) VALUES (new.id, '
+        'new.review_text); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityreview_fts_ad AFTER DELETE ON '
+        'MajorHelp_universityreview BEGIN INSERT INTO '
+        'MajorHelp_universityreview_fts(MajorHelp_universityreview_fts, rowid, '
+        "review_text) VALUES ('delete', old.id, old.review_text); END"
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_universityreview_fts_au AFTER UPDATE OF '
+        'review_text ON MajorHelp_universityreview BEGIN INSERT INTO '
+        'MajorHelp_universityreview_fts(MajorHelp_universityreview_fts, rowid, '
+        "review_text) VALUES ('delete', old.id, old.review_text); INSERT INTO "
+        'MajorHelp_universityreview_fts(rowid, review_text) VALUES (new.id, '
+        'new.review_text); END'
+    ),
+    (
+        'INSERT INTO MajorHelp_universityreview_fts(MajorHelp_universityreview_fts) '
+        "VALUES ('rebuild')"
+    ),
+    (
+        'CREATE VIRTUAL TABLE IF NOT EXISTS MajorHelp_majorreview_fts USING '
+        "fts5(review_text, content='MajorHelp_majorreview', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorreview_fts_ai AFTER INSERT ON '
+        'MajorHelp_majorreview BEGIN INSERT INTO MajorHelp_majorreview_fts(rowid, '
+        'review_text) VALUES (new.id, new.review_text); END'
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorreview_fts_ad AFTER DELETE ON '
+        'MajorHelp_majorreview BEGIN INSERT INTO '
+        'MajorHelp_majorreview_fts(MajorHelp_majorreview_fts, rowid, review_text) '
+        "VALUES ('delete', old.id, old.review_text); END"
+    ),
+    (
+        'CREATE TRIGGER IF NOT EXISTS MajorHelp_majorreview_fts_au AFTER UPDATE OF '
+        'review_text ON MajorHelp_majorreview BEGIN INSERT INTO '
+        'MajorHelp_majorreview_fts(MajorHelp_majorreview_fts, rowid, review_text) '
+        "VALUES ('delete', old.id, old.review_text); INSERT INTO "
+        'MajorHelp_majorreview_fts(rowid, review_text) VALUES (new.id, '
+        'new.review_text); END'
+    ),
+    (
+        'INSERT INTO MajorHelp_majorreview_fts(MajorHelp_majorreview_fts) VALUES '
+        "('rebuild')"
+    ),
+]
+
+UNINSTALL_REVIEW_FTS = [
+    'DROP TRIGGER IF EXISTS MajorHelp_universityreview_fts_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_universityreview_fts_ad',
+    'DROP TRIGGER IF EXISTS MajorHelp_universityreview_fts_au',
+    'DROP TABLE IF EXISTS MajorHelp_universityreview_fts',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorreview_fts_ai',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorreview_fts_ad',
+    'DROP TRIGGER IF EXISTS MajorHelp_majorreview_fts_au',
+    'DROP TABLE IF EXISTS MajorHelp_majorreview_fts',
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MajorHelp', '0019_universityreview_user'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(INSTALL_REVIEW_FTS, UNINSTALL_REVIEW_FTS),
+    ]
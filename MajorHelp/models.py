@@ -18,6 +18,12 @@ class FinancialAid(models.Model):
     name = models.CharField(max_length=256)
     location = models.CharField(max_length=256)
     amount = models.IntegerField(default=0)
+
+    class Meta:
+        # The calculator APIs look aids up by name
+        indexes = [
+            models.Index(fields=['name'], name='aid_name_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -74,11 +80,34 @@ class University(models.Model):
             self.slug = slugify(self.name).replace('-', '')
         super().save(*args, **kwargs)
 
+    def category_summaries(self):
+        """
+        Every category's UniversityRatingSummary (None if unrated), in one
+        query. Kept on the instance, since a page reads each category
+        several times.
+        """
+        if not hasattr(self, '_category_summaries'):
+            summaries = {category: None for category, label in UniversityRating.CATEGORY_CHOICES}
+            for summary in self.rating_summaries.all():
+                summaries[summary.category] = summary
+            self._category_summaries = summaries
+        return self._category_summaries
+
+    def rating_averages(self):
+        return {
+            category: summary.average() if summary else 0.0
+            for category, summary in self.category_summaries().items()
+        }
+
+    def rating_histograms(self):
+        """How many ratings gave 1 to 5 stars, per category."""
+        return {
+            category: summary.histogram() if summary else [0] * 5
+            for category, summary in self.category_summaries().items()
+        }
+
     def get_average_rating(self, category):
-        average = self.ratings.filter(category=category).aggregate(Avg('rating'))['rating__avg']
-        if average is not None:
-            return round(float(average), 1)  # Convert to float and round to 1 decimal place
-        return 0.0  # Default to 0.0 if no ratings are available
+        return self.rating_averages().get(category, 0.0)  # 0.0 if no ratings are available
 
     def campus_rating(self):
         return self.get_average_rating('campus')
@@ -137,18 +166,65 @@ class UniversityRating(models.Model):
         return f"{self.university.name} - {self.category}: {self.rating}"
 
 
+# Count and sum of a university's ratings in one category, and its
+# leaderboard score, kept current by ratings.py
+class UniversityRatingSummary(models.Model):
+    university = models.ForeignKey(University, on_delete=models.CASCADE, related_name='rating_summaries')
+    category = models.CharField(max_length=20, choices=UniversityRating.CATEGORY_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+    total = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+    score = models.FloatField(default=0)
+
+    # Ratings per number of stars, a 4.5 counts as 4
+    stars_1 = models.PositiveIntegerField(default=0)
+    stars_2 = models.PositiveIntegerField(default=0)
+    stars_3 = models.PositiveIntegerField(default=0)
+    stars_4 = models.PositiveIntegerField(default=0)
+    stars_5 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('university', 'category')
+        # Leaderboard pages, best first
+        indexes = [
+            models.Index(fields=['category', '-score', '-count', 'id'], name='rating_summary_board_idx'),
+        ]
+
+    def average(self):
+        if not self.count:
+            return 0.0
+        return round(float(self.total) / self.count, 1)  # Rounded to 1 decimal place
+
+    def histogram(self):
+        return [self.stars_1, self.stars_2, self.stars_3, self.stars_4, self.stars_5]
+
+    def __str__(self):
+        return f"{self.university.name} - {self.category}: {self.count} ratings"
+
+
 # Model for a university review
 class UniversityReview(models.Model):
+    # The author. A deleted account leaves the review with no user, and the
+    # review keeps showing the username it was written under.
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='university_reviews')
     username = models.CharField(max_length=50)
     review_text = models.CharField(max_length=500)
     pub_date = models.DateTimeField(auto_now_add=True)
     university = models.ForeignKey(University, on_delete=models.CASCADE, related_name='university_review')
     
     class Meta:
-        unique_together = ('username', 'university')
+        unique_together = ('user', 'university')
+        # The overview page's review feed and the "my reviews" page, newest first
+        indexes = [
+            models.Index(fields=['university', '-pub_date', '-id'], name='univ_review_feed_idx'),
+            models.Index(fields=['user', '-pub_date', '-id'], name='user_review_feed_idx'),
+        ]
     
+    @property
+    def author_name(self):
+        return self.user.username if self.user else self.username
+
     def __str__(self):
-        return f"{self.username}: {self.review_text}"
+        return f"{self.author_name}: {self.review_text}"
     
 
 class Course(models.Model):
@@ -227,10 +303,26 @@ class Major(models.Model):
         help_text="Maximum out-of-state tuition for graduate students."
     )
 
+    # Mirrors of the major's reviews, kept current by reviews.py
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    avg_rating = models.FloatField(default=0, editable=False)
+
     # New field: Courses
     courses = models.ManyToManyField(Course, related_name="majors", blank=True)
 
-   
+    class Meta:
+        # Tuition range filters and cost sorts in the search views: by name
+        # for a given major, by university for the cheapest matching major
+        indexes = [
+            models.Index(fields=['major_name', 'in_state_min_tuition'], name='major_name_in_state_idx'),
+            models.Index(fields=['major_name', 'out_of_state_min_tuition'], name='major_name_out_state_idx'),
+            models.Index(fields=['university', 'in_state_min_tuition'], name='major_univ_in_state_idx'),
+            models.Index(fields=['university', 'out_of_state_min_tuition'], name='major_univ_out_state_idx'),
+            # Rating sorts: overall, and the best matching major per university
+            models.Index(fields=['-avg_rating', '-review_count'], name='major_rating_idx'),
+            models.Index(fields=['university', '-avg_rating'], name='major_univ_rating_idx'),
+        ]
+
 
     def clean(self):
         if self.in_state_max_tuition < self.in_state_min_tuition:
@@ -238,9 +330,19 @@ class Major(models.Model):
         if self.out_of_state_max_tuition < self.out_of_state_min_tuition:
             raise ValidationError("Out-of-state max tuition cannot be less than out-of-state min tuition.")
 
+    # Written by reviews.py only, a save() must not put back the values this
+    # instance loaded over newer ones
+    REVIEW_FIELDS = ['review_count', 'avg_rating']
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = f"{slugify(self.university.name).replace('-', '')}-{slugify(self.major_name).replace('-', '')}"
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            # Reload them first, a deleted row is inserted again as before
+            try:
+                self.refresh_from_db(using=kwargs.get('using'), fields=self.REVIEW_FIELDS)
+            except Major.DoesNotExist:
+                pass
         super().save(*args, **kwargs)
 
 
@@ -257,6 +359,39 @@ class Major(models.Model):
             f"${self.grad_out_of_state_max_tuition + self.university.out_of_state_base_max_tuition})"
         )
 
+# Total cost of each major (university base tuition + major tuition + both
+# fees), kept up to date by database triggers, see costs.py
+class MajorCost(models.Model):
+    major = models.OneToOneField(
+        Major,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="cost",
+    )
+    university = models.ForeignKey(
+        University,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    in_state_min = models.IntegerField(default=0, db_index=True)
+    in_state_max = models.IntegerField(default=0)
+    out_of_state_min = models.IntegerField(default=0, db_index=True)
+    out_of_state_max = models.IntegerField(default=0)
+    grad_in_state_min = models.IntegerField(default=0, db_index=True)
+    grad_in_state_max = models.IntegerField(default=0)
+    grad_out_of_state_min = models.IntegerField(default=0, db_index=True)
+    grad_out_of_state_max = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['university', 'in_state_min'], name='cost_univ_in_state_idx'),
+            models.Index(fields=['university', 'out_of_state_min'], name='cost_univ_out_state_idx'),
+        ]
+
+    def __str__(self):
+        return f"Cost of {self.major_id}: ${self.in_state_min} - ${self.in_state_max} in-state"
+
+
 # Default user getter for MajorReview model
 def get_default_user():
     return User.objects.first().id
@@ -270,6 +405,16 @@ class MajorReview(models.Model):
     university = models.ForeignKey('University', on_delete=models.CASCADE, default=1)  # Assuming 1 is a valid University ID
     rating = models.DecimalField(max_digits=2, decimal_places=1, validators=[MinValueValidator(1), MaxValueValidator(5)], default=0)
 
+    class Meta:
+        # The overview page's review feed, newest first
+        indexes = [
+            models.Index(fields=['major', '-pub_date', '-id'], name='major_review_feed_idx'),
+        ]
+
+    @property
+    def author_name(self):
+        return self.user.username
+
     def __str__(self):
         return f"{self.user.username}: {self.review_text}"
 
@@ -312,24 +457,40 @@ class CustomUser(AbstractUser):
     objects = CustomUserManager()
 
 
-    savedCalcs = models.JSONField(default=dict, blank=True) # passing a callable nstead of {} to make sure everyone gets a independent json
+    def __str__(self):
+        return self.username
+    
 
-    # Format
+# A tuition calculator saved by a user, see save_calc
+class SavedCalculator(models.Model):
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name="saved_calculators")
+    key = models.CharField(max_length=255)  # calc_name in lowercase
+    calc_name = models.CharField(max_length=255)
+    uni = models.CharField(max_length=255, blank=True)
+    outstate = models.BooleanField(default=False)
+    dept = models.CharField(max_length=255, blank=True)
+    major = models.CharField(max_length=255, blank=True)
+    aid = models.JSONField(default=str, blank=True)  # aid name or custom amount, as saved
+    updated_at = models.DateTimeField(auto_now=True)
 
-    # {
-    #     "calculator 0" : { # the identifier should have no caps
-    #         "calcName": "Calculator 0",
-    #         "uni": "",
-    #         "outstate": false,
-    #         "dept": "",
-    #         "major": "",
-    #         "aid": ""
-    #     },
-    # }
+    class Meta:
+        # the unique index also serves the name prefix search in calc_list
+        unique_together = ('user', 'key')
+
+    def as_dict(self):
+        # Same shape the calculator page sends to save_calc
+        return {
+            'calcName': self.calc_name,
+            'uni': self.uni,
+            'outstate': self.outstate,
+            'dept': self.dept,
+            'major': self.major,
+            'aid': self.aid,
+        }
 
     def __str__(self):
-        return self.username
-    
+        return f"{self.user.username}: {self.calc_name}"
+
 
 class UniversityRequest(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, null=True, blank=True)
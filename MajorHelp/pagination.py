@@ -0,0 +1,107 @@
+"""
+Keyset (cursor) pagination.
+
+Unlike django.core.paginator this never counts or OFFSETs through the
+matching rows: a page is "the next N rows after this one" in index order, so
+page 1 and page 10,000 cost the same. Cursors are the primary key of the
+first/last row of a page.
+"""
+
+from django.db.models import Q
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous, ordering):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.ordering = ordering
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return _pk(self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return _pk(self.object_list[0])
+        return None
+
+
+def _pk(obj):
+    return obj['pk'] if isinstance(obj, dict) else obj.pk
+
+
+def _parse_cursor(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _past(ordering, row, forward):
+    """Q matching the rows strictly after (or before) `row` in `ordering`."""
+    condition = Q()
+    equal = Q()
+    for field in ordering:
+        name = field.lstrip('-')
+        descending = field.startswith('-')
+        lookup = 'lt' if descending == forward else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': row[name]})
+        equal &= Q(**{name: row[name]})
+    return condition
+
+
+def _reverse(ordering):
+    return [field[1:] if field.startswith('-') else f'-{field}' for field in ordering]
+
+
+def keyset_paginate(queryset, ordering, per_page, after=None, before=None):
+    """
+    Return the page of `queryset` that follows the `after` cursor (or
+    precedes the `before` cursor), ordered by `ordering`.
+
+    The last ordering field must be unique (normally 'pk') so the order is
+    total. Ordering fields may be annotations. A cursor that is invalid or
+    points at a row that no longer matches gives page 1.
+    """
+    names = [field.lstrip('-') for field in ordering]
+    cursor = _parse_cursor(after) if after is not None else _parse_cursor(before)
+    forward = before is None or after is not None
+
+    row = None
+    if cursor is not None:
+        # Looked up through the queryset so annotated ordering fields work
+        row = queryset.filter(pk=cursor).values(*names).first()
+
+    if row is None:
+        forward = True
+        rows = list(queryset.order_by(*ordering)[:per_page + 1])
+        return KeysetPage(rows[:per_page], len(rows) > per_page, False, ordering)
+
+    if forward:
+        rows = list(queryset.filter(_past(ordering, row, True)).order_by(*ordering)[:per_page + 1])
+        return KeysetPage(rows[:per_page], len(rows) > per_page, True, ordering)
+
+    rows = list(queryset.filter(_past(ordering, row, False)).order_by(*_reverse(ordering))[:per_page + 1])
+    has_previous = len(rows) > per_page
+    rows = rows[:per_page]
+    rows.reverse()
+    return KeysetPage(rows, True, has_previous, ordering)
@@ -0,0 +1,118 @@
+"""
+Multi-year cost projections for the tuition calculator.
+
+A projection takes each program's first-year cost and builds a year by year
+schedule: tuition grows by a yearly escalation rate, aid is taken off for a
+limited number of years, and optional graduate years are charged at the
+major's graduate tuition.
+
+Every program in a request shares the same escalation factors and aid
+schedule, so those are worked out once and the programs are run through
+them column by column, whether that is one calculator, a batch of them or
+every major at a university.
+"""
+
+DEFAULT_YEARS = 4
+MAX_YEARS = 6
+MAX_GRAD_YEARS = 3
+
+# Yearly tuition increase in percent
+DEFAULT_ESCALATION = 3.0
+MAX_ESCALATION = 20.0
+
+
+class ProjectionError(ValueError):
+    """An invalid projection option, with a message for the client."""
+
+
+def projection_params(params):
+    """
+    Projection options from a query string or JSON object. Raises
+    ProjectionError when one is missing a number or out of range.
+    """
+    try:
+        years = int(params.get('years', DEFAULT_YEARS))
+        grad_years = int(params.get('grad_years', 0))
+        escalation = float(params.get('escalation', DEFAULT_ESCALATION))
+        aid_years = int(params.get('aid_years', years))
+    except (TypeError, ValueError):
+        raise ProjectionError("Error - years, grad_years and aid_years must be integers, escalation a number.")
+
+    if not 1 <= years <= MAX_YEARS:
+        raise ProjectionError(f"Error - years must be between 1 and {MAX_YEARS}.")
+    if not 0 <= grad_years <= MAX_GRAD_YEARS:
+        raise ProjectionError(f"Error - grad_years must be between 0 and {MAX_GRAD_YEARS}.")
+    if not 0 <= escalation <= MAX_ESCALATION:
+        raise ProjectionError(f"Error - escalation must be between 0 and {MAX_ESCALATION} percent.")
+    if not 0 <= aid_years <= years + grad_years:
+        raise ProjectionError("Error - aid_years can't be more than the projected years.")
+
+    return {
+        'years': years,
+        'grad_years': grad_years,
+        'escalation': escalation,
+        'aid_years': aid_years,
+    }
+
+
+def cost_row(university, major, outstate):
+    """
+    First-year costs before aid, from tuition_cache dicts, in the same form
+    as a MajorCost row. Graduate tuition is charged on top of the
+    university's base tuition, as MajorCost does.
+    """
+    residency = 'out_of_state' if outstate else 'in_state'
+    fees = university['fees'] + major['fees']
+    base_min = university[f'{residency}_base_min_tuition']
+    base_max = university[f'{residency}_base_max_tuition']
+
+    return {
+        'min': base_min + major[f'{residency}_min_tuition'] + fees,
+        'max': base_max + major[f'{residency}_max_tuition'] + fees,
+        'grad_min': base_min + major[f'grad_{residency}_min_tuition'] + fees,
+        'grad_max': base_max + major[f'grad_{residency}_max_tuition'] + fees,
+    }
+
+
+def project(rows, aids, years=DEFAULT_YEARS, grad_years=0, escalation=DEFAULT_ESCALATION, aid_years=None):
+    """
+    Project every cost row (dicts with min, max, grad_min and grad_max) with
+    its aid amount. Returns one {'schedule', 'totalMin', 'totalMax'} per row,
+    in order.
+    """
+    if aid_years is None:
+        aid_years = years
+
+    total_years = years + grad_years
+    factors = [(1 + escalation / 100) ** year for year in range(total_years)]
+    levels = ['undergrad'] * years + ['grad'] * grad_years
+    aid_applies = [year < aid_years for year in range(total_years)]
+
+    # One column per year: every row's min and max for that year
+    minimums = []
+    maximums = []
+    for year, (factor, level) in enumerate(zip(factors, levels)):
+        low, high = ('min', 'max') if level == 'undergrad' else ('grad_min', 'grad_max')
+        minimums.append([round(row[low] * factor) for row in rows])
+        maximums.append([round(row[high] * factor) for row in rows])
+
+    projections = []
+    for index, aid in enumerate(aids):
+        schedule = []
+        for year in range(total_years):
+            applied = aid if aid_applies[year] else 0
+            schedule.append({
+                'year': year + 1,
+                'level': levels[year],
+                'aid': applied,
+                'minTui': minimums[year][index] - applied,
+                'maxTui': maximums[year][index] - applied,
+            })
+
+        projections.append({
+            'schedule': schedule,
+            'totalMin': sum(entry['minTui'] for entry in schedule),
+            'totalMax': sum(entry['maxTui'] for entry in schedule),
+        })
+
+    return projections
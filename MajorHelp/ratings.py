@@ -0,0 +1,138 @@
+"""
+Per-category rating totals of every university.
+
+UniversityRatingSummary holds the count and sum of a university's ratings in
+each category, so a page can show all seven category averages from one
+lookup instead of running an AVG per category. Next to them it keeps how
+many ratings gave each number of stars (a 4.5 counts as 4), the category's
+histogram.
+
+It also holds each row's leaderboard score, a Bayesian average: the
+ratings plus PRIOR_WEIGHT imaginary votes of PRIOR_MEAN, so a school with a
+single 5-star vote scores about 3.3 rather than topping the board, and a
+school's score approaches its real average as its votes grow. The prior is
+fixed rather than the category's current mean so each score only depends
+on its own row, is kept current with it, and can be indexed.
+
+On SQLite the rows are adjusted by triggers on the UniversityRating table,
+like the cost table in costs.py. A trigger runs inside the statement that
+changed the rating, so the summary commits or rolls back with it, and
+bulk_create() and queryset.update()/delete() are covered too. Elsewhere
+signals.py calls refresh_rating_summaries() for the changed university,
+and for every university after a migration that changes the summaries.
+
+`manage.py rebuild_rating_summaries` recomputes every row from the ratings.
+"""
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .db import triggers_enabled
+
+RATING_TABLE = 'MajorHelp_universityrating'
+SUMMARY_TABLE = 'MajorHelp_universityratingsummary'
+
+TRIGGERS = ['ai', 'au', 'ad']
+
+PRIOR_MEAN = 3.0
+PRIOR_WEIGHT = 5
+
+PRIOR_TOTAL = PRIOR_MEAN * PRIOR_WEIGHT
+
+
+STARS = range(1, 6)
+STAR_COLUMNS = [f'stars_{star}' for star in STARS]
+
+
+def _score_sql(total, count):
+    return f'({PRIOR_TOTAL} + {total}) / ({PRIOR_WEIGHT} + {count})'
+
+
+def _star_sql(rating, star):
+    # 1 if `rating` falls in `star`'s histogram bucket, else 0
+    return f'CASE WHEN {rating} >= {star} AND {rating} < {star + 1} THEN 1 ELSE 0 END'
+
+
+def _add_sql(row):
+    # Count one rating (`row` is new or old) into its summary
+    stars = ', '.join(_star_sql(f'{row}.rating', star) for star in STARS)
+    add_stars = ', '.join(f'{column} = {column} + excluded.{column}' for column in STAR_COLUMNS)
+
+    return (
+        f"INSERT INTO {SUMMARY_TABLE} (university_id, category, count, total, score, {', '.join(STAR_COLUMNS)}) "
+        f'VALUES ({row}.university_id, {row}.category, 1, {row}.rating, {_score_sql(f"{row}.rating", 1)}, {stars}) '
+        f'ON CONFLICT (university_id, category) DO UPDATE SET '
+        f'count = count + 1, total = total + excluded.total, '
+        f'score = {_score_sql("total + excluded.total", "count + 1")}, {add_stars};'
+    )
+
+
+def _remove_sql(row):
+    remove_stars = ', '.join(
+        f'{column} = {column} - ({_star_sql(f"{row}.rating", star)})'
+        for star, column in zip(STARS, STAR_COLUMNS)
+    )
+
+    return (
+        f'UPDATE {SUMMARY_TABLE} SET count = count - 1, total = total - {row}.rating, '
+        f'score = {_score_sql(f"total - {row}.rating", "count - 1")}, {remove_stars} '
+        f'WHERE university_id = {row}.university_id AND category = {row}.category;'
+    )
+
+
+def _trigger_sql():
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {SUMMARY_TABLE}_ai AFTER INSERT ON {RATING_TABLE} BEGIN '
+        f'{_add_sql("new")} END',
+
+        f'CREATE TRIGGER IF NOT EXISTS {SUMMARY_TABLE}_au AFTER UPDATE OF university_id, category, rating '
+        f'ON {RATING_TABLE} BEGIN {_remove_sql("old")} {_add_sql("new")} END',
+
+        f'CREATE TRIGGER IF NOT EXISTS {SUMMARY_TABLE}_ad AFTER DELETE ON {RATING_TABLE} BEGIN '
+        f'{_remove_sql("old")} END',
+    ]
+
+
+def _rebuild_sql(where):
+    return [
+        f'DELETE FROM {SUMMARY_TABLE} WHERE {where}',
+        f"INSERT INTO {SUMMARY_TABLE} (university_id, category, count, total, score, {', '.join(STAR_COLUMNS)}) "
+        f'SELECT university_id, category, COUNT(*), SUM(rating), {_score_sql("SUM(rating)", "COUNT(*)")}, '
+        + ', '.join(f'SUM({_star_sql("rating", star)})' for star in STARS) +
+        f' FROM {RATING_TABLE} '
+        f'WHERE {where} GROUP BY university_id, category',
+    ]
+
+
+def install_rating_triggers(schema_editor):
+    """
+    Create the sync triggers and fill the summaries from every rating.
+
+    Safe to run more than once. Migrations spell out the statements this
+    runs instead of calling it (see 0014), so later changes here don't
+    change what an old migration does.
+    """
+    if triggers_enabled(schema_editor.connection):
+        for sql in _trigger_sql():
+            schema_editor.execute(sql)
+    for sql in _rebuild_sql('1 = 1'):
+        schema_editor.execute(sql)
+
+
+def uninstall_rating_triggers(schema_editor):
+    if not triggers_enabled(schema_editor.connection):
+        return
+
+    for suffix in TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {SUMMARY_TABLE}_{suffix}')
+
+
+def refresh_rating_summaries(university_id=None, using=DEFAULT_DB_ALIAS):
+    """Recompute one university's summaries, or (with no argument) everyone's."""
+    if university_id is not None:
+        where, params = 'university_id = %s', [university_id]
+    else:
+        where, params = '1 = 1', []
+
+    with transaction.atomic(using), connections[using].cursor() as cursor:
+        for sql in _rebuild_sql(where):
+            cursor.execute(sql, params)
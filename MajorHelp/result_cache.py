@@ -0,0 +1,111 @@
+"""
+In-process LRU cache for search result pages.
+
+Entries are tagged with the dataset version they were computed under.
+signals.py bumps the version whenever a University or Major is saved or
+deleted, which makes every older entry a miss, so nothing is served stale
+in the process that made the change. Entries also expire after MAX_AGE
+seconds so other worker processes, and bulk imports that skip signals,
+catch up on their own.
+
+etag() and last_modified() turn the version into HTTP validators, so API
+views built on a cache can answer conditional GETs without a query.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+MAX_SIZE = 512
+MAX_AGE = 600
+
+# Versions are per process, so validators carry a per-process token
+BOOT_ID = uuid.uuid4().hex[:8]
+
+# get()'s default in get_or_set(), so a cached None is still a hit
+_MISSING = object()
+
+
+class VersionedLRUCache:
+    def __init__(self, max_size=MAX_SIZE, max_age=MAX_AGE):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.version = 0
+        self.changed_at = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bump(self):
+        with self._lock:
+            self.version += 1
+            self.changed_at = time.time()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                version, stored_at, value = entry
+                if version == self.version and now - stored_at <= self.max_age:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.version, time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_set(self, key, compute):
+        # Computing happens outside the lock, two requests may both miss
+        version = self.version
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            # don't store a result that a concurrent write already made stale
+            if version == self.version:
+                self.set(key, value)
+        return value
+
+    def etag(self):
+        """
+        Changes on every bump(), every max_age seconds (so rows written
+        without signals are picked up) and between processes.
+        """
+        window = int(time.time() // self.max_age)
+        return f'"{BOOT_ID}-{self.version}-{window}"'
+
+    def last_modified(self):
+        window_start = time.time() // self.max_age * self.max_age
+        return datetime.fromtimestamp(max(self.changed_at, window_start), tz=timezone.utc)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'version': self.version,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+search_cache = VersionedLRUCache()
@@ -0,0 +1,113 @@
+"""
+Full-text search within one university's or major's reviews.
+
+The text of UniversityReview and MajorReview rows is mirrored into SQLite
+FTS5 tables by the same triggers search.py uses for names, so a search
+never scans review_text. Results are ranked with bm25 and carry a snippet
+of the review around the matched words.
+
+The snippets are HTML: the review text is escaped and the matches are
+wrapped in <mark>. FTS5 marks the matches with control characters, which
+only become tags after escaping, so the review itself can't inject HTML.
+
+On any other database backend the search falls back to icontains, newest
+first, with the matched words highlighted in Python.
+"""
+
+import re
+
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+from .db import triggers_enabled
+from .search import build_match, install_fts, uninstall_fts, TOKEN_RE
+
+UNIVERSITY_REVIEW_TABLE = 'MajorHelp_universityreview'
+MAJOR_REVIEW_TABLE = 'MajorHelp_majorreview'
+
+UNIVERSITY_REVIEW_FTS = 'MajorHelp_universityreview_fts'
+MAJOR_REVIEW_FTS = 'MajorHelp_majorreview_fts'
+
+# (fts table, content table, indexed columns), as in search.FTS_TABLES
+REVIEW_FTS_TABLES = [
+    (UNIVERSITY_REVIEW_FTS, UNIVERSITY_REVIEW_TABLE, ['review_text']),
+    (MAJOR_REVIEW_FTS, MAJOR_REVIEW_TABLE, ['review_text']),
+]
+
+START = '\x02'
+END = '\x03'
+
+# Words of context in a snippet
+SNIPPET_TOKENS = 16
+
+
+def install_review_fts(schema_editor):
+    """
+    Create the review FTS tables and triggers and index every review.
+
+    Migrations spell out the statements this runs (see 0020). One that
+    makes Django remake either review table must create the triggers again
+    afterwards.
+    """
+    install_fts(schema_editor, REVIEW_FTS_TABLES)
+
+
+def uninstall_review_fts(schema_editor):
+    uninstall_fts(schema_editor, REVIEW_FTS_TABLES)
+
+
+def _highlight(text):
+    return escape(text).replace(START, '<mark>').replace(END, '</mark>')
+
+
+def _mark_terms(text, query):
+    # The fallback's highlighting: the same prefix rule as build_match()
+    terms = TOKEN_RE.findall(query or '')
+    if not terms:
+        return text
+    pattern = re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\w*', re.IGNORECASE)
+    return pattern.sub(lambda match: f'{START}{match.group()}{END}', text)
+
+
+def search_reviews(queryset, query):
+    """
+    Filter a UniversityReview or MajorReview queryset (already scoped to a
+    university or major) to the reviews matching `query`, best matches
+    first. snippet() gives each one's highlighted excerpt.
+    """
+    table = queryset.model._meta.db_table
+    fts = {UNIVERSITY_REVIEW_TABLE: UNIVERSITY_REVIEW_FTS, MAJOR_REVIEW_TABLE: MAJOR_REVIEW_FTS}[table]
+
+    if not triggers_enabled():
+        terms = TOKEN_RE.findall(query or '')
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(review_text__icontains=term)
+        return queryset.order_by('-pub_date', '-pk')
+
+    match = build_match(query)
+    if match is None:
+        return queryset.none()
+
+    return queryset.filter(
+        pk__in=RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [match])
+    ).annotate(
+        search_rank=RawSQL(
+            f'SELECT rank FROM {fts} WHERE {fts} MATCH %s AND rowid = {table}.id',
+            [match],
+        ),
+        search_snippet=RawSQL(
+            f"SELECT snippet({fts}, 0, %s, %s, '…', {SNIPPET_TOKENS}) "
+            f'FROM {fts} WHERE {fts} MATCH %s AND rowid = {table}.id',
+            [START, END, match],
+        ),
+    ).order_by('search_rank', '-pub_date', '-pk')
+
+
+def snippet(review, query):
+    """The HTML snippet of a review returned by search_reviews()."""
+    raw = getattr(review, 'search_snippet', None)
+    if raw is None:
+        raw = _mark_terms(review.review_text, query)
+    return _highlight(raw)
@@ -0,0 +1,79 @@
+"""
+Review counts and average ratings kept on Major.
+
+Major.review_count and Major.avg_rating mirror the major's MajorReview
+rows, so the overview page and the search results can show them, and the
+searches sort on them, without an aggregate per major.
+
+On SQLite triggers on the MajorReview table recompute the two columns of
+the affected major whenever a review is added, removed, re-rated or moved
+to another major. That reads only that major's reviews through the
+major_id index, and can't drift the way adding and subtracting could.
+Elsewhere signals.py calls refresh_major_ratings() for the changed major,
+and for every major after migrating to the two columns.
+"""
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .db import triggers_enabled
+from .search import MAJOR_TABLE
+
+REVIEW_TABLE = 'MajorHelp_majorreview'
+
+TRIGGERS = ['ai', 'au', 'ad']
+
+
+def _refresh_sql(where):
+    """Recompute review_count and avg_rating of the majors matching `where`."""
+    reviews = f'FROM {REVIEW_TABLE} r WHERE r.major_id = {MAJOR_TABLE}.id'
+    return (
+        f'UPDATE {MAJOR_TABLE} SET '
+        f'review_count = (SELECT COUNT(*) {reviews}), '
+        f'avg_rating = COALESCE((SELECT AVG(r.rating) {reviews}), 0) '
+        f'WHERE {where}'
+    )
+
+
+def _trigger_sql():
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {REVIEW_TABLE}_ai AFTER INSERT ON {REVIEW_TABLE} BEGIN '
+        f'{_refresh_sql("id = new.major_id")}; END',
+
+        f'CREATE TRIGGER IF NOT EXISTS {REVIEW_TABLE}_au AFTER UPDATE OF major_id, rating ON {REVIEW_TABLE} BEGIN '
+        f'{_refresh_sql("id IN (old.major_id, new.major_id)")}; END',
+
+        f'CREATE TRIGGER IF NOT EXISTS {REVIEW_TABLE}_ad AFTER DELETE ON {REVIEW_TABLE} BEGIN '
+        f'{_refresh_sql("id = old.major_id")}; END',
+    ]
+
+
+def install_review_triggers(schema_editor):
+    """
+    Create the sync triggers and recompute every major's columns.
+
+    Safe to run more than once. Migrations that make Django remake the
+    MajorReview table must call this again.
+    """
+    if triggers_enabled(schema_editor.connection):
+        for sql in _trigger_sql():
+            schema_editor.execute(sql)
+    schema_editor.execute(_refresh_sql('1 = 1'))
+
+
+def uninstall_review_triggers(schema_editor):
+    if not triggers_enabled(schema_editor.connection):
+        return
+
+    for suffix in TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {REVIEW_TABLE}_{suffix}')
+
+
+def refresh_major_ratings(major_id=None, using=DEFAULT_DB_ALIAS):
+    """Recompute one major's review_count and avg_rating, or every major's."""
+    if major_id is not None:
+        where, params = 'id = %s', [major_id]
+    else:
+        where, params = '1 = 1', []
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(_refresh_sql(where), params)
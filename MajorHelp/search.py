@@ -0,0 +1,222 @@
+"""
+Full-text search for the search result views.
+
+University names and major names/departments are mirrored into SQLite FTS5
+tables that are kept in sync with the model tables by triggers, so every
+write path (save(), bulk_create() in import_majors.py, queryset.update())
+updates the index. Lookups are word-anywhere, prefix, case-insensitive and
+ranked with bm25.
+
+On any other database backend the helpers fall back to the old ORM lookups.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Count
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Substr, Upper
+
+from .db import triggers_enabled
+
+UNIVERSITY_TABLE = 'MajorHelp_university'
+MAJOR_TABLE = 'MajorHelp_major'
+
+UNIVERSITY_FTS = 'MajorHelp_university_fts'
+MAJOR_FTS = 'MajorHelp_major_fts'
+
+# (fts table, content table, indexed columns)
+FTS_TABLES = [
+    (UNIVERSITY_FTS, UNIVERSITY_TABLE, ['name']),
+    (MAJOR_FTS, MAJOR_TABLE, ['major_name', 'department']),
+]
+
+# Same rules as the unicode61 tokenizer, so a query term is always one token
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _trigger_sql(fts, table, columns):
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{c}' for c in columns)
+    old = ', '.join(f'old.{c}' for c in columns)
+
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN '
+        f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END',
+
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN '
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+
+        f'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN '
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END',
+    ]
+
+
+def install_fts(schema_editor, tables=FTS_TABLES):
+    """
+    Create the FTS tables and their sync triggers, then rebuild the index.
+
+    Safe to run more than once. Migrations spell out the statements this
+    runs (see 0008). One that makes Django remake the University or Major
+    table, which drops its triggers, must create them again afterwards, as
+    0017 does. `tables` lets other modules (review_search.py) index their
+    own tables the same way.
+    """
+    if not triggers_enabled(schema_editor.connection):
+        return
+
+    for fts, table, columns in tables:
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5('
+            f"{', '.join(columns)}, content='{table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        for sql in _trigger_sql(fts, table, columns):
+            schema_editor.execute(sql)
+        schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def uninstall_fts(schema_editor, tables=FTS_TABLES):
+    if not triggers_enabled(schema_editor.connection):
+        return
+
+    for fts, table, columns in tables:
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+def rebuild_fts(tables=FTS_TABLES):
+    # Only needed if rows were written with the triggers missing
+    with connection.cursor() as cursor:
+        for fts, table, columns in tables:
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def build_match(query, column=None):
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term and all of them must match, so
+    "comp sci" finds "Computer Science". Returns None when the query has no
+    searchable words.
+    """
+    terms = [f'"{token}"*' for token in TOKEN_RE.findall(query or '')]
+    if not terms:
+        return None
+
+    expression = ' AND '.join(terms)
+    if column:
+        return f'{column} : ({expression})'
+    return expression
+
+
+def _match_ids(fts, match):
+    return RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [match])
+
+
+def _match_rank(fts, table, match):
+    return RawSQL(
+        f'SELECT rank FROM {fts} WHERE {fts} MATCH %s AND rowid = {table}.id',
+        [match],
+    )
+
+
+def search_universities(queryset, query):
+    """Filter a University queryset by name, best matches first."""
+    if not triggers_enabled():
+        return queryset.filter(name__icontains=query).order_by('name')
+
+    match = build_match(query)
+    if match is None:
+        return queryset.none()
+
+    return queryset.filter(
+        pk__in=_match_ids(UNIVERSITY_FTS, match)
+    ).annotate(
+        search_rank=_match_rank(UNIVERSITY_FTS, UNIVERSITY_TABLE, match)
+    ).order_by('search_rank', 'name')
+
+
+def search_majors(queryset, query, column='major_name'):
+    """
+    Filter a Major queryset on major_name or department.
+
+    Ordering is left to the caller, the result views group by university.
+    """
+    if not triggers_enabled():
+        return queryset.filter(**{f'{column}__icontains': query})
+
+    match = build_match(query, column)
+    if match is None:
+        return queryset.none()
+
+    return queryset.filter(pk__in=_match_ids(MAJOR_FTS, match))
+
+
+class Facets:
+    """
+    Result counts for the search filters, from one grouped query.
+
+    Each row is (university initial, is_public, department, count). A facet's
+    counts apply the other filters' current selection but not its own, so
+    the letter bar follows the public/private toggle and vice versa.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @staticmethod
+    def _is_public(school_type):
+        return {'public': True, 'private': False}.get(school_type)
+
+    def _matching(self, letter=None, school_type=None):
+        is_public = self._is_public(school_type)
+        for initial, public, department, count in self.rows:
+            if letter and initial != letter:
+                continue
+            if is_public is not None and public != is_public:
+                continue
+            yield initial, public, department, count
+
+    def letters(self, school_type=None):
+        counts = {}
+        for initial, public, department, count in self._matching(school_type=school_type):
+            counts[initial] = counts.get(initial, 0) + count
+        return counts
+
+    def school_types(self, letter=None):
+        counts = {'both': 0, 'public': 0, 'private': 0}
+        for initial, public, department, count in self._matching(letter=letter):
+            counts['both'] += count
+            counts['public' if public else 'private'] += count
+        return counts
+
+    def departments(self, letter=None, school_type=None):
+        counts = {}
+        for initial, public, department, count in self._matching(letter, school_type):
+            counts[department] = counts.get(department, 0) + count
+        return counts
+
+
+def major_facets(majors_qs):
+    """Facet counts (matching majors) for a Major queryset."""
+    rows = majors_qs.annotate(
+        initial=Upper(Substr('university__name', 1, 1)),
+    ).values_list(
+        'initial', 'university__is_public', 'department',
+    ).annotate(count=Count('pk')).order_by()
+
+    return Facets(list(rows))
+
+
+def university_facets(universities_qs):
+    """Facet counts (matching universities) for a University queryset."""
+    rows = universities_qs.annotate(
+        initial=Upper(Substr('name', 1, 1)),
+    ).values_list(
+        'initial', 'is_public',
+    ).annotate(count=Count('pk')).order_by()
+
+    return Facets([(initial, public, None, count) for initial, public, count in rows])
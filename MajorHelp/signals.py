@@ -0,0 +1,110 @@
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from .models import University, Major, FinancialAid, UniversityRating, MajorReview
+from .autocomplete import university_autocomplete
+from .fuzzy import university_fuzzy, major_fuzzy
+from .result_cache import search_cache
+from .tuition_cache import tuition_cache
+from .db import triggers_enabled
+from .costs import refresh_costs
+from .ratings import refresh_rating_summaries
+from .reviews import refresh_major_ratings
+
+
+# Rebuild the in-memory name indexes on the next lookup, and retire every
+# cached search result page and calculator lookup
+@receiver(post_save, sender=University)
+@receiver(post_delete, sender=University)
+def invalidate_university_indexes(sender, **kwargs):
+    university_autocomplete.invalidate()
+    university_fuzzy.invalidate()
+    search_cache.bump()
+    tuition_cache.bump()
+
+
+@receiver(post_save, sender=Major)
+@receiver(post_delete, sender=Major)
+def invalidate_major_indexes(sender, **kwargs):
+    major_fuzzy.invalidate()
+    search_cache.bump()
+    tuition_cache.bump()
+
+
+@receiver(post_save, sender=FinancialAid)
+@receiver(post_delete, sender=FinancialAid)
+@receiver(m2m_changed, sender=University.applicableAids.through)
+def invalidate_aids(sender, **kwargs):
+    tuition_cache.bump()
+
+
+# SQLite keeps MajorCost current with triggers (see costs.py), other
+# databases refresh the changed rows here
+@receiver(post_save, sender=University)
+def refresh_university_costs(sender, instance, **kwargs):
+    if not triggers_enabled():
+        refresh_costs(university_id=instance.pk)
+
+
+@receiver(post_save, sender=Major)
+def refresh_major_costs(sender, instance, **kwargs):
+    if not triggers_enabled():
+        refresh_costs(major_id=instance.pk)
+
+
+# Likewise for the rating summaries (see ratings.py)
+@receiver(post_save, sender=UniversityRating)
+@receiver(post_delete, sender=UniversityRating)
+def refresh_university_rating_summaries(sender, instance, **kwargs):
+    if not triggers_enabled():
+        refresh_rating_summaries(university_id=instance.university_id)
+
+
+# Major.review_count and avg_rating likewise (see reviews.py). Search
+# results show them, so cached result pages are retired either way.
+@receiver(post_save, sender=MajorReview)
+@receiver(post_delete, sender=MajorReview)
+def refresh_review_stats(sender, instance, **kwargs):
+    if not triggers_enabled():
+        refresh_major_ratings(major_id=instance.major_id)
+    search_cache.bump()
+
+
+# The migrations that create or change a table kept by the functions
+# above. On SQLite each migration fills the table itself; elsewhere
+# refresh_after_migrate() does.
+MIGRATION_REFRESHES = {
+    '0011_majorcost': refresh_costs,
+    '0014_universityratingsummary': refresh_rating_summaries,
+    '0015_rating_summary_score': refresh_rating_summaries,
+    '0016_rating_summary_histogram': refresh_rating_summaries,
+    '0017_major_review_stats': refresh_major_ratings,
+}
+
+
+def refresh_after_migrate(sender, using, plan=None, **kwargs):
+    """
+    post_migrate (connected in apps.py): without triggers, fill the tables
+    that the migrations just applied created or changed. Only once the app
+    is fully migrated, since the refreshes write the current columns.
+    """
+    connection = connections[using]
+    if triggers_enabled(connection):
+        return
+
+    refreshes = []
+    for migration, backwards in plan or ():
+        refresh = MIGRATION_REFRESHES.get(migration.name)
+        if migration.app_label == sender.label and not backwards and refresh and refresh not in refreshes:
+            refreshes.append(refresh)
+    if not refreshes:
+        return
+
+    loader = MigrationLoader(connection)
+    if any(leaf not in loader.applied_migrations for leaf in loader.graph.leaf_nodes(sender.label)):
+        return
+
+    for refresh in refreshes:
+        refresh(using=using)
@@ -3,15 +3,9 @@
 loggedIn = false;
 calcCount = 0;
 
-const DEPARTMENT_CHOICES = [
-    "Business and Economics",
-    "Education",
-    "Engineering and Technology",
-    "Arts and Design",
-    "Agriculture and Environmental Studies",
-    "Communication and Media",
-    "Law and Criminal Justice"
-];
+// Each calculator's university as returned by /api/calculator/: its costs,
+// aids and majors by department. Filled in by selectUniversity().
+const calcData = {};
 
 let savedCalcsData = {};
 
@@ -438,6 +432,7 @@ async function updateCalc(calc) {
 function clearCalc(calc) {
 
     // clear the frontend JSON
+    delete calcData[calc];
     calcInput[calc] =  {
         'calcName': `Calculator ${calc}`,
         'uni': "",
@@ -578,7 +573,7 @@ async function updateUniversityResults(calc) {
             let option = document.createElement("div");
             option.classList.add("result-item");
             option.innerHTML = `<strong>${uni.name}</strong> - ${uni.location}`;
-            option.onclick = () => selectUniversity(calc, uni.name);
+            option.onclick = () => selectUniversity(calc, uni.name, uni.slug);
             resultsContainer.appendChild(option);
         });
     } else {
@@ -597,7 +592,18 @@ async function fetchUniversityData(query) {
     }
 }
 
-async function selectUniversity(calc, name) {
+// The slug picks the exact university the search result was for. Saved
+// calculators only have the name, which has to match exactly.
+async function selectUniversity(calc, name, slug = null) {
+    // One request for everything the rest of the calculator needs
+    const data = await fetchCalculatorData(name, slug);
+    if (data === null) {
+        showNotification("Couldn't load that university.", true);
+        return;
+    }
+    calcData[calc] = data;
+    name = data.university.name;
+
     const input = document.getElementById(`uni-search-${calc}`);
     
     input.value = name;
@@ -614,10 +620,10 @@ async function selectUniversity(calc, name) {
 
     autoResizeInput(input);
 
-    // Set dept dropdown
+    // Set dept dropdown to the departments the university has majors in
     document.getElementById(`dept-dropdown-${calc}`).innerHTML =
         `<option value="" disabled selected>Select a Concentration</option>` +
-        DEPARTMENT_CHOICES.map(dept => `<option value="${dept}">${dept}</option>`).join('');
+        Object.keys(data.departments).map(dept => `<option value="${dept}">${dept}</option>`).join('');
 
     // Reset downstream
     document.getElementById(`major-results-${calc}`).replaceChildren();
@@ -639,9 +645,9 @@ async function updateMajorResults(calc, preserveExisting = false) {
     const majorContainer = document.getElementById(`major-results-${calc}`);
     majorContainer.innerHTML = "";
 
-    const data = await fetchMajors(university, department);
-    if (data && data.majors.length > 0) {
-        data.majors.forEach(major => {
+    const majors = calcData[calc] ? (calcData[calc].departments[department] || []) : [];
+    if (majors.length > 0) {
+        majors.forEach(major => {
             let option = document.createElement("div");
             option.classList.add("result-item");
             option.innerHTML = `<strong>${major.name}</strong>`;
@@ -677,10 +683,13 @@ async function updateMajorResults(calc, preserveExisting = false) {
     calcInput[calc]['dept'] = department;
 }
 
-async function fetchMajors(university, department) {
+async function fetchCalculatorData(university, slug = null) {
+    const param = slug
+        ? `university_slug=${encodeURIComponent(slug)}`
+        : `university=${encodeURIComponent(university)}`;
     try {
-        const response = await fetch(`/api/majors/?university=${encodeURIComponent(university)}&department=${encodeURIComponent(department)}`);
-        if (!response.ok) throw new Error('Majors not found');
+        const response = await fetch(`/api/calculator/?${param}`);
+        if (!response.ok) throw new Error('University not found');
         return await response.json();
     } catch (error) {
         console.error(error);
@@ -700,8 +709,8 @@ async function selectMajor(calc, major) {
     document.getElementById(`major-results-${calc}`).style.display = "none";
 
     // Check if financial aid applies.
-    const aidData = await fetchFinancialAid(university);
-    if (aidData === null) return;
+    const aidData = calcData[calc];
+    if (!aidData) return;
 
     // Update the JSON
     calcInput[calc]['outstate'] = outstate;
@@ -807,22 +816,6 @@ function applyCustomAid(calc) {
 }
 
 
-async function fetchFinancialAid(query) {
-    try {
-        const response = await fetch(`/api/aid/?university=${encodeURIComponent(query)}`);
-        if (!response.ok) {
-            console.log(response.status + "\n" + response.statusText);
-            throw new Error("Error Fetching Aid");
-        }
-
-        return await response.json();
-    } catch (error) {
-        console.error(error);
-        return null;
-    }
-}
-
-
 function selectaid(calc, aid) {
     console.log("Aid Clicked:", aid)
     document.getElementById(`aid-name-${calc}`).innerText = aid;
@@ -840,7 +833,7 @@ function selectaid(calc, aid) {
 
 
 async function displayOutput(calc, university, outstate, major, aid=null) {
-    const data = await calculate(university, major, outstate, aid);
+    const data = await calculate(calc, university, major, outstate, aid);
     if (!data) return;
 
 
@@ -942,9 +935,19 @@ async function displayOutput(calc, university, outstate, major, aid=null) {
     document.getElementById(`output-${calc}`).style.display = 'block';
 }
 
-async function calculate(university, major, outstate, aid) {
+// Once the calculator's university is loaded, the university and major are
+// sent by slug, otherwise by name.
+async function calculate(calc, university, major, outstate, aid) {
+    let params = `university=${encodeURIComponent(university)}&major=${encodeURIComponent(major)}`;
+    const data = calcData[calc];
+    if (data && data.university.name === university) {
+        const found = Object.values(data.departments).flat().find(m => m.name === major);
+        params = found
+            ? `major_slug=${encodeURIComponent(found.slug)}`
+            : `university_slug=${encodeURIComponent(data.university.slug)}&major=${encodeURIComponent(major)}`;
+    }
     try {
-        const response = await fetch(`/api/calculate/?university=${encodeURIComponent(university)}&major=${encodeURIComponent(major)}&outstate=${outstate}&aid=${aid}`);
+        const response = await fetch(`/api/calculate/?${params}&outstate=${outstate}&aid=${aid}`);
         if (!response.ok) throw new Error('Calculation Failed.');
         return await response.json();
     } catch (error) {
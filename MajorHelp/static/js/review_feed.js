@@ -0,0 +1,111 @@
+// The review feeds on the overview pages: "Load more" and searching within
+// the reviews. Both come from the feed's JSON APIs.
+document.addEventListener('DOMContentLoaded', function () {
+    const list = document.getElementById('review-feed');
+    if (!list) return;
+
+    setUpLoadMore(list, document.getElementById('load-more-reviews'));
+    setUpSearch(list, document.getElementById('review-search'), document.getElementById('review-search-results'));
+});
+
+// The button holds the cursor of the next page
+function setUpLoadMore(list, button) {
+    if (!button) return;
+
+    button.addEventListener('click', function () {
+        button.disabled = true;
+
+        fetch(`${list.dataset.feedUrl}?after=${encodeURIComponent(button.dataset.next)}`)
+            .then(response => response.json())
+            .then(data => {
+                data.reviews.forEach(review => list.appendChild(reviewItem(list, review)));
+
+                if (data.next) {
+                    button.dataset.next = data.next;
+                    button.disabled = false;
+                } else {
+                    button.remove();
+                }
+            })
+            .catch(() => {
+                button.disabled = false;
+            });
+    });
+}
+
+// Matching reviews replace the feed until the search box is cleared
+function setUpSearch(list, form, results) {
+    if (!form || !results) return;
+
+    const button = document.getElementById('load-more-reviews');
+
+    function showFeed(visible) {
+        list.hidden = !visible;
+        if (button) button.hidden = !visible;
+        results.hidden = visible;
+    }
+
+    form.addEventListener('submit', function (event) {
+        event.preventDefault();
+        const query = form.elements.q.value.trim();
+        if (!query) {
+            showFeed(true);
+            return;
+        }
+
+        fetch(`${form.dataset.searchUrl}?q=${encodeURIComponent(query)}`)
+            .then(response => response.json())
+            .then(data => {
+                results.replaceChildren(...data.reviews.map(review => searchItem(list, review)));
+                if (!data.reviews.length) {
+                    const empty = document.createElement('li');
+                    empty.textContent = `No reviews mention "${query}".`;
+                    results.appendChild(empty);
+                }
+                showFeed(false);
+            });
+    });
+}
+
+// Same markup as the reviews rendered with the page
+function reviewItem(list, review) {
+    const item = document.createElement('li');
+    item.style.cssText = list.firstElementChild.style.cssText;
+    const text = document.createElement('p5');
+    const by = document.createElement('strong');
+    by.textContent = 'By:';
+    text.append(`"${review.review_text}" `, by, ` ${review.username} on ${review.date}`);
+    item.appendChild(text);
+
+    // Your own university review can be deleted from the feed too
+    if (review.mine && list.dataset.deleteUrl) {
+        const form = document.createElement('form');
+        form.action = list.dataset.deleteUrl;
+        form.method = 'post';
+        form.style.display = 'inline';
+        form.appendChild(document.querySelector('[name=csrfmiddlewaretoken]').cloneNode());
+
+        const remove = document.createElement('button');
+        remove.type = 'submit';
+        remove.style.cssText = 'background-color: red; color: white; border: none; padding: 5px 10px; border-radius: 5px; cursor: pointer;';
+        remove.textContent = 'Delete Review';
+        form.appendChild(remove);
+        item.appendChild(form);
+    }
+
+    return item;
+}
+
+// A search result: the server escapes the snippet and adds the <mark> tags
+function searchItem(list, review) {
+    const item = document.createElement('li');
+    item.style.cssText = list.firstElementChild.style.cssText;
+    const text = document.createElement('p5');
+    const snippet = document.createElement('span');
+    snippet.innerHTML = `"${review.snippet}"`;
+    const by = document.createElement('strong');
+    by.textContent = 'By:';
+    text.append(snippet, ' ', by, ` ${review.username} on ${review.date}`);
+    item.appendChild(text);
+    return item;
+}
@@ -6,10 +6,26 @@ from django.urls import reverse
 
 from django.contrib.auth import get_user_model, authenticate
 
+import io
 import json
+from unittest import mock
+
+from django.apps import apps as django_apps
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command
 
 from .models import *
 
+from .search import search_universities, search_majors, major_facets
+from .autocomplete import university_autocomplete
+from .fuzzy import university_fuzzy, major_fuzzy, edit_distance
+from .result_cache import search_cache, VersionedLRUCache
+from .geo import haversine
+from .tuition_cache import tuition_cache
+from .signals import refresh_after_migrate
+
 
 # Create your tests here.
 
@@ -812,3 +828,1638 @@ class LoginTest(TestCase):
         self.assertRedirects(response, reverse('MajorHelp:home'))  # Adjust if the redirect target is different
 
 
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.usc = University.objects.create(name="University of South Carolina", location="Columbia, SC")
+        self.coastal = University.objects.create(name="Coastal Carolina University", location="Conway, SC")
+
+        self.cs = Major.objects.create(
+            major_name="Computer Science", university=self.usc,
+            department='Engineering and Technology'
+        )
+        self.acct = Major.objects.create(
+            major_name="Accounting", university=self.coastal,
+            department='Business and Economics'
+        )
+
+    def test_university_word_anywhere(self):
+        names = [u.name for u in search_universities(University.objects.all(), "carolina")]
+
+        self.assertCountEqual(names, ["University of South Carolina", "Coastal Carolina University"])
+
+    def test_university_prefix_terms_case_insensitive(self):
+        names = [u.name for u in search_universities(University.objects.all(), "SOUTH car")]
+
+        self.assertEqual(names, ["University of South Carolina"])
+
+    def test_university_empty_query(self):
+        self.assertFalse(search_universities(University.objects.all(), "  !! ").exists())
+
+    def test_index_follows_updates_and_deletes(self):
+        self.usc.name = "Gamecock Institute"
+        self.usc.save()
+
+        self.assertFalse(search_universities(University.objects.all(), "south").exists())
+        self.assertTrue(search_universities(University.objects.all(), "gamecock").exists())
+
+        self.usc.delete()
+
+        self.assertFalse(search_universities(University.objects.all(), "gamecock").exists())
+        self.assertFalse(search_majors(Major.objects.all(), "computer").exists())
+
+    def test_major_search_by_column(self):
+        by_name = search_majors(Major.objects.all(), "sci", 'major_name')
+        by_dept = search_majors(Major.objects.all(), "business", 'department')
+
+        self.assertEqual(list(by_name), [self.cs])
+        self.assertEqual(list(by_dept), [self.acct])
+        # department words don't leak into the major name search
+        self.assertFalse(search_majors(Major.objects.all(), "business", 'major_name').exists())
+
+    def test_school_results_view(self):
+        response = self.client.get(reverse("MajorHelp:school_results", args=["Carolina"]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("universityofsouthcarolina", response.context['results'])
+        self.assertIn("coastalcarolinauniversity", response.context['results'])
+
+
+class KeysetResultsTests(TestCase):
+    def setUp(self):
+        # Seven "A" schools so the department results need two pages of 5
+        for i in range(7):
+            uni = University.objects.create(name=f"Aiken College {i}", location="SC")
+            Major.objects.create(
+                major_name=f"Teaching {i}", university=uni,
+                department='Education'
+            )
+
+        other = University.objects.create(name="Anderson University", location="SC")
+        Major.objects.create(major_name="Marketing", university=other, department='Business and Economics')
+
+        self.url = reverse("MajorHelp:department_results", args=["Education"])
+
+    def test_first_page(self):
+        response = self.client.get(self.url)
+
+        page = response.context['page_obj']
+        self.assertEqual([u['name'] for u in page], [f"Aiken College {i}" for i in range(5)])
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        # only the page's majors are loaded, grouped by department
+        self.assertEqual(
+            response.context['results']['aikencollege0']['departments']['Education'][0]['major_name'],
+            "Teaching 0"
+        )
+
+    def test_next_and_previous_cursor(self):
+        first = self.client.get(self.url).context['page_obj']
+
+        second = self.client.get(self.url, {'after': first.next_cursor}).context['page_obj']
+        self.assertEqual([u['name'] for u in second], ["Aiken College 5", "Aiken College 6"])
+        self.assertFalse(second.has_next())
+        self.assertTrue(second.has_previous())
+
+        back = self.client.get(self.url, {'before': second.previous_cursor}).context['page_obj']
+        self.assertEqual([u['name'] for u in back], [u['name'] for u in first])
+        self.assertFalse(back.has_previous())
+
+    def test_non_matching_universities_are_skipped(self):
+        response = self.client.get(self.url, {'after': 'garbage'})
+
+        self.assertNotIn("andersonuniversity", response.context['results'])
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        University.objects.create(name="Clemson University", location="Clemson, SC", TotalUndergradStudents=22000)
+        University.objects.create(name="Clemson", location="Nowhere", TotalUndergradStudents=10)
+        University.objects.create(name="Claflin University", location="Orangeburg, SC", TotalUndergradStudents=1800)
+        University.objects.create(name="Clark University", location="Worcester, MA", TotalUndergradStudents=2300)
+
+        # rolled back test data doesn't fire post_delete
+        university_autocomplete.invalidate()
+
+        self.url = reverse("MajorHelp:university_search")
+
+    def test_exact_match_then_enrollment(self):
+        names = [u['name'] for u in university_autocomplete.search("clemson")]
+        self.assertEqual(names, ["Clemson", "Clemson University"])
+
+        names = [u['name'] for u in university_autocomplete.search("CL")]
+        self.assertEqual(names, ["Clemson University", "Clark University", "Claflin University", "Clemson"])
+
+    def test_limit(self):
+        response = self.client.get(self.url, {'query': 'cl', 'limit': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)['universities']), 2)
+
+    def test_warm_lookup_runs_no_queries(self):
+        university_autocomplete.search("cl")
+
+        with self.assertNumQueries(0):
+            university_autocomplete.search("clark")
+
+    def test_rebuilt_after_change(self):
+        university_autocomplete.search("cl")
+
+        University.objects.create(name="Clarion University", location="Clarion, PA", TotalUndergradStudents=99999)
+
+        self.assertEqual(university_autocomplete.search("cl")[0]['name'], "Clarion University")
+
+
+class FuzzyLookupTests(TestCase):
+    def setUp(self):
+        self.usc = University.objects.create(name="University of South Carolina", location="Columbia, SC", TotalUndergradStudents=28000)
+        University.objects.create(name="University of North Carolina", location="Chapel Hill, NC", TotalUndergradStudents=20000)
+        University.objects.create(name="Clemson University", location="Clemson, SC", TotalUndergradStudents=22000)
+        Major.objects.create(major_name="Computer Science", university=self.usc, department='Engineering and Technology')
+
+        university_fuzzy.invalidate()
+        major_fuzzy.invalidate()
+        university_autocomplete.invalidate()
+
+    def test_typos(self):
+        self.assertEqual(university_fuzzy.suggest("Clemsen")[0]['name'], "Clemson University")
+        self.assertEqual(university_fuzzy.suggest("Univeristy of South Carolina")[0]['name'], "University of South Carolina")
+        self.assertEqual(major_fuzzy.suggest("Computr Sceince")[0]['name'], "Computer Science")
+
+    def test_nothing_close(self):
+        self.assertEqual(university_fuzzy.suggest("Zzyzx"), [])
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("univeristy", "university", 2), 1)
+        self.assertEqual(edit_distance("clemsen", "clemson", 2), 1)
+        self.assertEqual(edit_distance("abc", "xyz", 2), 3)
+
+    def test_university_search_falls_back(self):
+        response = self.client.get(reverse("MajorHelp:university_search"), {'query': 'Clemsen'})
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertEqual(data['did_you_mean'], "Clemson University")
+
+    def test_limits_are_clamped(self):
+        self.assertEqual(university_fuzzy.suggest("Clemsen", 0), [])
+
+        url = reverse("MajorHelp:university_search")
+        for limit in (0, -3):
+            response = self.client.get(url, {'query': 'Clemsen', 'limit': limit})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([u['name'] for u in response.json()['universities']], ["Clemson University"])
+
+    def test_calculate_suggests(self):
+        response = self.client.get(reverse("MajorHelp:calculate"), {
+            'university': 'Univeristy of South Carolina', 'major': 'x', 'outstate': 'false'
+        })
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(json.loads(response.content)['did_you_mean'][0], "University of South Carolina")
+
+    def test_school_results_did_you_mean(self):
+        response = self.client.get(reverse("MajorHelp:school_results", args=["Clemsen"]))
+
+        self.assertEqual(response.context['did_you_mean'], ["Clemson University"])
+
+
+class SearchCacheTests(TestCase):
+    def setUp(self):
+        self.uni = University.objects.create(name="Winthrop University", location="Rock Hill, SC")
+        Major.objects.create(major_name="Nursing", university=self.uni, department='Education')
+
+        search_cache.clear()
+        self.url = reverse("MajorHelp:school_results", args=["Winthrop"])
+
+    def test_repeat_request_is_a_hit(self):
+        self.client.get(self.url)
+        before = search_cache.stats()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertIn("winthropuniversity", response.context['results'])
+        self.assertEqual(search_cache.stats()['hits'], before['hits'] + 1)
+
+    def test_key_includes_filters(self):
+        self.client.get(self.url)
+        misses = search_cache.stats()['misses']
+
+        self.client.get(self.url, {'school_type': 'private'})
+
+        self.assertEqual(search_cache.stats()['misses'], misses + 1)
+
+    def test_write_bumps_version(self):
+        self.client.get(self.url)
+
+        self.uni.location = "Somewhere else"
+        self.uni.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.context['results']['winthropuniversity']['location'], "Somewhere else")
+
+    def test_caches_plain_data(self):
+        for i in range(11):
+            uni = University.objects.create(name=f"Winthrop Campus {i}", location="SC")
+            Major.objects.create(major_name="Nursing", university=uni, department='Education')
+        search_cache.clear()
+
+        response = self.client.get(self.url, {'page': 2})
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj, {
+            'number': 2, 'has_previous': True, 'has_next': False,
+            'previous_page_number': 1, 'next_page_number': 3, 'paginator': {'num_pages': 2},
+        })
+        self.assertEqual(len(response.context['results']), 2)
+        self.assertContains(response, "Page 2 of 2")
+
+        major = next(iter(response.context['results'].values()))['departments']['Education'][0]
+        self.assertEqual(major['major_name'], "Nursing")
+
+    def test_lru_eviction(self):
+        cache = VersionedLRUCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_caches_none(self):
+        cache = VersionedLRUCache()
+        calls = []
+
+        for _ in range(2):
+            self.assertIsNone(cache.get_or_set('nothing', lambda: calls.append(1)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (1, 1))
+
+    def test_stats_staff_only(self):
+        url = reverse("MajorHelp:search_cache_stats")
+
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        CustomUser.objects.create_user(username="staff", password="password", email="staff@example.com", is_staff=True)
+        self.client.login(username="staff", password="password")
+        self.assertIn('hit_rate', json.loads(self.client.get(url).content))
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        bates = University.objects.create(name="Bates College", location="ME", is_public=False)
+        citadel = University.objects.create(name="The Citadel", location="SC", is_public=True)
+        coker = University.objects.create(name="Coker University", location="SC", is_public=False)
+
+        Major.objects.create(major_name="History", university=bates, department='Education')
+        Major.objects.create(major_name="History Education", university=citadel, department='Education')
+        Major.objects.create(major_name="Public History", university=coker, department='Arts and Design')
+
+        search_cache.clear()
+
+    def test_counts_from_one_query(self):
+        with self.assertNumQueries(1):
+            facets = major_facets(search_majors(Major.objects.all(), "history", 'major_name'))
+
+        self.assertEqual(facets.letters(), {'B': 1, 'T': 1, 'C': 1})
+        self.assertEqual(facets.letters('private'), {'B': 1, 'C': 1})
+        self.assertEqual(facets.school_types(), {'both': 3, 'public': 1, 'private': 2})
+        self.assertEqual(facets.departments(school_type='private'), {'Education': 1, 'Arts and Design': 1})
+
+    def test_view_hides_empty_letters(self):
+        response = self.client.get(reverse("MajorHelp:major_results", args=["history"]))
+
+        # no letter given, so the first letter with results is picked
+        self.assertEqual(response.context['current_letter'], 'B')
+        alphabet = {l['letter']: l['count'] for l in response.context['alphabet']}
+        self.assertEqual(alphabet['A'], 0)
+        self.assertEqual(alphabet['C'], 1)
+        self.assertNotContains(response, '&letter=A&')
+        self.assertEqual(response.context['type_counts'], {'both': 1, 'public': 0, 'private': 1})
+
+    def test_view_shows_department_counts(self):
+        response = self.client.get(reverse("MajorHelp:major_results", args=["history"]), {'letter': 'C'})
+
+        self.assertEqual(response.context['department_counts'], [('Arts and Design', 1)])
+        self.assertContains(response, 'Arts and Design (1)')
+
+    def test_facets_cached_across_pages(self):
+        url = reverse("MajorHelp:major_results", args=["history"])
+        self.client.get(url)
+        misses = search_cache.stats()['misses']
+
+        self.client.get(url, {'letter': 'C'})
+
+        # the page itself is new, the facets are reused
+        self.assertEqual(search_cache.stats()['misses'], misses + 1)
+
+
+class CostFilterTests(TestCase):
+    def setUp(self):
+        # Seven schools, in-state tuition 21000 down to 3000 in name order
+        for i in range(7):
+            uni = University.objects.create(name=f"Clemson {i}", location="SC", is_public=True)
+            Major.objects.create(
+                major_name="Computer Science", university=uni, department='Engineering and Technology',
+                in_state_min_tuition=21000 - i * 3000, out_of_state_min_tuition=30000 + i * 1000,
+            )
+
+        self.url = reverse("MajorHelp:major_results", args=["Computer Science"])
+        search_cache.clear()
+
+    def names(self, response):
+        return [u['name'] for u in response.context['page_obj']]
+
+    def test_max_tuition_cheapest_first(self):
+        response = self.client.get(self.url, {'max_tuition': 15000, 'sort': 'cost'})
+
+        # bounds are inclusive
+        self.assertEqual(self.names(response), ["Clemson 6", "Clemson 5", "Clemson 4", "Clemson 3", "Clemson 2"])
+        self.assertEqual(response.context['cost_query'], '&max_tuition=15000&sort=cost')
+
+    def test_min_tuition_and_residency(self):
+        response = self.client.get(self.url, {
+            'residency': 'out_of_state', 'min_tuition': 34000, 'sort': '-cost',
+        })
+
+        self.assertEqual(self.names(response), ["Clemson 6", "Clemson 5", "Clemson 4"])
+
+    def test_cost_sort_pages_with_cursor(self):
+        first = self.client.get(self.url, {'sort': 'cost'}).context['page_obj']
+        self.assertEqual([u['name'] for u in first], [f"Clemson {i}" for i in (6, 5, 4, 3, 2)])
+
+        second = self.client.get(self.url, {'sort': 'cost', 'after': first.next_cursor}).context['page_obj']
+        self.assertEqual([u['name'] for u in second], ["Clemson 1", "Clemson 0"])
+
+        back = self.client.get(self.url, {'sort': 'cost', 'before': second.previous_cursor}).context['page_obj']
+        self.assertEqual([u['name'] for u in back], [u['name'] for u in first])
+
+    def test_bad_values_are_ignored(self):
+        response = self.client.get(self.url, {'max_tuition': 'cheap', 'sort': 'random', 'residency': 'mars'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cost'], {
+            'residency': 'in_state', 'min_tuition': None, 'max_tuition': None, 'sort': 'name',
+        })
+        self.assertEqual(len(self.names(response)), 5)
+
+    def test_tuition_range_uses_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'EXPLAIN QUERY PLAN SELECT id FROM "MajorHelp_major" '
+                'WHERE major_name = %s AND in_state_min_tuition <= %s',
+                ["Computer Science", 15000],
+            )
+            plan = ' '.join(str(row) for row in cursor.fetchall())
+
+        self.assertIn('major_name_in_state_idx', plan)
+
+
+class SearchStreamTests(TestCase):
+    def setUp(self):
+        public = University.objects.create(name="Winthrop University", location="SC", is_public=True)
+        private = University.objects.create(name="Furman University", location="SC", is_public=False)
+
+        Major.objects.create(major_name="Computer Science", university=public,
+                             department='Engineering and Technology', in_state_min_tuition=9000)
+        Major.objects.create(major_name="Computer Science", university=private,
+                             department='Engineering and Technology', in_state_min_tuition=30000)
+        Major.objects.create(major_name="Art History", university=public, department='Arts and Design')
+
+        self.url = reverse("MajorHelp:search_stream")
+
+    def rows(self, response):
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        content = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_streams_one_object_per_line(self):
+        rows = self.rows(self.client.get(self.url, {'query': "computer"}))
+
+        self.assertEqual([row['university'] for row in rows], ["Furman University", "Winthrop University"])
+        self.assertEqual(rows[1]['major_name'], "Computer Science")
+        self.assertEqual(rows[1]['type'], 'Public')
+        self.assertEqual(rows[1]['in_state_min_tuition'], 9000)
+
+    def test_same_filters_as_result_pages(self):
+        rows = self.rows(self.client.get(self.url, {
+            'query': "Engineering", 'filter': 'department', 'max_tuition': 10000,
+        }))
+        self.assertIn("Winthrop University", [row['university'] for row in rows])
+        self.assertNotIn("Furman University", [row['university'] for row in rows])
+
+        rows = self.rows(self.client.get(self.url, {'query': "computer", 'school_type': 'private'}))
+        self.assertEqual([row['university'] for row in rows], ["Furman University"])
+
+        rows = self.rows(self.client.get(self.url, {'query': "computer", 'sort': '-cost'}))
+        self.assertEqual([row['in_state_min_tuition'] for row in rows], [30000, 9000])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'query': "art", 'filter': 'school'}).status_code, 400)
+
+
+class NearbySearchTests(TestCase):
+    def setUp(self):
+        University.objects.create(name="Clemson University", location="SC", latitude=34.6834, longitude=-82.8374)
+        University.objects.create(name="Furman University", location="SC", latitude=34.9257, longitude=-82.4390)
+        University.objects.create(name="Wofford College", location="SC", latitude=34.9596, longitude=-81.9326)
+        University.objects.create(name="University of South Carolina", location="SC", latitude=33.9940, longitude=-81.0300)
+        University.objects.create(name="Nowhere College", location="SC")
+
+        self.url = reverse("MajorHelp:universities_nearby")
+
+    def names(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [u['name'] for u in response.json()['universities']]
+
+    def test_haversine(self):
+        # Clemson to Columbia is about 112 miles
+        self.assertAlmostEqual(haversine(34.6834, -82.8374, 33.9940, -81.0300), 112, delta=2)
+
+    def test_near_university_sorted_by_distance(self):
+        response = self.client.get(self.url, {'university': "clemson university", 'radius': 60})
+
+        self.assertEqual(self.names(response), ["Furman University", "Wofford College"])
+        self.assertLess(response.json()['universities'][0]['distance'], 30)
+
+    def test_near_point(self):
+        response = self.client.get(self.url, {'lat': 34.0, 'lng': -81.0, 'radius': 10})
+        self.assertEqual(self.names(response), ["University of South Carolina"])
+
+    def test_index_follows_updates(self):
+        University.objects.filter(name="Nowhere College").update(latitude=34.0, longitude=-81.01)
+        University.objects.filter(name="University of South Carolina").delete()
+
+        response = self.client.get(self.url, {'lat': 34.0, 'lng': -81.0, 'radius': 10})
+        self.assertEqual(self.names(response), ["Nowhere College"])
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'lat': 91, 'lng': 0}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'lat': 34, 'lng': -81, 'radius': 'far'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'university': "Nowhere College"}).status_code, 400)
+
+        response = self.client.get(self.url, {'university': "Furmen University"})
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("Furman University", response.json()['did_you_mean'])
+
+    def test_university_by_slug_or_id(self):
+        clemson = University.objects.get(name="Clemson University")
+
+        by_slug = self.client.get(self.url, {'university_slug': clemson.slug, 'radius': 60})
+        by_id = self.client.get(self.url, {'university_id': clemson.pk, 'radius': 60})
+
+        self.assertEqual(self.names(by_slug), ["Furman University", "Wofford College"])
+        self.assertEqual(self.names(by_id), ["Furman University", "Wofford College"])
+
+    def test_ambiguous_name(self):
+        University.objects.create(
+            name="Wofford College", slug="wofford-college-ga", location="GA", latitude=33.0, longitude=-84.0,
+        )
+
+        response = self.client.get(self.url, {'university': "wofford college"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [candidate['location'] for candidate in response.json()['candidates']], ["SC", "GA"],
+        )
+
+
+class BatchCalculateTests(TestCase):
+    def setUp(self):
+        self.url = reverse("MajorHelp:calculate_batch")
+
+        for i in range(5):
+            uni = University.objects.create(
+                name=f"Batch University {i}", location="SC",
+                in_state_base_min_tuition=1000 * i, in_state_base_max_tuition=2000 * i,
+                out_of_state_base_min_tuition=3000 * i, out_of_state_base_max_tuition=4000 * i,
+            )
+            Major.objects.create(
+                major_name="Nursing", university=uni, department='Education',
+                in_state_min_tuition=100, in_state_max_tuition=200,
+                out_of_state_min_tuition=300, out_of_state_max_tuition=400,
+            )
+
+        FinancialAid.objects.create(name="Batch Grant", location="SC", amount=500)
+
+    def post(self, calcs):
+        return self.client.post(self.url, json.dumps({'calcs': calcs}), content_type='application/json')
+
+    def test_matches_single_calculate(self):
+        calc = {'university': "Batch University 3", 'major': "nurs", 'outstate': 'true', 'aid': "Batch Grant"}
+
+        single = self.client.get(reverse("MajorHelp:calculate"), calc).json()
+        batch = self.post([calc]).json()['results']
+
+        self.assertEqual(batch, [single])
+
+    def test_results_in_input_order(self):
+        calcs = [
+            {'university': f"batch university {i}", 'major': "Nursing", 'outstate': False, 'aid': 250}
+            for i in (4, 0, 2)
+        ]
+        results = self.post(calcs).json()['results']
+
+        self.assertEqual([r['uni']['name'] for r in results],
+                         ["Batch University 4", "Batch University 0", "Batch University 2"])
+        self.assertEqual(results[0]['minTui'], 4000 + 100 - 250)
+        self.assertEqual(results[0]['aid'], {'name': "Custom Aid ($250)", 'amount': 250})
+
+    def test_constant_queries(self):
+        calcs = [
+            {'university': f"Batch University {i}", 'major': "Nursing", 'outstate': True, 'aid': "Batch Grant"}
+            for i in range(5)
+        ]
+
+        # universities, majors, aids
+        with self.assertNumQueries(3):
+            response = self.post(calcs)
+        self.assertEqual(len(response.json()['results']), 5)
+
+    def test_errors_per_entry(self):
+        results = self.post([
+            {'university': "Batch Universty 1", 'major': "Nursing", 'outstate': True},
+            {'university': "Batch University 1", 'major': "Dentistry", 'outstate': True},
+            {'university': "Batch University 1", 'major': "Nursing", 'outstate': True, 'aid': "No Such Grant"},
+            {'university': "Batch University 1", 'outstate': True},
+            {'university': "Batch University 1", 'major': "Nursing", 'outstate': True},
+        ]).json()['results']
+
+        self.assertEqual([r.get('status') for r in results], [404, 404, 404, 400, None])
+        self.assertIn("Batch University 1", results[0]['did_you_mean'])
+        self.assertEqual(results[4]['minTui'], 3000 + 300)
+
+    def test_university_by_id_slug_or_name(self):
+        university = University.objects.get(name="Batch University 2")
+        University.objects.create(name="Batch University 2", slug="batch-university-2-ga", location="GA")
+
+        results = self.post([
+            {'university_id': university.pk, 'major': "Nursing", 'outstate': False},
+            {'university_slug': university.slug, 'major': "Nursing", 'outstate': False},
+            {'university': "batch university 2", 'major': "Nursing", 'outstate': False},
+            {'university_id': "two", 'major': "Nursing", 'outstate': False},
+        ]).json()['results']
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0]['minTui'], 2000 + 100)
+        self.assertEqual(results[2]['status'], 400)
+        self.assertEqual([c['location'] for c in results[2]['candidates']], ["SC", "GA"])
+        self.assertEqual(results[3]['status'], 400)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.assertEqual(self.client.post(self.url, "nope", content_type='application/json').status_code, 400)
+        self.assertEqual(self.post("nope").status_code, 400)
+        self.assertEqual(self.post([{}] * 51).status_code, 400)
+
+
+class TuitionCacheTests(TestCase):
+    def setUp(self):
+        self.columbia = University.objects.create(
+            name="Columbia College", location="SC", in_state_base_min_tuition=20000, fees=100,
+        )
+        other = University.objects.create(name="Columbia International University", location="SC")
+        self.major = Major.objects.create(
+            major_name="Biology", university=self.columbia, department='Education', in_state_min_tuition=500,
+        )
+        Major.objects.create(major_name="Biology", university=other, department='Education')
+
+        self.grant = FinancialAid.objects.create(name="Columbia Grant", location="SC", amount=1000)
+        self.columbia.applicableAids.add(self.grant)
+
+        self.url = reverse("MajorHelp:calculate")
+        tuition_cache.clear()
+
+    def test_slug_and_id_addressing(self):
+        by_name = self.client.get(self.url, {'university': "Columbia College", 'major': "Biology", 'outstate': 'false'})
+        by_slug = self.client.get(self.url, {
+            'university_slug': self.columbia.slug, 'major_slug': self.major.slug, 'outstate': 'false',
+        })
+        by_id = self.client.get(self.url, {'major_id': self.major.pk, 'outstate': 'false'})
+
+        self.assertEqual(by_name.json()['minTui'], 20000 + 500 + 100)
+        self.assertEqual(by_slug.json(), by_name.json())
+        self.assertEqual(by_id.json(), by_name.json())
+
+    def test_major_must_belong_to_university(self):
+        response = self.client.get(self.url, {
+            'university_slug': "columbiainternationaluniversity", 'major_id': self.major.pk, 'outstate': 'false',
+        })
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(self.url, {'university_id': "one", 'major': "Biology", 'outstate': 'false'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_warm_request_runs_no_queries(self):
+        params = {'university_id': self.columbia.pk, 'major_slug': self.major.slug,
+                  'outstate': 'false', 'aid': "Columbia Grant"}
+        self.client.get(self.url, params)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.json()['minTui'], 20000 + 500 + 100 - 1000)
+
+        aids = reverse("MajorHelp:aid_list")
+        self.client.get(aids, {'university_id': self.columbia.pk})
+        with self.assertNumQueries(0):
+            response = self.client.get(aids, {'university_id': self.columbia.pk})
+        self.assertEqual(response.json()['aids'][0]['name'], "Columbia Grant")
+
+    def test_writes_invalidate(self):
+        aids = reverse("MajorHelp:aid_list")
+        self.assertEqual(len(self.client.get(aids, {'university_slug': self.columbia.slug}).json()['aids']), 1)
+
+        self.columbia.applicableAids.remove(self.grant)
+        self.assertEqual(self.client.get(aids, {'university_slug': self.columbia.slug}).json()['aids'], [])
+
+        self.major.in_state_min_tuition = 700
+        self.major.save()
+        response = self.client.get(self.url, {'major_id': self.major.pk, 'outstate': 'false'})
+        self.assertEqual(response.json()['major']['baseMinTui'], 700)
+
+
+class MajorCostTests(TestCase):
+    def setUp(self):
+        self.cheap = University.objects.create(
+            name="Lander University", location="SC",
+            in_state_base_min_tuition=10000, in_state_base_max_tuition=12000,
+            out_of_state_base_min_tuition=20000, fees=500,
+        )
+        self.dear = University.objects.create(
+            name="Limestone University", location="SC", in_state_base_min_tuition=25000,
+        )
+        self.major = Major.objects.create(
+            major_name="Geology", university=self.cheap, department='Education',
+            in_state_min_tuition=1000, in_state_max_tuition=1500, fees=50,
+            grad_in_state_min_tuition=4000,
+        )
+        search_cache.clear()
+
+    def test_totals_on_create(self):
+        cost = MajorCost.objects.get(major=self.major)
+
+        self.assertEqual(cost.university_id, self.cheap.pk)
+        self.assertEqual(cost.in_state_min, 10000 + 1000 + 500 + 50)
+        self.assertEqual(cost.in_state_max, 12000 + 1500 + 500 + 50)
+        self.assertEqual(cost.out_of_state_min, 20000 + 500 + 50)
+        self.assertEqual(cost.grad_in_state_min, 10000 + 4000 + 500 + 50)
+
+    def test_refreshed_by_bulk_writes(self):
+        University.objects.filter(pk=self.cheap.pk).update(fees=0)
+        Major.objects.filter(pk=self.major.pk).update(in_state_min_tuition=0)
+        self.assertEqual(MajorCost.objects.get(major=self.major).in_state_min, 10000 + 50)
+
+        Major.objects.filter(pk=self.major.pk).update(university=self.dear)
+        self.assertEqual(MajorCost.objects.get(major=self.major).in_state_min, 25000 + 50)
+
+        [bulk] = Major.objects.bulk_create([Major(
+            major_name="Geology II", slug="limestone-geology2", university=self.dear, department='Education',
+        )])
+        self.assertEqual(MajorCost.objects.get(major_id=bulk.pk).in_state_min, 25000)
+
+        self.major.delete()
+        self.assertFalse(MajorCost.objects.filter(major_id=self.major.pk).exists())
+
+    def test_search_ranks_on_shown_tuition(self):
+        # The total is lower at Lander, but search filters and sorts on the
+        # per-major tuition the results show, which is higher there
+        Major.objects.create(major_name="Geology", university=self.dear, department='Education')
+
+        response = self.client.get(
+            reverse("MajorHelp:major_results", args=["Geology"]), {'sort': 'cost', 'max_tuition': 1000}
+        )
+        self.assertEqual([u['name'] for u in response.context['page_obj']], ["Limestone University", "Lander University"])
+
+
+class SavedCalculatorTests(TestCase):
+    def setUp(self):
+        self.client.login(username='testuser', password='password')
+        self.save_url = reverse("MajorHelp:save_calc")
+        self.list_url = reverse("MajorHelp:calc_list")
+
+    def save(self, name, **fields):
+        calc = {'calcName': name, 'uni': 'exampleUni', 'outstate': False,
+                'dept': 'Humanities and Social Sciences', 'major': 'exampleMajor', 'aid': ''}
+        calc.update(fields)
+        return self.client.post(self.save_url, json.dumps({name.lower(): calc}), content_type='application/json')
+
+    def test_save_upserts_one_row_without_touching_user(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.save("Clemson Plan").status_code, 201)
+        self.assertEqual(self.save("Clemson Plan", aid=2500).status_code, 201)
+
+        self.assertFalse([q for q in queries if 'MajorHelp_customuser' in q['sql'] and 'UPDATE' in q['sql']])
+        calc = SavedCalculator.objects.get(key="clemson plan")
+        self.assertEqual(calc.aid, 2500)
+        self.assertEqual(SavedCalculator.objects.count(), 1)
+
+    def test_list_prefix_and_limit(self):
+        for name in ("USC Plan", "usc backup", "Clemson Plan"):
+            self.save(name)
+
+        calcs = self.client.get(self.list_url, {'query': "US"}).json()['calculators']
+        self.assertEqual([c['calcName'] for c in calcs], ["usc backup", "USC Plan"])
+        self.assertEqual(calcs[1]['dept'], 'Humanities and Social Sciences')
+
+        calcs = self.client.get(self.list_url, {'query': "", 'limit': 2}).json()['calculators']
+        self.assertEqual(len(calcs), 2)
+
+    def test_list_bad_limits(self):
+        for name in ("USC Plan", "Clemson Plan"):
+            self.save(name)
+
+        for limit in (0, -1):
+            calcs = self.client.get(self.list_url, {'limit': limit}).json()['calculators']
+            self.assertEqual([c['calcName'] for c in calcs], ["Clemson Plan"])
+
+        self.assertEqual(self.client.get(self.list_url, {'limit': "lots"}).status_code, 400)
+
+    def test_delete_and_calc_page(self):
+        self.save("Keep Me")
+        self.save("Drop Me")
+
+        self.assertEqual(self.client.delete(self.save_url, json.dumps({'drop me': True}),
+                                            content_type='application/json').status_code, 204)
+        self.assertEqual(self.client.delete(self.save_url, json.dumps({'drop me': True}),
+                                            content_type='application/json').status_code, 404)
+
+        response = self.client.get(reverse("MajorHelp:calc"))
+        self.assertEqual(list(response.context['saved_calcs']), ["keep me"])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        tuition_cache.clear()
+        search_cache.clear()
+
+    def test_aid_list_not_modified_without_queries(self):
+        url = reverse("MajorHelp:aid_list")
+        first = self.client.get(url, {'university': "exampleUni"})
+        self.assertEqual(first.status_code, 200)
+        self.assertIn('no-cache', first['Cache-Control'])
+        self.assertTrue(first.has_header('Last-Modified'))
+
+        with self.assertNumQueries(0):
+            again = self.client.get(url, {'university': "exampleUni"}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+        FinancialAid.objects.create(name="New Grant", location="SC")
+        changed = self.client.get(url, {'university': "exampleUni"}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], first['ETag'])
+
+    def test_majors_and_university_search(self):
+        for url, params in (
+            (reverse("MajorHelp:major_list"), {'university': "exampleUni", 'department': "Humanities and Social Sciences"}),
+            (reverse("MajorHelp:university_search"), {'query': "exam"}),
+        ):
+            first = self.client.get(url, params)
+            self.assertEqual(first.status_code, 200)
+            again = self.client.get(url, params, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(again.status_code, 304)
+
+    def test_calc_list_changes_with_saves(self):
+        self.client.login(username='testuser', password='password')
+        url = reverse("MajorHelp:calc_list")
+
+        first = self.client.get(url, {'query': ""})
+        self.assertIn('private', first['Cache-Control'])
+        self.assertEqual(self.client.get(url, {'query': ""}, HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        calc = {'calcName': "Plan", 'uni': "", 'outstate': False, 'dept': "", 'major': "", 'aid': ""}
+        self.client.post(reverse("MajorHelp:save_calc"), json.dumps({'plan': calc}), content_type='application/json')
+
+        changed = self.client.get(url, {'query': ""}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.json()['calculators']), 1)
+
+
+class ProjectionTests(TestCase):
+    def setUp(self):
+        tuition_cache.clear()
+
+        self.uni = University.objects.create(
+            name="Projection University", location="SC",
+            in_state_base_min_tuition=10000, in_state_base_max_tuition=12000,
+            out_of_state_base_min_tuition=20000, out_of_state_base_max_tuition=24000,
+            fees=500,
+        )
+        for name, extra in (("History", 1000), ("Physics", 3000), ("Nursing", 2000)):
+            Major.objects.create(
+                major_name=name, university=self.uni, department='Humanities and Social Sciences',
+                in_state_min_tuition=extra, in_state_max_tuition=extra * 2,
+                out_of_state_min_tuition=extra * 3, out_of_state_max_tuition=extra * 4,
+                grad_in_state_min_tuition=extra * 5, grad_in_state_max_tuition=extra * 6,
+                grad_out_of_state_min_tuition=extra * 7, grad_out_of_state_max_tuition=extra * 8,
+            )
+        FinancialAid.objects.create(name="Projection Grant", location="SC", amount=1000)
+
+    def calculate(self, **params):
+        params = {'university': "Projection University", 'major': "History", 'outstate': 'false', **params}
+        return self.client.get(reverse("MajorHelp:calculate"), params)
+
+    def test_first_year_matches_calculate(self):
+        data = self.calculate(years=4, aid="Projection Grant").json()
+        first = data['projection']['schedule'][0]
+
+        self.assertEqual((first['minTui'], first['maxTui']), (data['minTui'], data['maxTui']))
+        self.assertEqual(len(data['projection']['schedule']), 4)
+        self.assertNotIn('projection', self.calculate().json())
+
+    def test_escalation_compounds(self):
+        schedule = self.calculate(years=3, escalation=10).json()['projection']['schedule']
+
+        # 10000 + 1000 + 500 = 11500 in the first year
+        self.assertEqual([year['minTui'] for year in schedule], [11500, 12650, 13915])
+
+    def test_aid_years(self):
+        projection = self.calculate(years=4, escalation=0, aid=2000, aid_years=2).json()['projection']
+
+        self.assertEqual([year['aid'] for year in projection['schedule']], [2000, 2000, 0, 0])
+        self.assertEqual(projection['totalMin'], 11500 * 4 - 4000)
+
+    def test_grad_years(self):
+        schedule = self.calculate(years=4, grad_years=2, escalation=0).json()['projection']['schedule']
+
+        self.assertEqual([year['level'] for year in schedule], ['undergrad'] * 4 + ['grad'] * 2)
+        self.assertEqual(schedule[4]['minTui'], 10000 + 5000 + 500)
+        self.assertEqual(schedule[4]['maxTui'], 12000 + 6000 + 500)
+
+    def test_invalid_options(self):
+        for params in ({'years': 0}, {'years': 'four'}, {'years': 4, 'escalation': 50},
+                       {'years': 4, 'grad_years': 9}, {'years': 2, 'aid_years': 3}):
+            self.assertEqual(self.calculate(**params).status_code, 400)
+
+    def test_university_projection(self):
+        url = reverse("MajorHelp:university_projection")
+        data = self.client.get(url, {
+            'university_id': self.uni.pk, 'outstate': 'true', 'years': 2, 'escalation': 0,
+        }).json()
+
+        # Cheapest first
+        self.assertEqual([major['name'] for major in data['majors']], ["History", "Nursing", "Physics"])
+        physics = data['majors'][2]
+        self.assertEqual(physics['totalMin'], (20000 + 9000 + 500) * 2)
+
+        single = self.calculate(major="Physics", outstate='true', years=2, escalation=0).json()['projection']
+        self.assertEqual(physics['schedule'], single['schedule'])
+
+        self.assertEqual(self.client.get(url, {'university': "Projection Universty"}).status_code, 404)
+        response = self.client.get(url, {'university_id': self.uni.pk, 'years': 9})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.content.decode(), "Error - years must be between 1 and 6.")
+        response = self.client.get(url, {'university_id': "seven"})
+        self.assertEqual(response.content.decode(), "Error - Invalid university id.")
+
+    def test_batch_projection(self):
+        calcs = [
+            {'university': "Projection University", 'major': name, 'outstate': False, 'aid': "Projection Grant"}
+            for name in ("Physics", "Dentistry", "History")
+        ]
+        body = {'calcs': calcs, 'projection': {'years': 3, 'escalation': 5}}
+        results = self.client.post(
+            reverse("MajorHelp:calculate_batch"), json.dumps(body), content_type='application/json'
+        ).json()['results']
+
+        self.assertNotIn('projection', results[1])
+        for result, name in ((results[0], "Physics"), (results[2], "History")):
+            single = self.calculate(major=name, aid="Projection Grant", years=3, escalation=5).json()
+            self.assertEqual(result['projection'], single['projection'])
+
+
+class AidUniversitiesTests(TestCase):
+    def setUp(self):
+        tuition_cache.clear()
+        self.url = reverse("MajorHelp:aid_universities")
+
+        self.grant = FinancialAid.objects.create(name="Reverse Grant", location="SC", amount=1000)
+        for i, base in enumerate((30000, 10000, 20000)):
+            uni = University.objects.create(
+                name=f"Reverse University {i}", location="SC",
+                in_state_base_min_tuition=base, in_state_base_max_tuition=base * 2,
+                out_of_state_base_min_tuition=base * 3, out_of_state_base_max_tuition=base * 4,
+            )
+            Major.objects.create(
+                major_name="Biology", university=uni, department='Natural Sciences and Mathematics',
+                in_state_min_tuition=100, in_state_max_tuition=200,
+                out_of_state_min_tuition=300, out_of_state_max_tuition=400,
+            )
+            # Reverse University 2 doesn't take the grant
+            if i < 2:
+                uni.applicableAids.add(self.grant)
+
+
+    def test_universities_for_aid(self):
+        data = self.client.get(self.url, {'aid': "Reverse Grant"}).json()
+
+        self.assertEqual(data['aid'], {'name': "Reverse Grant", 'location': "SC", 'amount': 1000})
+        self.assertEqual([uni['name'] for uni in data['universities']],
+                         ["Reverse University 0", "Reverse University 1"])
+        self.assertNotIn('results', data)
+
+    def test_ranked_by_cost_after_aid(self):
+        results = self.client.get(self.url, {'aid': "Reverse Grant", 'major': "biology", 'outstate': 'true'}).json()['results']
+
+        self.assertEqual([r['university']['name'] for r in results],
+                         ["Reverse University 1", "Reverse University 0"])
+        self.assertEqual(results[0]['minTui'], 30000 + 300 - 1000)
+        self.assertEqual(results[0]['maxTui'], 40000 + 400 - 1000)
+
+        # Same totals as the calculator
+        single = self.client.get(reverse("MajorHelp:calculate"), {
+            'university': "Reverse University 1", 'major': "Biology", 'outstate': 'true', 'aid': "Reverse Grant",
+        }).json()
+        self.assertEqual((results[0]['minTui'], results[0]['maxTui']), (single['minTui'], single['maxTui']))
+
+    def test_cached_per_aid(self):
+        params = {'aid': "Reverse Grant", 'major': "Biology"}
+        self.client.get(self.url, params)
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url, params)
+
+        # Linking another university is picked up
+        University.objects.get(name="Reverse University 2").applicableAids.add(self.grant)
+        results = self.client.get(self.url, params).json()['results']
+        self.assertEqual(len(results), 3)
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'aid': "No Such Grant"}).status_code, 404)
+
+
+class CalculatorDataTests(TestCase):
+    def setUp(self):
+        tuition_cache.clear()
+        self.url = reverse("MajorHelp:calculator_data")
+
+        self.uni = University.objects.create(
+            name="Bootstrap University", location="SC",
+            in_state_base_min_tuition=9000, in_state_base_max_tuition=11000,
+            out_of_state_base_min_tuition=19000, out_of_state_base_max_tuition=21000,
+            fees=300,
+        )
+        for name, department in (("Accounting", 'Business and Economics'), ("Finance", 'Business and Economics'),
+                                 ("Civil Engineering", 'Engineering and Technology')):
+            Major.objects.create(
+                major_name=name, university=self.uni, department=department, fees=50,
+                in_state_min_tuition=1000, in_state_max_tuition=2000,
+                out_of_state_min_tuition=3000, out_of_state_max_tuition=4000,
+            )
+        self.grant = FinancialAid.objects.create(name="Bootstrap Grant", location="SC", amount=700)
+        self.uni.applicableAids.add(self.grant)
+
+    def test_payload(self):
+        data = self.client.get(self.url, {'university': "Bootstrap University"}).json()
+
+        self.assertEqual(data['university']['inState'], [9000, 11000])
+        self.assertEqual(data['university']['outOfState'], [19000, 21000])
+        self.assertEqual(data['aids'], [{'name': "Bootstrap Grant", 'location': "SC", 'amount': 700}])
+        self.assertEqual(list(data['departments']), ['Business and Economics', 'Engineering and Technology'])
+        self.assertEqual([major['name'] for major in data['departments']['Business and Economics']],
+                         ["Accounting", "Finance"])
+
+        # The same majors /api/majors/ lists
+        majors = self.client.get(reverse("MajorHelp:major_list"), {
+            'university': "Bootstrap University", 'department': 'Business and Economics',
+        }).json()['majors']
+        self.assertEqual([major['name'] for major in majors], ["Accounting", "Finance"])
+
+    def test_major_slug_calculates(self):
+        # calc.js asks /api/calculate/ for the total by the payload's major slug
+        data = self.client.get(self.url, {'university_id': self.uni.pk}).json()
+        major = data['departments']['Engineering and Technology'][0]
+
+        result = self.client.get(reverse("MajorHelp:calculate"), {
+            'major_slug': major['slug'], 'outstate': 'true', 'aid': "Bootstrap Grant",
+        }).json()
+        self.assertEqual(result['uni']['name'], "Bootstrap University")
+        self.assertEqual(result['major']['name'], "Civil Engineering")
+        self.assertEqual(result['minTui'], 19000 + 3000 + 350 - 700)
+        self.assertEqual(result['maxTui'], 21000 + 4000 + 350 - 700)
+
+    def test_exact_university(self):
+        # A name that's the start of another university's loads only itself
+        aiken = University.objects.create(name="Bootstrap University Aiken", location="SC")
+        Major.objects.create(major_name="Civil Engineering", university=aiken, department='Engineering and Technology')
+        University.objects.filter(pk=self.uni.pk).update(name="Bootstrap University Main")
+        tuition_cache.clear()
+
+        data = self.client.get(self.url, {'university': "Bootstrap University"})
+        self.assertEqual(data.status_code, 404)
+
+        data = self.client.get(self.url, {'university': "bootstrap university aiken"}).json()
+        self.assertEqual(data['university']['slug'], aiken.slug)
+
+        result = self.client.get(reverse("MajorHelp:calculate"), {
+            'university_slug': aiken.slug, 'major': "Civil Engineering", 'outstate': 'false',
+        }).json()
+        self.assertEqual(result['uni']['name'], "Bootstrap University Aiken")
+
+        # The search results carry the slug calc.js sends
+        university_autocomplete.invalidate()
+        found = self.client.get(reverse("MajorHelp:university_search"), {'query': "Bootstrap"}).json()
+        self.assertEqual({uni['slug'] for uni in found['universities']}, {aiken.slug, self.uni.slug})
+
+    def test_cached_and_conditional(self):
+        params = {'university_slug': self.uni.slug}
+        first = self.client.get(self.url, params)
+
+        with self.assertNumQueries(0):
+            again = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+        Major.objects.create(major_name="Marketing", university=self.uni, department='Business and Economics')
+        data = self.client.get(self.url, params).json()
+        self.assertEqual(len(data['departments']['Business and Economics']), 3)
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'university_id': "x"}).status_code, 400)
+
+        response = self.client.get(self.url, {'university': "Bootstrap Universty"})
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("Bootstrap University", response.json()['did_you_mean'])
+
+
+class RatingSummaryTests(TestCase):
+    def setUp(self):
+        self.university = University.objects.create(name="Summary University", location="SC")
+        self.users = [
+            CustomUser.objects.create(
+                username=f"summaryuser{i}", email=f"summaryuser{i}@example.com", role='alumni',
+            )
+            for i in range(3)
+        ]
+        for user, rating in zip(self.users, (2, 4, 5)):
+            UniversityRating.objects.create(university=self.university, category='campus', rating=rating, user=user)
+        UniversityRating.objects.create(university=self.university, category='dining', rating=3, user=self.users[0])
+
+    def averages(self):
+        return University.objects.get(pk=self.university.pk).rating_averages()
+
+    def aggregate(self, category):
+        average = self.university.ratings.filter(category=category).aggregate(Avg('rating'))['rating__avg']
+        return round(float(average), 1) if average is not None else 0.0
+
+    def test_matches_aggregate(self):
+        averages = self.averages()
+
+        self.assertEqual(averages['campus'], self.aggregate('campus'))
+        self.assertEqual(averages['dining'], 3.0)
+        self.assertEqual(averages['safety'], 0.0)
+        self.assertEqual(len(averages), len(UniversityRating.CATEGORY_CHOICES))
+
+    def test_updates_and_deletes(self):
+        rating = UniversityRating.objects.get(user=self.users[0], category='campus')
+        rating.rating = 5
+        rating.save()
+        self.assertEqual(self.averages()['campus'], self.aggregate('campus'))
+
+        # Queryset updates and deletes skip signals, the summary still follows
+        UniversityRating.objects.filter(category='dining').update(category='safety')
+        UniversityRating.objects.filter(user=self.users[1]).delete()
+        averages = self.averages()
+        self.assertEqual(averages['campus'], self.aggregate('campus'))
+        self.assertEqual(averages['dining'], 0.0)
+        self.assertEqual(averages['safety'], 3.0)
+
+    def test_overview_page_single_lookup(self):
+        url = reverse("MajorHelp:university-detail", kwargs={'slug': self.university.slug})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Campus: 3.7")
+
+        sql = [query['sql'] for query in queries.captured_queries]
+        self.assertEqual(sum('universityratingsummary' in query for query in sql), 1)
+        self.assertFalse(any('AVG(' in query for query in sql))
+
+    def test_rebuild_command(self):
+        UniversityRatingSummary.objects.all().delete()
+        self.assertEqual(self.averages()['campus'], 0.0)
+
+        call_command('rebuild_rating_summaries', stdout=io.StringIO())
+        self.assertEqual(self.averages()['campus'], self.aggregate('campus'))
+
+        UniversityRatingSummary.objects.filter(category='campus').update(count=1)
+        call_command('rebuild_rating_summaries', university=self.university.slug, stdout=io.StringIO())
+        self.assertEqual(self.averages()['campus'], self.aggregate('campus'))
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.users = [
+            CustomUser.objects.create(
+                username=f"boarduser{i}", email=f"boarduser{i}@example.com", role='alumni',
+            )
+            for i in range(20)
+        ]
+
+        # One perfect vote against many good ones
+        self.lucky = University.objects.create(name="Lucky University", location="SC")
+        UniversityRating.objects.create(university=self.lucky, category='dorm', rating=5, user=self.users[0])
+
+        self.solid = University.objects.create(name="Solid University", location="SC")
+        for user in self.users:
+            UniversityRating.objects.create(university=self.solid, category='dorm', rating=4.5, user=user)
+
+        self.url = reverse("MajorHelp:leaderboard", kwargs={'category': 'dorm'})
+
+    def test_bayesian_order(self):
+        entries = self.client.get(self.url).context['entries']
+
+        self.assertEqual([entry['name'] for entry in entries], ["Solid University", "Lucky University"])
+        self.assertEqual(entries[1]['average'], 5.0)
+        # (5 * 3.0 + 5) / (5 + 1)
+        self.assertEqual(entries[1]['score'], 3.33)
+        self.assertEqual(entries[0]['count'], 20)
+
+    def test_score_follows_ratings(self):
+        for user in self.users[1:]:
+            UniversityRating.objects.create(university=self.lucky, category='dorm', rating=5, user=user)
+
+        entries = self.client.get(self.url).context['entries']
+        self.assertEqual(entries[0]['name'], "Lucky University")
+
+        UniversityRating.objects.filter(university=self.lucky).delete()
+        entries = self.client.get(self.url).context['entries']
+        self.assertEqual([entry['name'] for entry in entries], ["Solid University"])
+
+    def test_pages(self):
+        for i in range(25):
+            university = University.objects.create(name=f"Board University {i:02}", location="SC")
+            UniversityRating.objects.create(
+                university=university, category='dorm', rating=1 + (i % 5), user=self.users[i % 20],
+            )
+
+        first = self.client.get(self.url)
+        self.assertTrue(first.context['page_obj'].has_next())
+
+        with self.assertNumQueries(2):
+            second = self.client.get(self.url, {'after': first.context['page_obj'].next_cursor})
+
+        names = [entry['name'] for entry in first.context['entries'] + second.context['entries']]
+        self.assertEqual(len(names), 27)
+        self.assertEqual(len(set(names)), 27)
+
+        scores = [entry['score'] for entry in first.context['entries'] + second.context['entries']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_unknown_category(self):
+        response = self.client.get(reverse("MajorHelp:leaderboard", kwargs={'category': 'parking'}))
+        self.assertEqual(response.status_code, 404)
+
+
+class SubmitOverallRatingTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(
+            username="rater", email="rater@example.com", password="password", role='alumni',
+        )
+        self.client.login(username="rater", password="password")
+        self.university = University.objects.create(name="Rated University", location="SC")
+        self.url = reverse("MajorHelp:submit-overall-rating", kwargs={'pk': self.university.pk})
+
+    def test_single_upsert(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {
+                'campus_rating': 4, 'dorms_rating': 2, 'social-life_rating': 9, 'dining_rating': "",
+            })
+        self.assertEqual(response.status_code, 302)
+
+        writes = [q['sql'] for q in queries.captured_queries if 'universityrating' in q['sql'] and 'INSERT' in q['sql']]
+        self.assertEqual(len(writes), 1)
+
+        ratings = dict(UniversityRating.objects.filter(user=self.user).values_list('category', 'rating'))
+        self.assertEqual(ratings, {'campus': 4, 'dorm': 2, 'social': 5})
+        self.assertEqual(self.university.rating_averages()['social'], 5.0)
+
+    def test_resubmit_overwrites(self):
+        self.client.post(self.url, {'campus_rating': 4, 'safety_rating': 3})
+        self.client.post(self.url, {'campus_rating': 2})
+
+        ratings = dict(UniversityRating.objects.filter(user=self.user).values_list('category', 'rating'))
+        self.assertEqual(ratings, {'campus': 2, 'safety': 3})
+
+        summary = UniversityRatingSummary.objects.get(university=self.university, category='campus')
+        self.assertEqual((summary.count, summary.total), (1, 2))
+
+    def test_requires_role(self):
+        self.user.role = 'prospective_student'
+        self.user.save()
+
+        self.client.post(self.url, {'campus_rating': 4})
+        self.assertFalse(UniversityRating.objects.exists())
+
+
+class RatingHistogramTests(TestCase):
+    def setUp(self):
+        self.university = University.objects.create(name="Histogram University", location="SC")
+        users = [
+            CustomUser.objects.create(username=f"histuser{i}", email=f"histuser{i}@example.com", role='alumni')
+            for i in range(4)
+        ]
+        # A split 3.0 and a uniform one
+        for user, rating in zip(users, (1, 5, 1, 5)):
+            UniversityRating.objects.create(university=self.university, category='social', rating=rating, user=user)
+        for user, rating in zip(users, (3, 3, 3.5, 2.5)):
+            UniversityRating.objects.create(university=self.university, category='safety', rating=rating, user=user)
+
+    def test_histograms(self):
+        histograms = University.objects.get(pk=self.university.pk).rating_histograms()
+
+        self.assertEqual(histograms['social'], [2, 0, 0, 0, 2])
+        self.assertEqual(histograms['safety'], [0, 1, 3, 0, 0])
+        self.assertEqual(histograms['dorm'], [0, 0, 0, 0, 0])
+
+    def test_follows_changes(self):
+        rating = UniversityRating.objects.filter(category='social', rating=1).first()
+        rating.rating = 4
+        rating.save()
+        UniversityRating.objects.filter(category='safety', rating=2.5).delete()
+
+        histograms = University.objects.get(pk=self.university.pk).rating_histograms()
+        self.assertEqual(histograms['social'], [1, 0, 0, 1, 2])
+        self.assertEqual(histograms['safety'], [0, 0, 3, 0, 0])
+
+        # The rebuild agrees with the triggers
+        call_command('rebuild_rating_summaries', stdout=io.StringIO())
+        self.assertEqual(University.objects.get(pk=self.university.pk).rating_histograms(), histograms)
+
+    def test_overview_context(self):
+        url = reverse("MajorHelp:university-detail", kwargs={'slug': self.university.slug})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.context['rating_histograms']['social'], [2, 0, 0, 0, 2])
+        self.assertEqual(sum('universityratingsummary' in q['sql'] for q in queries.captured_queries), 1)
+
+    def test_json(self):
+        url = reverse("MajorHelp:university_ratings", kwargs={'slug': self.university.slug})
+        data = self.client.get(url).json()
+
+        self.assertEqual(data['categories']['social'], {
+            'label': "Social", 'count': 4, 'average': 3.0, 'histogram': [2, 0, 0, 0, 2],
+        })
+        self.assertEqual(data['categories']['dining']['count'], 0)
+        self.assertEqual(self.client.get(reverse("MajorHelp:university_ratings", kwargs={'slug': "nope"})).status_code, 404)
+
+
+class MajorReviewStatsTests(TestCase):
+    def setUp(self):
+        self.university = University.objects.create(name="Review Stats University", location="SC")
+        self.other = University.objects.create(name="Another Stats University", location="SC")
+        self.major = Major.objects.create(
+            major_name="Statistics", university=self.university, department='Engineering and Technology',
+        )
+        self.other_major = Major.objects.create(
+            major_name="Statistics", university=self.other, department='Engineering and Technology',
+        )
+        self.users = [
+            CustomUser.objects.create(username=f"statsuser{i}", email=f"statsuser{i}@example.com", role='alumni')
+            for i in range(3)
+        ]
+        search_cache.clear()
+
+    def review(self, major, user, rating):
+        return MajorReview.objects.create(
+            major=major, university=major.university, user=user, review_text="Fine.", rating=rating,
+        )
+
+    def stats(self, major):
+        major = Major.objects.get(pk=major.pk)
+        return major.review_count, major.avg_rating
+
+    def test_follows_reviews(self):
+        self.assertEqual(self.stats(self.major), (0, 0))
+
+        first = self.review(self.major, self.users[0], 4)
+        self.review(self.major, self.users[1], 5)
+        self.assertEqual(self.stats(self.major), (2, 4.5))
+
+        first.rating = 2
+        first.save()
+        self.assertEqual(self.stats(self.major), (2, 3.5))
+
+        # Moving a review updates both majors
+        first.major = self.other_major
+        first.save()
+        self.assertEqual(self.stats(self.major), (1, 5.0))
+        self.assertEqual(self.stats(self.other_major), (1, 2.0))
+
+        MajorReview.objects.filter(major=self.major).delete()
+        self.assertEqual(self.stats(self.major), (0, 0))
+
+    def test_saving_major_keeps_stats(self):
+        major = Major.objects.get(pk=self.major.pk)
+        self.review(self.major, self.users[0], 4)
+
+        # A stale instance doesn't write its old counts back
+        major.major_description = "Numbers."
+        major.save()
+        self.assertEqual(self.stats(self.major), (1, 4.0))
+        self.assertEqual(major.review_count, 1)
+
+    def test_saving_deleted_major_inserts_it(self):
+        major = Major.objects.get(pk=self.major.pk)
+        Major.objects.filter(pk=major.pk).delete()
+
+        major.save()
+        self.assertTrue(Major.objects.filter(pk=major.pk).exists())
+
+    def test_overview_context(self):
+        self.review(self.major, self.users[0], 3)
+        self.review(self.major, self.users[1], 4)
+
+        response = self.client.get(reverse("MajorHelp:major-detail", kwargs={'slug': self.major.slug}))
+        self.assertEqual(response.context['average_rating'], 3.5)
+        self.assertEqual(response.context['review_count'], 2)
+
+        self.client.force_login(self.users[1])
+        response = self.client.get(reverse("MajorHelp:major-detail", kwargs={'slug': self.major.slug}))
+        self.assertEqual(response.context['user_review'].rating, 4)
+
+    def test_rating_sort(self):
+        self.review(self.other_major, self.users[0], 5)
+        self.review(self.major, self.users[1], 3)
+
+        response = self.client.get(reverse("MajorHelp:major_results", args=["Statistics"]), {'sort': 'rating'})
+        self.assertEqual(
+            [u['name'] for u in response.context['page_obj']],
+            ["Another Stats University", "Review Stats University"],
+        )
+
+        response = self.client.get(reverse("MajorHelp:search_stream"), {'query': "Statistics", 'sort': 'rating'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([(row['university'], row['avg_rating']) for row in rows], [
+            ("Another Stats University", 5.0), ("Review Stats University", 3.0),
+        ])
+
+
+class ReviewFeedTests(TestCase):
+    def setUp(self):
+        self.university = University.objects.create(name="Feed University", location="SC")
+        self.major = Major.objects.create(
+            major_name="Feed Studies", university=self.university, department='Humanities and Social Sciences',
+        )
+        self.users = [
+            CustomUser.objects.create(username=f"feeduser{i}", email=f"feeduser{i}@example.com", role='alumni')
+            for i in range(25)
+        ]
+        self.university_reviews = [
+            UniversityReview.objects.create(user=user, review_text=f"Review {i}", university=self.university)
+            for i, user in enumerate(self.users)
+        ]
+        self.major_reviews = [
+            MajorReview.objects.create(
+                major=self.major, university=self.university, user=self.users[i % 3],
+                review_text=f"Review {i}", rating=4,
+            )
+            for i in range(12)
+        ]
+
+    def test_university_feed(self):
+        url = reverse("MajorHelp:university-detail", kwargs={'slug': self.university.slug})
+        page = self.client.get(url).context['latest_post_list']
+
+        # Newest first; these were all posted in the same second, so by id
+        newest = [review.pk for review in reversed(self.university_reviews)]
+        self.assertEqual([review.pk for review in page], newest[:10])
+        self.assertTrue(page.has_next())
+
+        feed = reverse("MajorHelp:university_reviews", kwargs={'slug': self.university.slug})
+        data = self.client.get(feed, {'after': page.next_cursor}).json()
+        self.assertEqual([review['id'] for review in data['reviews']], newest[10:20])
+        self.assertEqual(data['reviews'][0]['username'], "feeduser14")
+        self.assertFalse(data['reviews'][0]['mine'])
+
+        data = self.client.get(feed, {'after': data['next']}).json()
+        self.assertEqual([review['id'] for review in data['reviews']], newest[20:])
+        self.assertIsNone(data['next'])
+
+    def test_marks_own_review(self):
+        self.client.force_login(self.users[1])
+        feed = reverse("MajorHelp:university_reviews", kwargs={'slug': self.university.slug})
+        data = self.client.get(feed, {'after': self.university_reviews[2].pk}).json()
+
+        self.assertEqual([review['mine'] for review in data['reviews']], [True, False])
+
+    def test_major_feed_loads_users_with_reviews(self):
+        url = reverse("MajorHelp:major-detail", kwargs={'slug': self.major.slug})
+        page = self.client.get(url).context['latest_post_list']
+        self.assertEqual(len(page), 10)
+
+        feed = reverse("MajorHelp:major_reviews", kwargs={'slug': self.major.slug})
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(feed, {'after': page.next_cursor}).json()
+
+        self.assertEqual([review['id'] for review in data['reviews']], [self.major_reviews[1].pk, self.major_reviews[0].pk])
+        self.assertEqual(data['reviews'][0]['username'], "feeduser1")
+        self.assertEqual(data['reviews'][0]['rating'], 4.0)
+        self.assertIsNone(data['next'])
+        self.assertFalse(any('FROM "MajorHelp_customuser"' in q['sql'] for q in queries.captured_queries))
+
+    def test_unknown_parent(self):
+        self.assertEqual(self.client.get(reverse("MajorHelp:university_reviews", kwargs={'slug': "nope"})).status_code, 404)
+        self.assertEqual(self.client.get(reverse("MajorHelp:major_reviews", kwargs={'slug': "nope"})).status_code, 404)
+
+
+class UniversityReviewUserTests(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create(username="reviewowner", email="reviewowner@example.com", role='alumni')
+        self.other = CustomUser.objects.create(username="reviewother", email="reviewother@example.com", role='alumni')
+        self.universities = [
+            University.objects.create(name=f"Owner University {i}", location="SC") for i in range(12)
+        ]
+        for university in self.universities:
+            UniversityReview.objects.create(user=self.user, review_text=f"About {university.name}", university=university)
+        UniversityReview.objects.create(user=self.other, review_text="Not mine", university=self.universities[0])
+
+    def test_leave_and_delete_review(self):
+        university = University.objects.create(name="Fresh University", location="SC")
+        self.client.force_login(self.user)
+        url = reverse("MajorHelp:create_review", args=[self.user.username])
+
+        self.client.post(url, {'review_text': "Great.", 'university_id': university.pk})
+        self.client.post(url, {'review_text': "Again.", 'university_id': university.pk})
+        self.assertEqual(list(university.university_review.values_list('user__username', 'review_text')), [
+            ("reviewowner", "Great."),
+        ])
+
+        response = self.client.get(reverse("MajorHelp:university-detail", kwargs={'slug': university.slug}))
+        self.assertTrue(response.context['user_review'])
+
+        self.client.post(reverse("MajorHelp:delete-review", args=[university.pk]))
+        self.assertFalse(university.university_review.exists())
+
+    def test_leave_review_requires_login(self):
+        university = University.objects.create(name="Fresh University", location="SC")
+        url = reverse("MajorHelp:create_review", args=["nobody"])
+
+        response = self.client.post(url, {'review_text': "Great.", 'university_id': university.pk})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(university.university_review.exists())
+
+    def test_my_reviews(self):
+        self.client.force_login(self.user)
+        url = reverse("MajorHelp:my_reviews")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        page = response.context['page_obj']
+
+        self.assertEqual([review.university for review in page], self.universities[::-1][:10])
+        self.assertContains(response, "About Owner University 11")
+        self.assertEqual(sum('universityreview' in q['sql'] for q in queries.captured_queries), 1)
+
+        page = self.client.get(url, {'after': page.next_cursor}).context['page_obj']
+        self.assertEqual([review.university for review in page], self.universities[1::-1])
+        self.assertFalse(page.has_next())
+
+    def test_my_reviews_requires_login(self):
+        self.assertEqual(self.client.get(reverse("MajorHelp:my_reviews")).status_code, 302)
+
+    def test_review_outlives_its_author(self):
+        university = University.objects.create(name="Fresh University", location="SC")
+        self.client.force_login(self.other)
+        self.client.post(reverse("MajorHelp:create_review", args=[self.other.username]),
+                         {'review_text': "Still here.", 'university_id': university.pk})
+        self.client.logout()
+        self.other.delete()
+
+        review = university.university_review.get()
+        self.assertIsNone(review.user)
+        self.assertEqual(review.author_name, "reviewother")
+
+        response = self.client.get(reverse("MajorHelp:university-detail", kwargs={'slug': university.slug}))
+        self.assertContains(response, "reviewother")
+        self.assertNotContains(response, "Delete Review")
+
+        data = self.client.get(reverse("MajorHelp:university_reviews", args=[university.slug])).json()
+        self.assertEqual([(r['username'], r['mine']) for r in data['reviews']], [("reviewother", False)])
+
+
+class ReviewSearchTests(TestCase):
+    def setUp(self):
+        self.university = University.objects.create(name="Search Review University", location="SC")
+        self.other = University.objects.create(name="Other Review University", location="SC")
+        self.major = Major.objects.create(
+            major_name="Review Search", university=self.university, department='Humanities and Social Sciences',
+        )
+        self.users = [
+            CustomUser.objects.create(username=f"searchuser{i}", email=f"searchuser{i}@example.com", role='alumni')
+            for i in range(4)
+        ]
+
+        texts = [
+            "Parking is awful, parking passes sell out and parking lots are far.",
+            "Great professors. The <b>dorms</b> had mold though.",
+            "Nice campus, some parking near the library.",
+        ]
+        self.reviews = [
+            UniversityReview.objects.create(user=user, review_text=text, university=self.university)
+            for user, text in zip(self.users, texts)
+        ]
+        UniversityReview.objects.create(user=self.users[3], review_text="Parking is easy.", university=self.other)
+
+        MajorReview.objects.create(
+            major=self.major, university=self.university, user=self.users[0],
+            review_text="Lots of parking theory.", rating=4,
+        )
+        self.url = reverse("MajorHelp:university_review_search", kwargs={'slug': self.university.slug})
+
+    def search(self, query, url=None):
+        return self.client.get(url or self.url, {'q': query}).json()['reviews']
+
+    def test_ranked_within_university(self):
+        results = self.search("parking")
+
+        # The review that says it three times first, and none from the other school
+        self.assertEqual([review['id'] for review in results], [self.reviews[0].pk, self.reviews[2].pk])
+        self.assertIn("<mark>parking</mark>", results[1]['snippet'])
+        self.assertEqual(results[0]['username'], "searchuser0")
+
+    def test_prefix_terms_and_escaping(self):
+        results = self.search("dorm mold")
+
+        self.assertEqual([review['id'] for review in results], [self.reviews[1].pk])
+        self.assertIn("&lt;b&gt;<mark>dorms</mark>&lt;/b&gt;", results[0]['snippet'])
+        self.assertIn("<mark>mold</mark>", results[0]['snippet'])
+
+        self.assertEqual(self.search("parking mold"), [])
+
+    def test_follows_edits(self):
+        review = self.reviews[1]
+        review.review_text = "The parking garage flooded."
+        review.save()
+        self.reviews[0].delete()
+
+        # bm25 puts the shorter review first
+        self.assertEqual([r['id'] for r in self.search("parking")], [review.pk, self.reviews[2].pk])
+        self.assertEqual(self.search("mold"), [])
+
+    def test_major_reviews(self):
+        url = reverse("MajorHelp:major_review_search", kwargs={'slug': self.major.slug})
+        results = self.search("parking", url)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['snippet'], "Lots of <mark>parking</mark> theory.")
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'q': "  "}).status_code, 400)
+        self.assertEqual(self.search("!!!"), [])
+
+        url = reverse("MajorHelp:university_review_search", kwargs={'slug': "nope"})
+        self.assertEqual(self.client.get(url, {'q': "parking"}).status_code, 404)
+
+
+class MigrateRefreshTests(TestCase):
+    def setUp(self):
+        self.university = University.objects.create(name="Migrated University", location="SC")
+        self.major = Major.objects.create(
+            major_name="Migration", university=self.university, department='Engineering and Technology',
+        )
+        user = CustomUser.objects.create(username="migrateuser", email="migrateuser@example.com", role='alumni')
+        UniversityRating.objects.create(university=self.university, category='campus', rating=4, user=user)
+        MajorReview.objects.create(
+            major=self.major, university=self.university, user=user, review_text="Fine.", rating=4,
+        )
+
+        # As if the tables had been added on a database without our triggers
+        MajorCost.objects.all().delete()
+        UniversityRatingSummary.objects.all().delete()
+        Major.objects.update(review_count=0, avg_rating=0)
+
+    def migrated(self, *names, backwards=False):
+        loader = MigrationLoader(connection)
+        plan = [(loader.graph.nodes[('MajorHelp', name)], backwards) for name in names]
+        with mock.patch('MajorHelp.signals.triggers_enabled', return_value=False):
+            refresh_after_migrate(django_apps.get_app_config('MajorHelp'), using='default', plan=plan)
+
+    def test_fills_what_the_plan_added(self):
+        self.migrated('0016_rating_summary_histogram', '0017_major_review_stats')
+        self.assertFalse(MajorCost.objects.exists())
+
+        summary = self.university.rating_summaries.get()
+        self.assertEqual((summary.count, summary.stars_4), (1, 1))
+        self.major.refresh_from_db()
+        self.assertEqual((self.major.review_count, self.major.avg_rating), (1, 4.0))
+
+        self.migrated('0011_majorcost')
+        self.assertTrue(MajorCost.objects.filter(major=self.major).exists())
+
+    def test_ignores_other_migrations(self):
+        self.migrated('0013_financialaid_name_index')
+        self.migrated('0011_majorcost', backwards=True)
+
+        self.assertFalse(MajorCost.objects.exists())
+        self.assertFalse(UniversityRatingSummary.objects.exists())
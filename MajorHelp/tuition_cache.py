@@ -0,0 +1,150 @@
+"""
+In-process cache of the tuition calculator's inputs.
+
+The calculator APIs look up the same universities, majors and aids over and
+over while a user tries combinations. Each lookup's result is kept in a
+VersionedLRUCache, keyed on how it was looked up (id, slug or name), so a
+warm /api/calculate/ request doesn't touch the database. signals.py bumps
+the version whenever a University, Major or FinancialAid changes.
+
+The reverse aid lookups (which universities an aid applies to, and what a
+major costs at each of them) are cached here too, per aid.
+
+Everything is stored as plain dicts of the fields the calculator needs.
+"""
+
+from .models import University, Major, FinancialAid, MajorCost
+from .result_cache import VersionedLRUCache
+
+MAX_SIZE = 4096
+
+UNIVERSITY_FIELDS = (
+    'id', 'name', 'slug', 'location',
+    'in_state_base_min_tuition', 'in_state_base_max_tuition',
+    'out_of_state_base_min_tuition', 'out_of_state_base_max_tuition',
+    'fees', 'latitude', 'longitude',
+)
+
+MAJOR_FIELDS = (
+    'id', 'university_id', 'major_name', 'slug', 'department',
+    'in_state_min_tuition', 'in_state_max_tuition',
+    'out_of_state_min_tuition', 'out_of_state_max_tuition',
+    'grad_in_state_min_tuition', 'grad_in_state_max_tuition',
+    'grad_out_of_state_min_tuition', 'grad_out_of_state_max_tuition',
+    'fees',
+)
+
+AID_FIELDS = ('name', 'location', 'amount')
+
+AID_UNIVERSITY_FIELDS = ('id', 'name', 'slug', 'location')
+
+tuition_cache = VersionedLRUCache(max_size=MAX_SIZE)
+
+
+def _load_university(lookup, value):
+    university = University.objects.filter(**{lookup: value}).values(*UNIVERSITY_FIELDS).order_by('pk').first()
+    if university is not None:
+        university['aids'] = list(
+            FinancialAid.objects.filter(university=university['id']).values(*AID_FIELDS).order_by('pk')
+        )
+    return university
+
+
+def get_university(lookup, value):
+    """
+    The first university where `lookup` ('pk', 'slug', 'name__iexact', ...)
+    matches `value`, with its applicable aids, or None.
+    """
+    return tuition_cache.get_or_set(
+        ('university', lookup, value),
+        lambda: _load_university(lookup, value),
+    )
+
+
+def get_university_matches(lookup, value):
+    """Every university where `lookup` matches `value`, in id order, as AID_UNIVERSITY_FIELDS values."""
+    return tuition_cache.get_or_set(
+        ('university_matches', lookup, value),
+        lambda: list(University.objects.filter(**{lookup: value}).values(*AID_UNIVERSITY_FIELDS).order_by('pk')),
+    )
+
+
+def get_major(lookup, value, university_id=None):
+    """The first major where `lookup` matches `value`, optionally within one university."""
+    filters = {lookup: value}
+    if university_id is not None:
+        filters['university_id'] = university_id
+
+    return tuition_cache.get_or_set(
+        ('major', lookup, value, university_id),
+        lambda: Major.objects.filter(**filters).values(*MAJOR_FIELDS).order_by('pk').first(),
+    )
+
+
+def get_majors(university_id, department):
+    """Names of a university's majors in one department."""
+    return tuition_cache.get_or_set(
+        ('majors', university_id, department),
+        lambda: list(Major.objects.filter(
+            university_id=university_id, department=department,
+        ).order_by('pk').values_list('major_name', flat=True)),
+    )
+
+
+def _load_catalog(university_id):
+    departments = {}
+    majors = Major.objects.filter(university_id=university_id).values(*MAJOR_FIELDS).order_by('department', 'pk')
+    for major in majors:
+        departments.setdefault(major['department'], []).append(major)
+    return departments
+
+
+def get_catalog(university_id):
+    """Every major of a university, by department (in name order)."""
+    return tuition_cache.get_or_set(
+        ('catalog', university_id),
+        lambda: _load_catalog(university_id),
+    )
+
+
+def get_aid(name):
+    return tuition_cache.get_or_set(
+        ('aid', name),
+        lambda: FinancialAid.objects.filter(name=name).values(*AID_FIELDS).order_by('pk').first(),
+    )
+
+
+def _load_aid_universities(name):
+    aid = FinancialAid.objects.filter(name=name).values('id', *AID_FIELDS).order_by('pk').first()
+    if aid is not None:
+        aid['universities'] = list(
+            University.objects.filter(applicableAids=aid['id']).values(*AID_UNIVERSITY_FIELDS).order_by('name', 'pk')
+        )
+    return aid
+
+
+def get_aid_universities(name):
+    """The first aid named `name`, with its id and the universities it applies to, or None."""
+    return tuition_cache.get_or_set(
+        ('aid_universities', name),
+        lambda: _load_aid_universities(name),
+    )
+
+
+def get_aid_costs(aid_id, major_name, outstate):
+    """
+    What the major named `major_name` costs before aid at each university
+    the aid applies to, cheapest first, as MajorCost values. One query:
+    the aid's through-table rows join MajorCost on its university index.
+    """
+    residency = 'out_of_state' if outstate else 'in_state'
+
+    return tuition_cache.get_or_set(
+        ('aid_costs', aid_id, major_name.lower(), residency),
+        lambda: list(MajorCost.objects.filter(
+            university__applicableAids=aid_id, major__major_name__iexact=major_name,
+        ).order_by(f'{residency}_min', 'university__name', 'pk').values(
+            'university__name', 'university__slug', 'major__major_name', 'major__slug',
+            f'{residency}_min', f'{residency}_max',
+        )),
+    )
@@ -44,6 +44,10 @@ urlpatterns = [
     # Uni overview views urls
     path('UniversityOverview/<str:slug>/', main_views.UniversityOverviewView.as_view(), name='university-detail'),
     path('SubmitRating/<int:pk>/', main_views.SubmitRatingView.as_view(), name='submit-rating'),
+    path('leaderboards/<str:category>/', main_views.LeaderboardView.as_view(), name='leaderboard'),
+    path('api/universities/<str:slug>/ratings/', main_views.university_ratings, name='university_ratings'),
+    path('api/universities/<str:slug>/reviews/', main_views.university_reviews, name='university_reviews'),
+    path('api/universities/<str:slug>/reviews/search/', main_views.university_review_search, name='university_review_search'),
     # Leave review for University
     path('create/review/<str:username>/', main_views.LeaveUniversityReview.as_view(), name="create_review"),
    
@@ -54,6 +58,7 @@ urlpatterns = [
     path('accounts/activate/<str:token>/', main_views.activate_account, name='activate_account'),
     path('accounts/settings/', main_views.settings_view, name='settings'),
     path('accounts/check-email/', main_views.check_email_view, name='check_email'),
+    path('accounts/reviews/', main_views.MyReviewsView.as_view(), name='my_reviews'),
 
     # URLS for the Contact and About page
     path('about/', main_views.about, name='about'),
@@ -65,9 +70,13 @@ urlpatterns = [
     path('search/department/<str:query>/', main_views.DepartmentResultsView.as_view(), name='department_results'),
     path('search/major/<str:query>/', main_views.MajorResultsView.as_view(), name='major_results'),
     path('search/university-request/', main_views.UniversityRequestView.as_view(), name='university-request'),
+    path('api/search/', main_views.search_stream, name='search_stream'),
+    path('api/search_cache/stats/', main_views.search_cache_stats, name='search_cache_stats'),
 
     #urls for major overviews
     path('MajorOverview/<slashslug:slug>/', main_views.MajorOverviewView.as_view(), name='major-detail'),
+    path('api/majors/<slashslug:slug>/reviews/', main_views.major_reviews, name='major_reviews'),
+    path('api/majors/<slashslug:slug>/reviews/search/', main_views.major_review_search, name='major_review_search'),
     # Leave review for Major
     path('create/review/major/<str:username>/', main_views.LeaveMajorReview.as_view(), name='create_major_review'),
     
@@ -76,8 +85,12 @@ urlpatterns = [
     path('calc/', main_views.CalcView.as_view(), name='calc'),
     path("api/university_search/", main_views.university_search, name="university_search"),
     path("api/aid/", main_views.aid_list, name="aid_list"),
+    path("api/aid/universities/", main_views.aid_universities, name="aid_universities"),
     path("api/majors/", main_views.major_list, name="major_list"),
     path("api/calculate/", main_views.calculate, name="calculate"),
+    path("api/calculator/", main_views.calculator_data, name="calculator_data"),
+    path("api/calculate/batch/", main_views.calculate_batch, name="calculate_batch"),
+    path("api/projection/", main_views.university_projection, name="university_projection"),
     path("api/calcs/", main_views.calc_list, name="calc_list"),
     path("api/save_calc/", main_views.save_calc, name="save_calc"),
 
@@ -103,6 +116,7 @@ urlpatterns = [
     # majorhelp map url
     path('map/', main_views.college_map, name='college_map'),
     path('api/universities/mapdata/', main_views.university_map_data, name='university_map_data'),
+    path('api/universities/nearby/', main_views.universities_nearby, name='universities_nearby'),
     path('university/<int:pk>/submit-overall-rating/', main_views.SubmitOverallRatingView.as_view(), name='submit-overall-rating'),
     path('university/<int:pk>/delete-review/', main_views.DeleteReviewView.as_view(), name='delete-review'),
 
@@ -1,5 +1,5 @@
 from django.shortcuts import get_object_or_404, render, redirect
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse, HttpResponseBadRequest
+from django.http import HttpResponse, HttpResponseRedirect, JsonResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.template import loader
 from django.http import Http404
 from django.db.models import F
@@ -51,10 +51,14 @@ from django.shortcuts import get_object_or_404, redirect
 import json
 import re
 from django.db.models import Q
+from django.db import transaction
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
 from ..models import DiscussionThread
 from django.views.decorators.http import require_POST # used for favorite feature
+from django.views.decorators.http import condition
+from django.views.decorators.cache import cache_control
+from django.utils.formats import date_format
 # Used to catch an exception if GET tries to get a value that isn't defined.
 from django.utils.datastructures import MultiValueDictKeyError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
@@ -64,6 +68,22 @@ from django.views import View
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from django.shortcuts import render
 from ..models import Major
+from ..search import search_universities, search_majors, major_facets, university_facets
+from ..db import triggers_enabled
+from ..ratings import refresh_rating_summaries
+from ..pagination import keyset_paginate
+from ..review_search import search_reviews, snippet as review_snippet
+from ..autocomplete import university_autocomplete, MAX_LIMIT as AUTOCOMPLETE_MAX_LIMIT
+from ..fuzzy import university_fuzzy, major_fuzzy
+from ..result_cache import search_cache
+from ..geo import universities_within
+from ..projection import projection_params, project, cost_row, ProjectionError
+from ..tuition_cache import (
+    tuition_cache, get_university, get_university_matches, get_major, get_majors, get_aid,
+    get_aid_universities, get_aid_costs, get_catalog,
+    UNIVERSITY_FIELDS, MAJOR_FIELDS, AID_FIELDS, AID_UNIVERSITY_FIELDS,
+)
+from django.contrib.admin.views.decorators import staff_member_required
 import string
 
 from django.views import View
@@ -275,16 +295,15 @@ class UniversityOverviewView(DetailView):
 
             # Whether this user already submitted a review
             context['user_review'] = UniversityReview.objects.filter(
-                username=self.request.user.username,
+                user=self.request.user,
                 university=university
             ).exists()
         else:
             context['is_favorite'] = False
 
         
-        context['latest_post_list'] = UniversityReview.objects.filter(
-            university=university
-        ).order_by('-pub_date')
+        # The newest reviews; the rest load through university_reviews
+        context['latest_post_list'] = university_review_page(university)
 
         context['primary_color'] = university.primary_color if university.primary_color else '#ffffff'
         context['secondary_color'] = university.secondary_color if university.secondary_color else '#ffffff'
@@ -299,6 +318,9 @@ class UniversityOverviewView(DetailView):
 
         context['user_ratings'] = user_ratings
 
+        # 1-5 star counts per category, from the same lookup as the averages
+        context['rating_histograms'] = self.object.rating_histograms()
+
 
         
         return context
@@ -306,7 +328,7 @@ class UniversityOverviewView(DetailView):
         #JUMP
         if self.request.user.is_authenticated:
             self.request.user.refresh_from_db()
-            user_review = UniversityReview.objects.filter(username=self.request.user.username, university=university).exists()
+            user_review = UniversityReview.objects.filter(user=self.request.user, university=university).exists()
             context['user_review'] = user_review  # If review exists, pass it to the template
             
             #Adds favorite status to context
@@ -344,6 +366,197 @@ class SubmitRatingView(View):
 
         return redirect('MajorHelp:university-detail', slug=university.slug)
 
+
+def university_ratings(request, slug):
+    # Every rating category of a university: how many ratings, the average
+    # and the histogram, a list of how many ratings gave 1 to 5 stars
+    university = get_object_or_404(University, slug=slug)
+    labels = dict(UniversityRating.CATEGORY_CHOICES)
+
+    return JsonResponse({
+        "university": university.name,
+        "categories": {
+            category: {
+                "label": labels[category],
+                "count": summary.count if summary else 0,
+                "average": summary.average() if summary else 0.0,
+                "histogram": summary.histogram() if summary else [0] * 5,
+            }
+            for category, summary in university.category_summaries().items()
+        },
+    })
+
+
+REVIEW_PAGE_SIZE = 10
+
+# Newest first. The id breaks ties between reviews posted in the same
+# second, and both feeds have a (parent, -pub_date, -id) index to walk.
+REVIEW_ORDERING = ('-pub_date', '-pk')
+
+
+def university_review_page(university, after=None):
+    return keyset_paginate(
+        UniversityReview.objects.filter(university=university).select_related('user'),
+        REVIEW_ORDERING, REVIEW_PAGE_SIZE, after=after,
+    )
+
+
+def major_review_page(major, after=None):
+    return keyset_paginate(
+        major.major_reviews.select_related('user'),
+        REVIEW_ORDERING, REVIEW_PAGE_SIZE, after=after,
+    )
+
+
+def university_reviews(request, slug):
+    # The "load more" feed of a university's reviews, one page after the
+    # `after` cursor. `next` is the cursor of the following page, or null.
+    university = get_object_or_404(University, slug=slug)
+    page = university_review_page(university, after=request.GET.get('after'))
+    return JsonResponse({
+        "reviews": [
+            {
+                "id": review.pk,
+                "username": review.author_name,
+                "review_text": review.review_text,
+                "pub_date": review.pub_date.isoformat(),
+                "date": date_format(timezone.localtime(review.pub_date), "F j, Y, g:i a"),
+                "mine": review.user_id is not None and review.user_id == request.user.pk,
+            }
+            for review in page
+        ],
+        "next": page.next_cursor,
+    })
+
+
+def major_reviews(request, slug):
+    # Same as university_reviews, for a major
+    major = get_object_or_404(Major, slug=slug)
+    page = major_review_page(major, after=request.GET.get('after'))
+
+    return JsonResponse({
+        "reviews": [
+            {
+                "id": review.pk,
+                "username": review.user.username,
+                "review_text": review.review_text,
+                "rating": float(review.rating),
+                "pub_date": review.pub_date.isoformat(),
+                "date": date_format(timezone.localtime(review.pub_date), "DATETIME_FORMAT"),
+            }
+            for review in page
+        ],
+        "next": page.next_cursor,
+    })
+
+
+REVIEW_SEARCH_LIMIT = 20
+
+
+def _review_search(request, reviews, date_style):
+    # The best REVIEW_SEARCH_LIMIT of `reviews` for ?q=, each with an HTML
+    # snippet of the matching words (see review_search.py)
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return HttpResponse("Error - Missing search query.", status=400)
+
+    return JsonResponse({
+        "query": query,
+        "reviews": [
+            {
+                "id": review.pk,
+                "username": review.author_name,
+                "snippet": review_snippet(review, query),
+                "pub_date": review.pub_date.isoformat(),
+                "date": date_format(timezone.localtime(review.pub_date), date_style),
+            }
+            for review in search_reviews(reviews, query)[:REVIEW_SEARCH_LIMIT]
+        ],
+    })
+
+
+def university_review_search(request, slug):
+    university = get_object_or_404(University, slug=slug)
+    reviews = UniversityReview.objects.filter(university=university).select_related('user')
+    return _review_search(request, reviews, "F j, Y, g:i a")
+
+
+def major_review_search(request, slug):
+    major = get_object_or_404(Major, slug=slug)
+    return _review_search(request, major.major_reviews.select_related('user'), "DATETIME_FORMAT")
+
+
+class MyReviewsView(LoginRequiredMixin, View):
+    # Every university review the user has left, newest first. One query
+    # per page: the reviews and their universities, through the user's
+    # (user, -pub_date) index.
+    template_name = "reviews/my_reviews.html"
+
+    def get(self, request):
+        page_obj = keyset_paginate(
+            request.user.university_reviews.select_related('university'),
+            REVIEW_ORDERING,
+            REVIEW_PAGE_SIZE,
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+
+        return render(request, self.template_name, {
+            'reviews': page_obj,
+            'page_obj': page_obj,
+            'is_paginated': page_obj.has_other_pages(),
+        })
+
+
+LEADERBOARD_PAGE_SIZE = 20
+
+
+class LeaderboardView(View):
+    # Universities ranked by their Bayesian score in one rating category
+    # (see ratings.py), read from UniversityRatingSummary. The keyset pages
+    # walk the (category, score) index, so every page costs the same.
+    template_name = "leaderboard/leaderboard.html"
+
+    def get(self, request, category):
+        categories = dict(UniversityRating.CATEGORY_CHOICES)
+        if category not in categories:
+            raise Http404("No such rating category.")
+
+        summaries = UniversityRatingSummary.objects.filter(category=category, count__gt=0).values(
+            'pk', 'score', 'count', 'total',
+            'university__name', 'university__slug', 'university__location',
+        )
+        page_obj = keyset_paginate(
+            summaries,
+            ['-score', '-count', 'pk'],
+            LEADERBOARD_PAGE_SIZE,
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+
+        entries = [
+            {
+                'name': summary['university__name'],
+                'slug': summary['university__slug'],
+                'location': summary['university__location'],
+                'score': round(summary['score'], 2),
+                'average': round(float(summary['total']) / summary['count'], 1),
+                'count': summary['count'],
+            }
+            for summary in page_obj
+        ]
+
+        return render(request, self.template_name, {
+            'category': category,
+            'category_label': categories[category],
+            'categories': UniversityRating.CATEGORY_CHOICES,
+            'entries': entries,
+            'page_obj': page_obj,
+            'is_paginated': page_obj.has_other_pages(),
+        })
+
+
+@method_decorator(login_required, name='dispatch')
 class LeaveUniversityReview(View):
     def post(self, request, username):
         review_text = request.POST.get("review_text", "").strip()
@@ -356,13 +569,14 @@ class LeaveUniversityReview(View):
         university = get_object_or_404(University, pk=university_id)
 
         # Check if the user has already left a review for this university
-        existing_review = UniversityReview.objects.filter(username=request.user.username, university=university).exists()
+        existing_review = UniversityReview.objects.filter(user=request.user, university=university).exists()
 
         if existing_review:
             messages.error(request, 'You have already submitted a review for this university.')
         else:
             # Create and save the review
             UniversityReview.objects.create(
+                user=request.user,
                 username=request.user.username,
                 review_text=review_text,
                 university=university
@@ -507,14 +721,64 @@ class SearchView(View):
         # Default behavior (in case of other filter types)
         return render(request, 'search/search.html', {'query': query, 'filter_type': filter_type})
 
-from django.db.models import Prefetch, F
+from django.db.models import F, Exists, OuterRef, Subquery, Count, Max
+from abc import ABC, abstractmethod
+
+
+class CachedSearchResultsView(View, ABC):
+    """
+    Base for the search result pages.
+
+    get_results() builds the template context, which is kept in search_cache
+    keyed on everything that changes the page. University/Major writes bump
+    the cache version (see signals.py).
+    """
+    template_name = None
+    filter_type = None
+
+    def cache_key(self, request, query):
+        params = request.GET
+        return (
+            self.filter_type,
+            query,
+            params.get('school_type', 'both'),
+            params.get('letter', '').upper(),
+            params.get('page'),
+            params.get('after'),
+            params.get('before'),
+        )
+
+    @abstractmethod
+    def get_results(self, request, query):
+        """The template context for one page of results."""
 
-class SchoolResultsView(View):
     def get(self, request, query):
+        context = search_cache.get_or_set(
+            self.cache_key(request, query),
+            lambda: self.get_results(request, query),
+        )
+        return render(request, self.template_name, context)
+
+
+# Hit/miss counters for sizing the search result cache
+@staff_member_required
+def search_cache_stats(request):
+    return JsonResponse(search_cache.stats())
+
+
+class SchoolResultsView(CachedSearchResultsView):
+    template_name = 'search/school_results.html'
+    filter_type = 'school'
+
+    def get_results(self, request, query):
         school_type = request.GET.get('school_type', 'both')
 
-        universities_list = University.objects.filter(name__istartswith=query).only(
-            'name', 'location', 'is_public', 'slug'
+        # Ranked full-text match on the university name
+        universities_list = search_universities(University.objects.all(), query)
+
+        facets = search_cache.get_or_set(
+            (self.filter_type, 'facets', query),
+            lambda: university_facets(universities_list),
         )
 
         if school_type == 'public':
@@ -522,7 +786,7 @@ class SchoolResultsView(View):
         elif school_type == 'private':
             universities_list = universities_list.filter(is_public=False)
 
-        paginator = Paginator(universities_list, 10)
+        paginator = Paginator(universities_list.values('pk', 'name', 'location', 'is_public', 'slug'), 10)
         page = request.GET.get('page')
 
         try:
@@ -532,197 +796,326 @@ class SchoolResultsView(View):
         except EmptyPage:
             universities = paginator.page(paginator.num_pages)
 
-        # 💥 Super lightweight prefetch using only needed fields
-        majors_prefetch = Prefetch(
-            'majors',
-            queryset=Major.objects.only(
-                'major_name', 'slug', 'department',
-                'in_state_min_tuition', 'in_state_max_tuition',
-                'out_of_state_min_tuition', 'out_of_state_max_tuition'
-            ).order_by('department', 'major_name')
-        )
-        universities.object_list = universities.object_list.prefetch_related(majors_prefetch)
+        # The context is cached, so it holds plain dicts rather than model
+        # instances, and only the page details the template uses
+        by_id = {university['pk']: university for university in universities}
+        departments_by_id = {pk: {} for pk in by_id}
+
+        majors = Major.objects.filter(university_id__in=by_id.keys()).values(
+            'university_id', 'major_name', 'slug', 'department',
+            'in_state_min_tuition', 'in_state_max_tuition',
+            'out_of_state_min_tuition', 'out_of_state_max_tuition',
+        ).order_by('department', 'major_name')
 
+        for major in majors:
+            departments = departments_by_id[major.pop('university_id')]
+            departments.setdefault(major.pop('department'), []).append(major)
 
         results = {}
-        for university in universities:
-            majors = university.majors.all()
-
-            departments = {}
-            for major in majors:
-                departments.setdefault(major.department, []).append({
-                    'major_name': major.major_name,
-                    'slug': major.slug,
-                    'in_state_min_tuition': major.in_state_min_tuition,
-                    'in_state_max_tuition': major.in_state_max_tuition,
-                    'out_of_state_min_tuition': major.out_of_state_min_tuition,
-                    'out_of_state_max_tuition': major.out_of_state_max_tuition,
-                })
-
-            if departments:
-                results[university.slug] = {
-                    'name': university.name,
-                    'location': university.location,
-                    'type': 'Public' if university.is_public else 'Private',
-                    'departments': departments,
+        for pk, university in by_id.items():
+            if departments_by_id[pk]:
+                results[university['slug']] = {
+                    'name': university['name'],
+                    'location': university['location'],
+                    'type': 'Public' if university['is_public'] else 'Private',
+                    'departments': departments_by_id[pk],
                 }
 
-        return render(request, 'search/school_results.html', {
+        page_obj = {
+            'number': universities.number,
+            'has_previous': universities.has_previous(),
+            'has_next': universities.has_next(),
+            'previous_page_number': universities.number - 1,
+            'next_page_number': universities.number + 1,
+            'paginator': {'num_pages': paginator.num_pages},
+        }
+
+        # Nothing matched, offer the closest names instead
+        did_you_mean = []
+        if not paginator.count:
+            did_you_mean = [s['name'] for s in university_fuzzy.suggest(query, 3)]
+
+        return {
             'query': query,
             'results': results,
             'school_type': school_type,
             'filter_type': 'school',
-            'page_obj': universities,
+            'page_obj': page_obj,
             'is_paginated': universities.has_other_pages(),
-        })
+            'did_you_mean': did_you_mean,
+            'type_counts': facets.school_types(),
+        }
 
 
 
-class DepartmentResultsView(View):
-    def get(self, request, query):
-        school_type = request.GET.get('school_type', 'both')
-        letter = request.GET.get('letter', 'A').upper()
-        page = request.GET.get('page', 1)
+# Fields shown for each major in the result pages
+RESULT_MAJOR_FIELDS = (
+    'major_name', 'slug', 'department',
+    'in_state_min_tuition', 'in_state_max_tuition',
+    'out_of_state_min_tuition', 'out_of_state_max_tuition',
+    'review_count', 'avg_rating',
+)
 
-        # Step 1: Filter majors by department
-        majors_list = Major.objects.filter(department__icontains=query)
+# Tuition column that the cost filter and cost sort use, by residency. This
+# is the per-major tuition the result pages show, not MajorCost's total.
+TUITION_COLUMNS = {
+    'in_state': 'in_state_min_tuition',
+    'out_of_state': 'out_of_state_min_tuition',
+}
 
-        # Step 2: Filter by school type (public/private)
-        if school_type == 'public':
-            majors_list = majors_list.filter(university__is_public=True)
-        elif school_type == 'private':
-            majors_list = majors_list.filter(university__is_public=False)
+# 'rating' is best reviewed first, from Major.avg_rating
+SORT_KEYS = ('name', 'cost', '-cost', 'rating')
 
-        # Step 3: Filter by university first letter
-        if letter:
-            majors_list = majors_list.filter(university__name__istartswith=letter)
 
-        # Step 4: Use .values() for lighter query
-        majors_list = majors_list.values(
-            'major_name', 'slug', 'department',
-            'in_state_min_tuition', 'in_state_max_tuition',
-            'out_of_state_min_tuition', 'out_of_state_max_tuition',
-            'university__name', 'university__location', 'university__slug', 'university__is_public'
-        ).order_by('university__name')
-
-        # Step 5: Group majors by university
-        grouped_results = {}
-        for major in majors_list:
-            uni_slug = major['university__slug']
-            if uni_slug not in grouped_results:
-                grouped_results[uni_slug] = {
-                    'name': major['university__name'],
-                    'location': major['university__location'],
-                    'type': 'Public' if major['university__is_public'] else 'Private',
-                    'departments': {}
-                }
-            dept = major['department']
-            grouped_results[uni_slug]['departments'].setdefault(dept, []).append({
-                'major_name': major['major_name'],
-                'slug': major['slug'],
-                'in_state_min_tuition': major['in_state_min_tuition'],
-                'in_state_max_tuition': major['in_state_max_tuition'],
-                'out_of_state_min_tuition': major['out_of_state_min_tuition'],
-                'out_of_state_max_tuition': major['out_of_state_max_tuition'],
-            })
-
-        # Step 6: Paginate universities (only 5 at a time to save memory)
-        university_items = list(grouped_results.items())
-        paginator = Paginator(university_items, 5)  # <-- Only load 5 universities per page!!
+def cost_filter(params):
+    """
+    Tuition range and sort order from the query string. Unknown or
+    malformed values fall back to the defaults (in-state, no bounds, by name).
+    """
+    residency = params.get('residency')
+    if residency not in TUITION_COLUMNS:
+        residency = 'in_state'
+
+    sort = params.get('sort')
+    if sort not in SORT_KEYS:
+        sort = 'name'
 
+    bounds = []
+    for name in ('min_tuition', 'max_tuition'):
         try:
-            paginated_results = paginator.page(page)
-        except PageNotAnInteger:
-            paginated_results = paginator.page(1)
-        except EmptyPage:
-            paginated_results = paginator.page(paginator.num_pages)
+            bounds.append(max(int(params.get(name)), 0))
+        except (TypeError, ValueError):
+            bounds.append(None)
+
+    return {
+        'residency': residency,
+        'min_tuition': bounds[0],
+        'max_tuition': bounds[1],
+        'sort': sort,
+    }
 
-        # Step 7: Send to template
-        return render(request, 'search/department_results.html', {
-            'query': query,
-            'results': dict(paginated_results.object_list),
-            'school_type': school_type,
-            'filter_type': 'department',
-            'page_obj': paginated_results,
-            'is_paginated': paginator.num_pages > 1,
-            'alphabet': list(string.ascii_uppercase),
-            'current_letter': letter,
-        })
 
+def filter_tuition(majors_qs, cost):
+    column = TUITION_COLUMNS[cost['residency']]
+    if cost['min_tuition'] is not None:
+        majors_qs = majors_qs.filter(**{f'{column}__gte': cost['min_tuition']})
+    if cost['max_tuition'] is not None:
+        majors_qs = majors_qs.filter(**{f'{column}__lte': cost['max_tuition']})
+    return majors_qs
 
-class MajorResultsView(View):
-    def get(self, request, query):
-        school_type = request.GET.get('school_type', 'both')
-        page = request.GET.get('page')
-        letter = request.GET.get('letter', 'A').upper()
 
-        # Step 1: Filter majors by major name
-        majors_qs = Major.objects.filter(major_name__istartswith=query)
+def university_results_page(request, majors_qs, school_type, letter, per_page=5, cost=None):
+    """
+    Two-phase search results grouped by university.
 
-        # Step 2: Filter by school type
-        if school_type == 'public':
-            majors_qs = majors_qs.filter(university__is_public=True)
-        elif school_type == 'private':
-            majors_qs = majors_qs.filter(university__is_public=False)
+    Phase 1 pages the universities that have at least one matching major in
+    SQL (keyset on name, id). Phase 2 loads only that page's majors, so the
+    work per request doesn't depend on how many majors match in total.
 
-        # Step 3: Filter by university first letter
-        if letter:
-            majors_qs = majors_qs.filter(university__name__istartswith=letter)
+    With a cost sort, universities are ordered by their cheapest (or
+    priciest) matching major instead. That is one lookup per university on
+    the (university, tuition) index, and the keyset pages on it like a column. The rating sort works the same way on the best
+    rated matching major, from Major's own (university, avg_rating) index.
+    """
+    sort = cost['sort'] if cost else 'name'
 
-        # Step 4: Use .values() instead of .only()
-        majors_qs = majors_qs.values(
-            'major_name', 'slug', 'department',
-            'in_state_min_tuition', 'in_state_max_tuition',
-            'out_of_state_min_tuition', 'out_of_state_max_tuition',
-            'university__name', 'university__location', 'university__slug', 'university__is_public'
-        ).order_by('university__name')
+    if sort == 'name':
+        universities = University.objects.filter(
+            Exists(majors_qs.filter(university=OuterRef('pk')))
+        )
+        ordering = ['name', 'pk']
+        ordering_fields = []
+        major_ordering = ('department', 'major_name')
+    elif sort == 'rating':
+        universities = University.objects.annotate(
+            rating=Subquery(
+                majors_qs.filter(university=OuterRef('pk')).order_by('-avg_rating').values('avg_rating')[:1]
+            ),
+        ).filter(rating__isnull=False)
+        ordering = ['-rating', 'name', 'pk']
+        ordering_fields = ['rating']
+        major_ordering = ('department', '-avg_rating', '-review_count', 'major_name')
+    else:
+        column = TUITION_COLUMNS[cost['residency']]
+        tuition_order = column if sort == 'cost' else f'-{column}'
+        universities = University.objects.annotate(
+            tuition=Subquery(
+                majors_qs.filter(university=OuterRef('pk')).order_by(tuition_order).values(column)[:1]
+            ),
+        ).filter(tuition__isnull=False)
+        ordering = ['tuition' if sort == 'cost' else '-tuition', 'name', 'pk']
+        ordering_fields = ['tuition']
+        major_ordering = ('department', tuition_order, 'major_name')
+
+    if school_type == 'public':
+        universities = universities.filter(is_public=True)
+    elif school_type == 'private':
+        universities = universities.filter(is_public=False)
+
+    if letter:
+        universities = universities.filter(name__istartswith=letter)
+
+    page_obj = keyset_paginate(
+        universities.values('pk', 'name', 'location', 'slug', 'is_public', *ordering_fields),
+        ordering,
+        per_page,
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
 
-        # Step 5: Group majors by university and department
-        results = {}
-        for major in majors_qs:
-            uni_slug = major['university__slug']
-            if uni_slug not in results:
-                results[uni_slug] = {
-                    'name': major['university__name'],
-                    'location': major['university__location'],
-                    'type': 'Public' if major['university__is_public'] else 'Private',
-                    'departments': {}
-                }
+    results = {}
+    by_id = {}
+    for university in page_obj:
+        results[university['slug']] = by_id[university['pk']] = {
+            'name': university['name'],
+            'location': university['location'],
+            'type': 'Public' if university['is_public'] else 'Private',
+            'departments': {},
+        }
 
-            dept = major['department']
-            results[uni_slug]['departments'].setdefault(dept, []).append({
-                'major_name': major['major_name'],
-                'slug': major['slug'],
-                'in_state_min_tuition': major['in_state_min_tuition'],
-                'in_state_max_tuition': major['in_state_max_tuition'],
-                'out_of_state_min_tuition': major['out_of_state_min_tuition'],
-                'out_of_state_max_tuition': major['out_of_state_max_tuition'],
-            })
+    majors = majors_qs.filter(university_id__in=by_id.keys()).values(
+        'university_id', *RESULT_MAJOR_FIELDS
+    ).order_by(*major_ordering)
 
-        # Step 6: Paginate universities (5 per page)
-        university_items = list(results.items())
-        paginator = Paginator(university_items, 5)
+    for major in majors:
+        departments = by_id[major.pop('university_id')]['departments']
+        departments.setdefault(major['department'], []).append(major)
 
-        try:
-            page_obj = paginator.page(page)
-        except PageNotAnInteger:
-            page_obj = paginator.page(1)
-        except EmptyPage:
-            page_obj = paginator.page(paginator.num_pages)
+    return results, page_obj
+
+
+class GroupedMajorResultsView(CachedSearchResultsView):
+    """
+    Department and major results: matching majors grouped by university,
+    with an A-Z bar over the university names and an optional tuition
+    range and cost sort.
+    """
+    search_column = None
 
-        paginated_results = dict(page_obj.object_list)
+    def cache_key(self, request, query):
+        return super().cache_key(request, query) + tuple(cost_filter(request.GET).values())
 
-        # Step 7: Render
-        return render(request, 'search/major_results.html', {
+    def get_results(self, request, query):
+        school_type = request.GET.get('school_type', 'both')
+        letter = request.GET.get('letter', '').upper()
+        cost = cost_filter(request.GET)
+
+        # Filter majors on the search column (full-text index) and tuition range
+        majors_qs = search_majors(Major.objects.all(), query, self.search_column)
+        majors_qs = filter_tuition(majors_qs, cost)
+
+        # Facet counts don't depend on the letter, type or page, so one
+        # grouped query serves every page of this query
+        facets = search_cache.get_or_set(
+            (self.filter_type, 'facets', query, cost['residency'], cost['min_tuition'], cost['max_tuition']),
+            lambda: major_facets(majors_qs),
+        )
+        letter_counts = facets.letters(school_type)
+
+        if not letter and cost['sort'] == 'name':
+            # Start on the first letter that has results. Cost and rating
+            # sorts rank across every letter unless one is picked.
+            letter = next((l for l in string.ascii_uppercase if letter_counts.get(l)), 'A')
+
+        # Page the universities in SQL, then fetch only their majors
+        results, page_obj = university_results_page(request, majors_qs, school_type, letter, cost=cost)
+
+        # Non-default cost parameters, carried over by the letter and page links
+        cost_params = {
+            name: value for name, value in cost.items()
+            if value is not None and value != cost_filter({})[name]
+        }
+
+        return {
             'query': query,
-            'results': paginated_results,
+            'results': results,
             'school_type': school_type,
-            'filter_type': 'major',
+            'filter_type': self.filter_type,
             'page_obj': page_obj,
             'is_paginated': page_obj.has_other_pages(),
-            'alphabet': list(string.ascii_uppercase),
+            'alphabet': [
+                {'letter': l, 'count': letter_counts.get(l, 0)}
+                for l in string.ascii_uppercase
+            ],
             'current_letter': letter,
-        })
+            'type_counts': facets.school_types(letter),
+            'department_counts': sorted(facets.departments(letter, school_type).items()),
+            'cost': cost,
+            'cost_query': ''.join(f'&{name}={value}' for name, value in cost_params.items()),
+        }
+
+
+# Rows fetched from the database per round trip by the streaming search API
+STREAM_CHUNK_SIZE = 2000
+
+STREAM_FIELDS = (
+    'university__name', 'university__slug', 'university__location', 'university__is_public',
+    *RESULT_MAJOR_FIELDS,
+)
+
+
+def search_stream(request):
+    """
+    Matching majors as newline-delimited JSON, one object per line.
+
+    Takes the same parameters as the major/department result pages (query,
+    filter, school_type and the cost filter), without the letter or paging.
+    Rows are streamed from a database cursor in chunks, so memory use stays
+    flat however many majors match.
+    """
+    query = request.GET.get('query', '')
+    filter_type = request.GET.get('filter', 'major')
+    school_type = request.GET.get('school_type', 'both')
+    cost = cost_filter(request.GET)
+
+    if not query:
+        return HttpResponse("Error - No query provided.", status=400)
+
+    columns = {'major': 'major_name', 'department': 'department'}
+    if filter_type not in columns:
+        return HttpResponse("Error - Invalid filter.", status=400)
+
+    majors = search_majors(Major.objects.all(), query, columns[filter_type])
+    majors = filter_tuition(majors, cost)
+
+    if school_type == 'public':
+        majors = majors.filter(university__is_public=True)
+    elif school_type == 'private':
+        majors = majors.filter(university__is_public=False)
+
+    if cost['sort'] == 'name':
+        ordering = ('university__name', 'university_id', 'major_name', 'pk')
+    elif cost['sort'] == 'rating':
+        ordering = ('-avg_rating', '-review_count', 'pk')
+    else:
+        column = TUITION_COLUMNS[cost['residency']]
+        ordering = (column if cost['sort'] == 'cost' else f'-{column}', 'pk')
+
+    rows = majors.values(*STREAM_FIELDS).order_by(*ordering).iterator(chunk_size=STREAM_CHUNK_SIZE)
+
+    def lines():
+        for row in rows:
+            yield json.dumps({
+                'university': row.pop('university__name'),
+                'university_slug': row.pop('university__slug'),
+                'location': row.pop('university__location'),
+                'type': 'Public' if row.pop('university__is_public') else 'Private',
+                **row,
+            }) + '\n'
+
+    return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+
+class DepartmentResultsView(GroupedMajorResultsView):
+    template_name = 'search/department_results.html'
+    filter_type = 'department'
+    search_column = 'department'
+
+
+class MajorResultsView(GroupedMajorResultsView):
+    template_name = 'search/major_results.html'
+    filter_type = 'major'
+    search_column = 'major_name'
 
 
 
@@ -738,22 +1131,17 @@ class MajorOverviewView(DetailView):
         context = super().get_context_data(**kwargs)
         major = self.object
 
-        # Calculate average rating (if you keep the rating field)
-        reviews = major.major_reviews.all()
-        if reviews.exists():
-            average_rating = reviews.aggregate(Avg('rating'))['rating__avg']
-            context['average_rating'] = round(float(average_rating), 1)
-        else:
-            context['average_rating'] = 0.0
+        # Average rating and review count are kept on the major (reviews.py)
+        context['average_rating'] = round(major.avg_rating, 1)
+        context['review_count'] = major.review_count
 
-        # ✅ These are used in the template
-        context['reviews'] = reviews
-        context['latest_post_list'] = reviews.order_by('-pub_date')
+        # The newest reviews; the rest load through major_reviews
+        context['latest_post_list'] = major_review_page(major)
         context['star_range'] = [1, 2, 3, 4, 5]
 
         # Check if user has already left a review
         if self.request.user.is_authenticated:
-            context['user_review'] = reviews.filter(user=self.request.user).first()
+            context['user_review'] = major.major_reviews.filter(user=self.request.user).first()
             context['is_favorite'] = Favorite.objects.filter(
                 user=self.request.user,
                 major=major
@@ -769,8 +1157,10 @@ class CalcView(View):
     def get(self, request):
         saved_calcs = {}
         if request.user.is_authenticated:
-            request.user.refresh_from_db()  # Make sure we get the latest data
-            saved_calcs = request.user.savedCalcs
+            saved_calcs = {
+                calc.key: calc.as_dict()
+                for calc in request.user.saved_calculators.order_by('pk')
+            }
 
         return render(request, 'calc/calc_page.html', {
             'saved_calcs': saved_calcs
@@ -830,84 +1220,125 @@ class UniversityRequestView(View):
             return render(request, 'search/universityRequest.html')
     
 
+# Conditional GET for the calculator lookups. The ETags come from the
+# in-process caches' versions, so a 304 is decided without a query. The
+# responses must be revalidated every time (no-cache), never reused blind.
+catalog_condition = condition(
+    etag_func=lambda request, *args, **kwargs: tuition_cache.etag(),
+    last_modified_func=lambda request, *args, **kwargs: tuition_cache.last_modified(),
+)
+
+search_condition = condition(
+    etag_func=lambda request, *args, **kwargs: search_cache.etag(),
+    last_modified_func=lambda request, *args, **kwargs: search_cache.last_modified(),
+)
+
+
 @csrf_exempt
+@cache_control(no_cache=True)
+@search_condition
 def university_search(request):
     query = request.GET.get('query', '').strip()
 
     if not query:
         return JsonResponse({"universities": []}, status=400)
 
-    universities = University.objects.filter(
-        name__istartswith=query
-    ).only('name', 'location').order_by('name')
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        return JsonResponse({"universities": []}, status=400)
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+    # Served from the in-process prefix index, not the database
+    universities = university_autocomplete.search(query, limit)
 
-    if not universities.exists():
+    if universities:
+        return JsonResponse({"universities": universities})
+
+    # No prefix match, fall back to typo-tolerant suggestions
+    suggestions = university_fuzzy.suggest(query, limit)
+    if not suggestions:
         return JsonResponse({"universities": []}, status=404)
 
-    data = {"universities": []}
-    for uni in universities:
-        data["universities"].append({
-            "name": uni.name,
-            "location": uni.location,
-            # departments can still be included if you want, but it adds query cost
-            # "departments": list(uni.majors.values_list("department", flat=True).distinct())
-        })
+    return JsonResponse({"universities": suggestions, "did_you_mean": suggestions[0]["name"]})
 
-    return JsonResponse(data)
 
+def not_found(message, suggestions):
+    # 404 for the calculator APIs, with "did you mean" names from the fuzzy index
+    return JsonResponse({
+        "error": message,
+        "did_you_mean": [suggestion["name"] for suggestion in suggestions],
+    }, status=404)
 
 
-def calc_list(request):
-    if not request.user.is_authenticated:
-        # 401 - Unauthorized
-        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Reference/Status/401
-        return HttpResponse("Error - You must be logged in", status=401)
-    
-    user = request.user
-    user.refresh_from_db()
+def ambiguous(error):
+    # 400 for a university name that more than one university has, listing them
+    # so the caller can pick one by id or slug
+    return JsonResponse({
+        "error": "Error - More than one university has that name.",
+        "candidates": error.candidates,
+    }, status=400)
 
 
-    query = request.GET.get('query')
 
-    # #if not query:
-    # #    return HttpResponse("Error - No query provided", status=400)
-    #
-    # Above is commented out due to Vedal wanting all calcs to show when the
-    # user clicks on the search bar.
+CALC_LIST_LIMIT = 50
 
-    # lower the query so that the filtering can be case insensitive
-    query = query.lower()
 
-    # dict_you_want = {key: old_dict[key] for key in your_keys}
+def calc_list_stamp(request):
+    """
+    Count and latest change of the user's saved calculators, one aggregate
+    query on the (user, key) index, computed once per request.
 
-    # # Returns the values of the calculators matching the filtered_keys
-    # filtered_keys = ["Calculator 1", "Calculator 2"]
-    # calculators = {key: user.savedCalcs[key] for key in filtered_keys}
-    # 
-    # # Might be useful later
+    Saves can land on any worker process, so unlike the catalog APIs this
+    validator has to come from the database.
+    """
+    if not hasattr(request, '_calc_list_stamp'):
+        request._calc_list_stamp = None
+        if request.user.is_authenticated:
+            request._calc_list_stamp = request.user.saved_calculators.aggregate(
+                count=Count('pk'), latest=Max('updated_at'),
+            )
+    return request._calc_list_stamp
 
-    # >>> lst = ['a', 'ab', 'abc', 'bac']
-    # >>> [k for k in lst if 'ab' in k]
-    # ['ab', 'abc']
 
+def calc_list_etag(request):
+    stamp = calc_list_stamp(request)
+    if stamp is None:
+        return None
+    latest = stamp['latest'].timestamp() if stamp['latest'] else 0
+    return f'"{request.user.pk}-{stamp["count"]}-{latest}"'
 
-    # Grab the saved calculators from the user:
-    savedCalcs = list(user.savedCalcs.keys())
-    # This converts a dict_keys to a list of strings
 
+def calc_list_last_modified(request):
+    stamp = calc_list_stamp(request)
+    return stamp['latest'] if stamp else None
 
-    # Filter by the given query:
-    applicableKeys = [key for key in savedCalcs if query in key]
 
-    data = {"calculators" : []}
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=calc_list_etag, last_modified_func=calc_list_last_modified)
+def calc_list(request):
+    if not request.user.is_authenticated:
+        # 401 - Unauthorized
+        # https://developer.mozilla.org/en-US/docs/Web/HTTP/Reference/Status/401
+        return HttpResponse("Error - You must be logged in", status=401)
 
-    # Create a dictionary of the mix-case names to their corresponding keys
-    for key in applicableKeys:
-        data['calculators'].append(
-            user.savedCalcs[key]
-        )
+    # An empty query lists every calculator, the page shows them all when
+    # the user clicks on the search bar.
+    #
+    # Names are stored lowercased in `key`, so the prefix match is a range
+    # scan on the (user, key) index.
+    query = request.GET.get('query', '').lower()
+
+    try:
+        limit = max(1, min(int(request.GET.get('limit', CALC_LIST_LIMIT)), CALC_LIST_LIMIT))
+    except ValueError:
+        return HttpResponse("Error - Invalid limit", status=400)
+
+    calculators = request.user.saved_calculators.all()
+    if query:
+        calculators = calculators.filter(key__gte=query, key__lt=query + '\U0010ffff')
 
-    # Return the data
+    data = {"calculators": [calc.as_dict() for calc in calculators.order_by('key')[:limit]]}
 
     # Example return data:
     #
@@ -947,9 +1378,8 @@ def save_calc(request):
             data = json.loads(request.body.decode())
             key = list(data.keys())[0].lower()
 
-            if key in user.savedCalcs:
-                del user.savedCalcs[key]
-                user.save()
+            deleted, _ = SavedCalculator.objects.filter(user=user, key=key).delete()
+            if deleted:
                 return HttpResponse("Deleted", status=204) # No Content, preferred for deletions
             else: 
                 return HttpResponse("Key not found", status=404)
@@ -997,9 +1427,21 @@ def save_calc(request):
                     if not isinstance(value[field], str):
                         return HttpResponseBadRequest(f"Field '{field}' must be a string.")
 
-            # Save or update the calculator
-            user.savedCalcs[key] = value
-            user.save()
+            # Save or update the calculator, one INSERT ... ON CONFLICT DO UPDATE
+            fields = {
+                'calc_name': value['calcName'],
+                'uni': value['uni'],
+                'outstate': value['outstate'],
+                'dept': value['dept'],
+                'major': value['major'],
+                'aid': value['aid'],
+            }
+            SavedCalculator.objects.bulk_create(
+                [SavedCalculator(user=user, key=key, **fields)],
+                update_conflicts=True,
+                unique_fields=['user', 'key'],
+                update_fields=[*fields, 'updated_at'],
+            )
             return HttpResponse("Saved", status=201) # Created, preferred for new resources
 
         except Exception as e:
@@ -1024,143 +1466,563 @@ def save_calc(request):
 
 
 
+class AmbiguousUniversity(Exception):
+    """A university name that more than one university has."""
+
+    def __init__(self, candidates):
+        super().__init__("More than one university has that name.")
+        self.candidates = candidates
+
+
+def university_lookup(params, name_lookup):
+    """
+    How a calculator API request names its university: ('pk', id),
+    ('slug', slug) or (name_lookup, name), or None if it names none.
+    Raises ValueError for a malformed id.
+    """
+    if params.get('university_id'):
+        return 'pk', int(params['university_id'])
+
+    if params.get('university_slug'):
+        return 'slug', params['university_slug']
+
+    if params.get('university'):
+        return name_lookup, params['university']
+
+    return None
+
+
+def university_param(params, name_lookup):
+    """
+    The university a calculator API request names, by university_id,
+    university_slug or (the older form) university name, from the tuition
+    cache. Returns (university or None, the value that was looked up, or
+    None if no university was given). Raises ValueError for a malformed id
+    and AmbiguousUniversity when several universities match the name.
+    """
+    lookup = university_lookup(params, name_lookup)
+    if lookup is None:
+        return None, None
+
+    field, value = lookup
+    if field == name_lookup:
+        candidates = get_university_matches(field, value)
+        if len(candidates) > 1:
+            raise AmbiguousUniversity(candidates)
+
+    return get_university(field, value), str(value)
+
+
+@cache_control(no_cache=True)
+@catalog_condition
 def aid_list(request):
-    uniQuery = request.GET.get('university')
-    uniObj = None
+    try:
+        university, requested = university_param(request.GET, 'name__iexact')
+    except AmbiguousUniversity as error:
+        return ambiguous(error)
+    except ValueError:
+        return HttpResponse("Error - Invalid university id.", status=400)
 
-    if not uniQuery:
+    if requested is None:
         return HttpResponse("Error - No university provided.", status=400)
 
-    try:
-        uniObj = University.objects.get(name__iexact=uniQuery)
-    except University.DoesNotExist as error:
-        return HttpResponse("Error - No university found.", status=404)
-    
-    data = {"aids" : []}
-    for aid in uniObj.applicableAids.all():
-        data["aids"].append({
-            'name'      : aid.name,
-            'location'  : aid.location,
-            'amount'    : aid.amount,
-        })
-    
+    if university is None:
+        return not_found("Error - No university found.", university_fuzzy.suggest(requested))
+
+    return JsonResponse({"aids": university['aids']})
+
+
+@cache_control(no_cache=True)
+@catalog_condition
+def aid_universities(request):
+    # The reverse of aid_list: the universities an aid applies to. Given a
+    # major as well, also ranks those universities by what the major costs
+    # there after the aid, cheapest first.
+    aid_name = request.GET.get('aid')
+    if not aid_name:
+        return HttpResponse("Error - No aid provided.", status=400)
+
+    aid = get_aid_universities(aid_name)
+    if aid is None:
+        return HttpResponse("Error - Financial Aid not found.", status=404)
+
+    data = {
+        "aid": {field: aid[field] for field in AID_FIELDS},
+        "universities": [
+            {"name": uni['name'], "slug": uni['slug'], "location": uni['location']}
+            for uni in aid['universities']
+        ],
+    }
+
+    major_name = request.GET.get('major')
+    if major_name:
+        outstate = request.GET.get('outstate') == 'true'
+        residency = 'out_of_state' if outstate else 'in_state'
+        data["results"] = [
+            {
+                "university": {"name": cost['university__name'], "slug": cost['university__slug']},
+                "major": {"name": cost['major__major_name'], "slug": cost['major__slug']},
+                "minTui": cost[f'{residency}_min'] - aid['amount'],
+                "maxTui": cost[f'{residency}_max'] - aid['amount'],
+            }
+            for cost in get_aid_costs(aid['id'], major_name, outstate)
+        ]
+
     return JsonResponse(data)
 
 
+@cache_control(no_cache=True)
+@catalog_condition
 def major_list(request):
-    university_name = request.GET.get('university', '')
     department = request.GET.get('department', '')
 
-    if not university_name:
+    try:
+        university, requested = university_param(request.GET, 'name__iexact')
+    except AmbiguousUniversity as error:
+        return ambiguous(error)
+    except ValueError:
+        return HttpResponse("Error - Invalid university id.", status=400)
+
+    if requested is None:
         return HttpResponse("Error - No university provided.", status=400)
 
     if not department:
         return HttpResponse("Error - No department provided.", status=400)
 
     # Ensure university exists
-    university = University.objects.filter(name__icontains=university_name).first()
-    if not university:
-        return HttpResponse("Error - University not found", status=404)
-
-    # Filter majors by university and department
-    majors = Major.objects.filter(university=university, department=department)
-    if not majors.exists():
-        return JsonResponse({"majors": []})  # Return empty list if no majors found
+    if university is None:
+        return not_found("Error - University not found", university_fuzzy.suggest(requested))
 
-    data = {"majors": [{"name": major.major_name} for major in majors]}
+    # Majors of the university in the department, empty list if none
+    data = {"majors": [{"name": name} for name in get_majors(university['id'], department)]}
 
     return JsonResponse(data)
 
 
-def calculate(request):
-    
-    university_name = request.GET.get('university')
-    major_name = request.GET.get('major')
-    outstate = request.GET.get('outstate')
-    aid_name = request.GET.get('aid')
+@cache_control(no_cache=True)
+@catalog_condition
+def calculator_data(request):
+    # Everything the calculator panel needs for one university in a single
+    # response: its base costs, the aids that apply to it, and every major
+    # by department with the major's costs. calc.js fills in the department,
+    # major and aid choices from this, instead of calling /api/majors/ and
+    # /api/aid/ in turn. Totals still come from /api/calculate/.
+    #
+    # Costs are [min, max] pairs. The university is matched by id, slug or
+    # its exact name.
+    try:
+        university, requested = university_param(request.GET, 'name__iexact')
+    except AmbiguousUniversity as error:
+        return ambiguous(error)
+    except ValueError:
+        return HttpResponse("Error - Invalid university id.", status=400)
 
-    if not university_name:
+    if requested is None:
         return HttpResponse("Error - No university provided.", status=400)
 
-    if not major_name:
-        return HttpResponse("Error - No major provided.", status=400)
+    if university is None:
+        return not_found("Error - No university found.", university_fuzzy.suggest(requested))
 
-    if not outstate:
-        return HttpResponse("Error - No outstate provided.", status=400)
+    def costs(values, column):
+        return {
+            "inState": [values[f'in_state_{column}min_tuition'], values[f'in_state_{column}max_tuition']],
+            "outOfState": [values[f'out_of_state_{column}min_tuition'], values[f'out_of_state_{column}max_tuition']],
+            "fees": values['fees'],
+        }
 
-    # effectively cast outstate to a boolean now that we know its validated
-    outstate = outstate == 'true'
+    return JsonResponse({
+        "university": {
+            "id": university['id'],
+            "name": university['name'],
+            "slug": university['slug'],
+            **costs(university, 'base_'),
+        },
+        "aids": university['aids'],
+        "departments": {
+            department: [
+                {"name": major['major_name'], "slug": major['slug'], **costs(major, '')}
+                for major in majors
+            ]
+            for department, majors in get_catalog(university['id']).items()
+        },
+    })
 
 
-    # Ensure university exists
-    university = University.objects.filter(name__icontains=university_name).first()
-    if not university:
-        return HttpResponse("Error - University not found", status=404)
+# Values of the aid parameter that mean "no aid"
+NO_AID = ("", "None", "null", None)
 
-    # Ensure major exists
-    major = Major.objects.filter(university=university, major_name__icontains=major_name).first()
-    if not major:
-        return HttpResponse("Error - Major not found", status=404)
 
-    # Get aid
-    aid = 0
-    aidObj = None
+def parse_aid(aid_name):
+    """
+    Split the calculator's aid parameter into (custom amount, aid name to
+    look up). A number is a custom amount, anything else names a FinancialAid.
+    """
+    if aid_name in NO_AID:
+        return 0, None
 
-    if aid_name and aid_name not in ["", "None", "null"]:
-        # Try to convert to int (custom aid), else treat as aid name
-        try:
-            aid = int(aid_name)
-        except ValueError:
-            aidObj = FinancialAid.objects.filter(name=aid_name).first()
-            if not aidObj:
-                return HttpResponse("Error - Financial Aid not found.", status=404)
-            aid = aidObj.amount
+    try:
+        return int(aid_name), None
+    except (TypeError, ValueError):
+        return 0, str(aid_name)
 
-    
 
+def tuition_breakdown(university, major, outstate, aid=0, aid_obj=None, aid_name=None):
+    """
+    The calculator result for one university, major and aid, given as dicts
+    with the tuition_cache fields.
+    """
+    if aid_obj:
+        aid = aid_obj['amount']
 
     # Determine correct tuition range
-    if outstate:
-        min_tuition = university.out_of_state_base_min_tuition + major.out_of_state_min_tuition
-        max_tuition = university.out_of_state_base_max_tuition + major.out_of_state_max_tuition
-    else:
-        min_tuition = university.in_state_base_min_tuition + major.in_state_min_tuition 
-        max_tuition = university.in_state_base_max_tuition + major.in_state_max_tuition
+    residency = 'out_of_state' if outstate else 'in_state'
+    base_min = university[f'{residency}_base_min_tuition']
+    base_max = university[f'{residency}_base_max_tuition']
+    major_min = major[f'{residency}_min_tuition']
+    major_max = major[f'{residency}_max_tuition']
 
     # Add university and major fees
-    min_tuition += university.fees + major.fees
-    max_tuition += university.fees + major.fees
-
+    fees = university['fees'] + major['fees']
 
     # Apply Aid
-    min_tuition -= aid
-    max_tuition -= aid
+    min_tuition = base_min + major_min + fees - aid
+    max_tuition = base_max + major_max + fees - aid
 
-    data = {
+    return {
         "minTui": min_tuition,
         "maxTui": max_tuition,
         "uni": {
-            "name": university.name,
-            "baseMinTui": university.in_state_base_min_tuition if not outstate else university.out_of_state_base_min_tuition,
-            "baseMaxTui": university.in_state_base_max_tuition if not outstate else university.out_of_state_base_max_tuition,
-            "fees": university.fees
+            "name": university['name'],
+            "baseMinTui": base_min,
+            "baseMaxTui": base_max,
+            "fees": university['fees']
         },
         "major": {
-            "name": major.major_name,
-            "baseMinTui": major.in_state_min_tuition if not outstate else major.out_of_state_min_tuition,
-            "baseMaxTui": major.in_state_max_tuition if not outstate else major.out_of_state_max_tuition,
-            "fees": major.fees
+            "name": major['major_name'],
+            "baseMinTui": major_min,
+            "baseMaxTui": major_max,
+            "fees": major['fees']
         },
         "aid": (
-            {} if aid_name in ["", "None", "null", None]
-            else {"name": aidObj.name, "amount": aidObj.amount} if aidObj
+            {} if aid_name in NO_AID
+            else {"name": aid_obj['name'], "amount": aid_obj['amount']} if aid_obj
             else {"name": f"Custom Aid (${aid})", "amount": aid}
         ),
 
     }
 
+
+def calculate(request):
+    # The university and major can be given by id (university_id, major_id),
+    # by slug (university_slug, major_slug) or by name (university, major).
+    # A major id or slug on its own also identifies the university.
+    #
+    # Lookups go through the tuition cache, a repeated request runs no queries.
+    major_name = request.GET.get('major')
+    major_id = request.GET.get('major_id')
+    major_slug = request.GET.get('major_slug')
+    outstate = request.GET.get('outstate')
+    aid_name = request.GET.get('aid')
+
+    has_university = any(request.GET.get(key) for key in ('university', 'university_id', 'university_slug'))
+
+    if not (has_university or major_id or major_slug):
+        return HttpResponse("Error - No university provided.", status=400)
+
+    if not (major_name or major_id or major_slug):
+        return HttpResponse("Error - No major provided.", status=400)
+
+    if not outstate:
+        return HttpResponse("Error - No outstate provided.", status=400)
+
+    # effectively cast outstate to a boolean now that we know its validated
+    outstate = outstate == 'true'
+
+    # A years parameter asks for a multi-year projection as well
+    options = None
+    if 'years' in request.GET:
+        try:
+            options = projection_params(request.GET)
+        except ProjectionError as error:
+            return HttpResponse(str(error), status=400)
+
+    try:
+        # Ensure university exists
+        university, requested = university_param(request.GET, 'name__iexact')
+        if requested is not None and university is None:
+            return not_found("Error - University not found", university_fuzzy.suggest(requested))
+
+        # Ensure major exists
+        if major_id or major_slug:
+            major = get_major('pk', int(major_id)) if major_id else get_major('slug', major_slug)
+            if major and university is None:
+                university = get_university('pk', major['university_id'])
+            elif major and major['university_id'] != university['id']:
+                major = None
+        else:
+            major = get_major('major_name__icontains', major_name, university['id'])
+    except AmbiguousUniversity as error:
+        return ambiguous(error)
+    except ValueError:
+        return HttpResponse("Error - Invalid university or major id.", status=400)
+
+    if not major:
+        return not_found("Error - Major not found", major_fuzzy.suggest(major_name or major_slug or ''))
+
+    # Get aid
+    aid, aid_requested = parse_aid(aid_name)
+    aid_obj = None
+
+    if aid_requested is not None:
+        aid_obj = get_aid(aid_requested)
+        if not aid_obj:
+            return HttpResponse("Error - Financial Aid not found.", status=404)
+
+    data = tuition_breakdown(university, major, outstate, aid, aid_obj, aid_name)
+
+    if options:
+        aid_amount = aid_obj['amount'] if aid_obj else aid
+        data['projection'] = project([cost_row(university, major, outstate)], [aid_amount], **options)[0]
+
     return JsonResponse(data)
 
+BATCH_MAX_SIZE = 50
+
+
+def batch_error(message, status, suggestions=None):
+    error = {"error": message, "status": status}
+    if suggestions is not None:
+        error["did_you_mean"] = [suggestion["name"] for suggestion in suggestions]
+    return error
+
+
+@csrf_exempt
+@require_POST
+def calculate_batch(request):
+    # Expected Data
+    #
+    # { 'calcs' : [
+    #       { 'university' : 'Clemson University', 'major' : 'CIS', 'outstate' : true, 'aid' : 'Palmetto Fellows' },
+    #       ...
+    # ]}
+    #
+    # The response has one entry per calc, in the same order: what calculate()
+    # returns for it, or {'error', 'status'} (plus 'did_you_mean' on a miss).
+    #
+    # Each calc names its university like calculate() does, by
+    # 'university_id', 'university_slug' or 'university' (the full name,
+    # ignoring case). A name that several universities share is an error
+    # listing them as 'candidates'.
+    #
+    # Universities, majors and aids are each looked up with one query for the
+    # whole batch.
+    #
+    # An optional 'projection' object ({'years', 'grad_years', 'escalation',
+    # 'aid_years'}) adds a multi-year projection to every result.
+    try:
+        body = json.loads(request.body.decode())
+        calcs = body['calcs']
+    except (ValueError, KeyError, TypeError):
+        return HttpResponseBadRequest("Error - Expected a JSON object with a calcs list.")
+
+    options = None
+    if isinstance(body.get('projection'), dict):
+        try:
+            options = projection_params(body['projection'])
+        except ProjectionError as error:
+            return HttpResponseBadRequest(str(error))
+
+    if not isinstance(calcs, list) or not all(isinstance(calc, dict) for calc in calcs):
+        return HttpResponseBadRequest("Error - Expected a JSON object with a calcs list.")
+
+    if len(calcs) > BATCH_MAX_SIZE:
+        return HttpResponseBadRequest(f"Error - At most {BATCH_MAX_SIZE} calcs per request.")
+
+    def text(calc, key):
+        value = calc.get(key)
+        return str(value).strip() if value is not None else ''
+
+    # How each calc names its university, or the ValueError for a bad id
+    lookups = []
+    for calc in calcs:
+        try:
+            lookups.append(university_lookup(
+                {key: text(calc, key) for key in ('university_id', 'university_slug', 'university')},
+                'name__iexact',
+            ))
+        except ValueError as error:
+            lookups.append(error)
+
+    # Universities, by id, by slug and by case-folded name
+    by_field = {'pk': {}, 'slug': {}, 'name__iexact': {}}
+    query = Q()
+    for lookup in lookups:
+        if isinstance(lookup, tuple):
+            query |= Q(**{lookup[0]: lookup[1]})
+    if query:
+        for university in University.objects.filter(query).values(*UNIVERSITY_FIELDS).order_by('pk'):
+            by_field['pk'][university['id']] = [university]
+            by_field['slug'][university['slug']] = [university]
+            by_field['name__iexact'].setdefault(university['name'].casefold(), []).append(university)
+
+    def universities(lookup):
+        field, value = lookup
+        return by_field[field].get(value.casefold() if field == 'name__iexact' else value, [])
+
+    # Majors, first match by id like calculate()'s icontains lookup
+    pairs = set()
+    for calc, lookup in zip(calcs, lookups):
+        if isinstance(lookup, tuple) and len(universities(lookup)) == 1 and text(calc, 'major'):
+            pairs.add((universities(lookup)[0]['id'], text(calc, 'major').casefold()))
+
+    majors = {}
+    if pairs:
+        lookup = Q()
+        for university_id, major_name in pairs:
+            lookup |= Q(university_id=university_id, major_name__icontains=major_name)
+        candidates = Major.objects.filter(lookup).values(*MAJOR_FIELDS).order_by('pk')
+        for major in candidates:
+            for university_id, major_name in pairs:
+                if major['university_id'] == university_id and major_name in major['major_name'].casefold():
+                    majors.setdefault((university_id, major_name), major)
+
+    # Aids, by exact name
+    aid_names = {parse_aid(calc.get('aid'))[1] for calc in calcs} - {None}
+    aids = {}
+    for aid in FinancialAid.objects.filter(name__in=aid_names).values(*AID_FIELDS).order_by('pk'):
+        aids.setdefault(aid['name'], aid)
+
+    results = []
+    projected = []  # (result index, cost row, aid amount)
+    for calc, lookup in zip(calcs, lookups):
+        major_name = text(calc, 'major')
+        outstate = calc.get('outstate')
+        aid_name = calc.get('aid')
+
+        if isinstance(lookup, ValueError):
+            results.append(batch_error("Error - Invalid university id.", 400))
+            continue
+        if lookup is None:
+            results.append(batch_error("Error - No university provided.", 400))
+            continue
+        if not major_name:
+            results.append(batch_error("Error - No major provided.", 400))
+            continue
+        if outstate is None or outstate == '':
+            results.append(batch_error("Error - No outstate provided.", 400))
+            continue
+
+        matches = universities(lookup)
+        if not matches:
+            results.append(batch_error(
+                "Error - University not found", 404, university_fuzzy.suggest(str(lookup[1]))
+            ))
+            continue
+        if len(matches) > 1:
+            error = batch_error("Error - More than one university has that name.", 400)
+            error["candidates"] = [
+                {field: university[field] for field in AID_UNIVERSITY_FIELDS} for university in matches
+            ]
+            results.append(error)
+            continue
+        university = matches[0]
+
+        major = majors.get((university['id'], major_name.casefold()))
+        if not major:
+            results.append(batch_error("Error - Major not found", 404, major_fuzzy.suggest(major_name)))
+            continue
+
+        aid, aid_requested = parse_aid(aid_name)
+        aid_obj = None
+        if aid_requested is not None:
+            aid_obj = aids.get(aid_requested)
+            if not aid_obj:
+                results.append(batch_error("Error - Financial Aid not found.", 404))
+                continue
+
+        outstate = outstate in (True, 'true')
+        if options:
+            projected.append((len(results), cost_row(university, major, outstate),
+                              aid_obj['amount'] if aid_obj else aid))
+        results.append(tuition_breakdown(university, major, outstate, aid, aid_obj, aid_name))
+
+    # Every projection in one pass
+    if projected:
+        indexes, rows, aids = zip(*projected)
+        for index, projection in zip(indexes, project(rows, aids, **options)):
+            results[index]['projection'] = projection
+
+    return JsonResponse({"results": results})
+
+
+@cache_control(no_cache=True)
+@catalog_condition
+def university_projection(request):
+    # Multi-year projections for every major at a university, cheapest first.
+    # Takes the university like the other calculator APIs, plus outstate,
+    # an optional department and aid, and the projection options.
+    outstate = request.GET.get('outstate') == 'true'
+    department = request.GET.get('department')
+
+    try:
+        options = projection_params(request.GET)
+    except ProjectionError as error:
+        return HttpResponse(str(error), status=400)
+
+    try:
+        university, requested = university_param(request.GET, 'name__iexact')
+    except AmbiguousUniversity as error:
+        return ambiguous(error)
+    except ValueError:
+        return HttpResponse("Error - Invalid university id.", status=400)
+
+    if requested is None:
+        return HttpResponse("Error - No university provided.", status=400)
+
+    if university is None:
+        return not_found("Error - No university found.", university_fuzzy.suggest(requested))
+
+    aid, aid_requested = parse_aid(request.GET.get('aid'))
+    if aid_requested is not None:
+        aid_obj = get_aid(aid_requested)
+        if not aid_obj:
+            return HttpResponse("Error - Financial Aid not found.", status=404)
+        aid = aid_obj['amount']
+
+    # First-year totals straight from the materialized cost table
+    residency = 'out_of_state' if outstate else 'in_state'
+    costs = MajorCost.objects.filter(university_id=university['id'])
+    if department:
+        costs = costs.filter(major__department=department)
+    costs = list(costs.order_by(f'{residency}_min', 'major__major_name').values(
+        'major__major_name', 'major__slug', 'major__department',
+        f'{residency}_min', f'{residency}_max', f'grad_{residency}_min', f'grad_{residency}_max',
+    ))
+
+    rows = [
+        {
+            'min': cost[f'{residency}_min'],
+            'max': cost[f'{residency}_max'],
+            'grad_min': cost[f'grad_{residency}_min'],
+            'grad_max': cost[f'grad_{residency}_max'],
+        }
+        for cost in costs
+    ]
+    projections = project(rows, [aid] * len(rows), **options)
+
+    return JsonResponse({
+        "university": university['name'],
+        "majors": [
+            {
+                "name": cost['major__major_name'],
+                "slug": cost['major__slug'],
+                "department": cost['major__department'],
+                **projection,
+            }
+            for cost, projection in zip(costs, projections)
+        ],
+    })
+
 # favorite feature views for universities and majors 
 @require_POST
 @login_required
@@ -1220,6 +2082,72 @@ def university_map_data(request):
 
 
     return JsonResponse({'universities': data})
+
+
+NEARBY_DEFAULT_RADIUS = 25
+NEARBY_MAX_RADIUS = 500
+NEARBY_MAX_LIMIT = 200
+
+
+def universities_nearby(request):
+    """
+    Universities within `radius` miles (default 25) of a point, given as
+    lat/lng, or of another university, given by id, slug or name like the
+    calculator APIs. Nearest first.
+    """
+    exclude = None
+
+    try:
+        radius = float(request.GET.get('radius', NEARBY_DEFAULT_RADIUS))
+        limit = int(request.GET.get('limit', 50))
+    except ValueError:
+        return HttpResponse("Error - Invalid radius or limit.", status=400)
+
+    if not 0 < radius <= NEARBY_MAX_RADIUS:
+        return HttpResponse(f"Error - Radius must be between 0 and {NEARBY_MAX_RADIUS} miles.", status=400)
+    limit = max(1, min(limit, NEARBY_MAX_LIMIT))
+
+    try:
+        origin, requested = university_param(request.GET, 'name__iexact')
+    except AmbiguousUniversity as error:
+        return ambiguous(error)
+    except ValueError:
+        return HttpResponse("Error - Invalid university id.", status=400)
+
+    if requested is not None:
+        if origin is None:
+            return not_found("Error - No university found.", university_fuzzy.suggest(requested))
+
+        if origin['latitude'] is None or origin['longitude'] is None:
+            return HttpResponse("Error - University has no coordinates.", status=400)
+
+        lat, lng = float(origin['latitude']), float(origin['longitude'])
+        exclude = origin['id']
+    else:
+        try:
+            lat = float(request.GET['lat'])
+            lng = float(request.GET['lng'])
+        except (MultiValueDictKeyError, ValueError):
+            return HttpResponse("Error - No university or lat/lng provided.", status=400)
+
+        if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return HttpResponse("Error - Invalid lat/lng.", status=400)
+
+    results = universities_within(lat, lng, radius, exclude=exclude, limit=limit)
+
+    return JsonResponse({'universities': [
+        {
+            'name': university['name'],
+            'location': university['location'],
+            'lat': float(university['latitude']),
+            'lng': float(university['longitude']),
+            'distance': round(distance, 1),
+            'url': f"/UniversityOverview/{university['slug']}/",
+        }
+        for distance, university in results
+    ]})
+
+
 from django.contrib.auth.views import redirect_to_login  # If not already imported
 from django.urls import reverse
 
@@ -1246,17 +2174,36 @@ class SubmitOverallRatingView(View):
             'dining': 'dining',
         }
 
-        for category_key in CATEGORY_MAP.keys():
-            rating = request.POST.get(f'{category_key}_rating')
+        ratings = []
+        for category_key, true_category in CATEGORY_MAP.items():
+            try:
+                rating = int(request.POST.get(f'{category_key}_rating') or 0)
+            except ValueError:
+                continue
 
             if rating:
-                true_category = CATEGORY_MAP[category_key]
-                UniversityRating.objects.update_or_create(
+                ratings.append(UniversityRating(
                     university=university,
                     category=true_category,
                     user=request.user,
-                    defaults={'rating': int(rating)}
-                )
+                    # bulk_create() skips UniversityRating.save(), clamp here
+                    rating=min(max(rating, 1), 5),
+                ))
+
+        # Every category in one statement and one transaction: new ratings
+        # are inserted, the user's existing ones overwritten
+        with transaction.atomic():
+            UniversityRating.objects.bulk_create(
+                ratings,
+                update_conflicts=True,
+                unique_fields=['university', 'category', 'user'],
+                update_fields=['rating'],
+            )
+
+            # SQLite's triggers already updated the rating summaries in that
+            # statement (see ratings.py)
+            if not triggers_enabled():
+                refresh_rating_summaries(university_id=university.pk)
 
         messages.success(request, 'Your ratings have been saved successfully!')
         return redirect('MajorHelp:university-detail', slug=university.slug)
@@ -1269,10 +2216,10 @@ class DeleteReviewView(View):
     def post(self, request, pk):
         university = get_object_or_404(University, pk=pk)
         try:
-            review = UniversityReview.objects.get(username=request.user.username, university=university)
+            review = UniversityReview.objects.get(user=request.user, university=university)
             review.delete()
             messages.success(request, "Your review has been deleted.")
         except UniversityReview.DoesNotExist:
             messages.error(request, "Review not found.")
         
-        return redirect('MajorHelp:university-detail', slug=university.slug)
\ No newline at end of file
+        return redirect('MajorHelp:university-detail', slug=university.slug)
\ No newline at end of file
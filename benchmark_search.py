@@ -0,0 +1,66 @@
+import os
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pestopanini.settings')
+django.setup()
+
+import statistics
+import sys
+import time
+
+from MajorHelp.models import University, Major
+from MajorHelp.search import search_universities, search_majors
+
+# Compares the FTS5 index against the old istartswith/icontains lookups the
+# search result views used. Run it against the full database (~1.9M majors):
+#
+#   python benchmark_search.py [runs]
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+CASES = [
+    # (label, old ORM queryset, full-text queryset)
+    ("school 'University of'",
+        lambda: University.objects.filter(name__istartswith="University of"),
+        lambda: search_universities(University.objects.all(), "University of")),
+    ("school 'Clemson'",
+        lambda: University.objects.filter(name__istartswith="Clemson"),
+        lambda: search_universities(University.objects.all(), "Clemson")),
+    ("major 'Computer'",
+        lambda: Major.objects.filter(major_name__istartswith="Computer"),
+        lambda: search_majors(Major.objects.all(), "Computer", 'major_name')),
+    ("major 'Science'",
+        lambda: Major.objects.filter(major_name__istartswith="Science"),
+        lambda: search_majors(Major.objects.all(), "Science", 'major_name')),
+    ("department 'Education'",
+        lambda: Major.objects.filter(department__icontains="Education"),
+        lambda: search_majors(Major.objects.all(), "Education", 'department')),
+]
+
+
+def measure(make_queryset):
+    timings = []
+    rows = 0
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        rows = len(list(make_queryset().values_list('pk', flat=True)))
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    p50 = statistics.median(timings)
+    p95 = timings[min(len(timings) - 1, int(round(len(timings) * 0.95)) - 1)]
+    return rows, p50, p95
+
+
+def run():
+    print(f"Universities: {University.objects.count()}, Majors: {Major.objects.count()}, runs: {RUNS}")
+    print(f"{'query':<26}{'path':<6}{'rows':>9}{'p50 ms':>11}{'p95 ms':>11}")
+
+    for label, orm, fts in CASES:
+        for path, make_queryset in (("orm", orm), ("fts", fts)):
+            rows, p50, p95 = measure(make_queryset)
+            print(f"{label:<26}{path:<6}{rows:>9}{p50:>11.2f}{p95:>11.2f}")
+
+
+if __name__ == "__main__":
+    run()